@@ -0,0 +1,4 @@
+chmod +x bench.sh
+#!/bin/bash
+# Time each stage of the markdown pipeline; the JSON report goes to stdout, progress to stderr
+PYTHONPATH=$(pwd) python3 src/benchmarks/bench_pipeline.py "$@"
@@ -1,5 +1,5 @@
 chmod +x main.sh
-echo "Running main.py..."
+echo "Starting the development server..."
 cd "$(dirname "$0")" # Go to directory containing this script
-PYTHONPATH=$(pwd) python3 -c "from src.main import copy_static_to_public; copy_static_to_public()"
-cd public && python3 -m http.server 8888
\ No newline at end of file
+# Pages are rendered in memory on request and open tabs reload when a file changes
+PYTHONPATH=$(pwd) python3 src/main.py serve "$@"
@@ -0,0 +1,114 @@
+import errno
+import os
+import shutil
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+# How static assets are placed in the output directory:
+#   copy      a byte copy with shutil.copy2
+#   reflink   a copy-on-write clone (FICLONE), which shares the data blocks until either file is written
+#   hardlink  a second name for the source file, on the same filesystem only
+#   auto      reflink, then hardlink, whichever the filesystem supports first
+# reflink, hardlink and auto fall back to streaming the bytes with copy_file_range or sendfile.
+ASSET_LINK_MODES = ("copy", "reflink", "hardlink", "auto")
+
+# ioctl request number of FICLONE (Linux, from <linux/fs.h>)
+_FICLONE = 0x40049409
+# Chunk size of one copy_file_range/sendfile call
+_STREAM_CHUNK = 64 * 1024 * 1024
+
+
+def _reflink(src_path, dest_path):
+    """Clone 'src_path' to 'dest_path' with FICLONE. Returns False where the filesystem cannot clone."""
+    if fcntl is None:
+        return False
+    with open(src_path, 'rb') as src, open(dest_path, 'wb') as dest:
+        try:
+            fcntl.ioctl(dest.fileno(), _FICLONE, src.fileno())
+        except OSError:
+            cloned = False
+        else:
+            cloned = True
+    if not cloned:
+        os.remove(dest_path)
+        return False
+    shutil.copystat(src_path, dest_path)
+    return True
+
+
+def _hardlink(src_path, dest_path):
+    """Hardlink 'dest_path' to 'src_path'. Returns False if the two are on different filesystems."""
+    if os.stat(src_path).st_dev != os.stat(os.path.dirname(dest_path)).st_dev:
+        return False
+    try:
+        os.link(src_path, dest_path)
+    except OSError:
+        return False
+    return True
+
+
+def _stream(src_path, dest_path):
+    """
+    Copy the bytes of 'src_path' to 'dest_path' inside the kernel, with copy_file_range or,
+    where that is unavailable, sendfile, then copy the metadata.
+
+    Returns:
+        str: The strategy that moved the bytes: "copy_file_range", "sendfile" or "copy"
+    """
+    with open(src_path, 'rb') as src, open(dest_path, 'wb') as dest:
+        size = os.fstat(src.fileno()).st_size
+        strategy = None
+        for name in ("copy_file_range", "sendfile"):
+            function = getattr(os, name, None)
+            if function is None:
+                continue
+            try:
+                offset = 0
+                while offset < size:
+                    if name == "copy_file_range":
+                        sent = function(src.fileno(), dest.fileno(), _STREAM_CHUNK)
+                    else:
+                        sent = function(dest.fileno(), src.fileno(), offset, _STREAM_CHUNK)
+                    if sent == 0:
+                        break
+                    offset += sent
+            except OSError as e:
+                # Unsupported between these files: try the next call, as long as nothing was written yet
+                if offset or e.errno not in (errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP,
+                                             errno.ENOTSUP):
+                    raise
+                continue
+            strategy = name
+            break
+        if strategy is None:
+            shutil.copyfileobj(src, dest)
+            strategy = "copy"
+    shutil.copystat(src_path, dest_path)
+    return strategy
+
+
+def place_asset(src_path, dest_path, mode="copy"):
+    """
+    Put a copy of the asset 'src_path' at 'dest_path', which must not exist.
+
+    Args:
+        src_path (str): Source file path
+        dest_path (str): Destination file path
+        mode (str): One of ASSET_LINK_MODES (default: "copy")
+
+    Returns:
+        str: The strategy used: "reflink", "hardlink", "copy_file_range", "sendfile" or "copy"
+    """
+    if mode not in ASSET_LINK_MODES:
+        raise Exception(f"Unknown asset link mode: {mode}")
+    if mode == "copy":
+        shutil.copy2(src_path, dest_path)
+        return "copy"
+    if mode in ("reflink", "auto") and _reflink(src_path, dest_path):
+        return "reflink"
+    if mode in ("hardlink", "auto") and _hardlink(src_path, dest_path):
+        return "hardlink"
+    return _stream(src_path, dest_path)
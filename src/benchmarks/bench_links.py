@@ -0,0 +1,95 @@
+"""
+Adversarial benchmark for split_nodes_link and split_nodes_image.
+
+Builds a single paragraph containing N links (or images) and times splitting it.
+Per-link cost should stay flat as N grows; the old recursive implementation was
+O(n^2) and raised RecursionError past ~1000 links.
+
+The report is JSON on stdout (or --output FILE), with one result per (splitter, size)
+pair, so two runs can be diffed like those of the other benchmarks.
+
+Usage:
+    PYTHONPATH=. python3 src/benchmarks/bench_links.py [--sizes 1000 10000 100000]
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+
+from src.splitdelimiter import split_nodes_image, split_nodes_link
+from src.textnode import TextNode, TextType
+
+DEFAULT_SIZES = (1000, 10000, 100000)
+
+
+def make_link_paragraph(count):
+    """Return one paragraph of 'count' links separated by single spaces."""
+    return " ".join(f"[link {i}](https://example.com/{i})" for i in range(count))
+
+
+def make_image_paragraph(count):
+    """Return one paragraph of 'count' images separated by single spaces."""
+    return " ".join(f"![image {i}](/images/{i}.png)" for i in range(count))
+
+
+def best_time(function, argument, repeat=3):
+    """Return the fastest of 'repeat' runs of function(argument), in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(argument)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(sizes=DEFAULT_SIZES, repeat=3):
+    """
+    Time both splitters on a paragraph of each size.
+
+    Returns:
+        dict: The JSON-serializable report
+    """
+    results = []
+    for name, splitter, make_paragraph in (
+        ("split_nodes_link", split_nodes_link, make_link_paragraph),
+        ("split_nodes_image", split_nodes_image, make_image_paragraph),
+    ):
+        for size in sizes:
+            nodes = [TextNode(make_paragraph(size), TextType.TEXT)]
+            seconds = best_time(splitter, nodes, repeat)
+            results.append({
+                "splitter": name,
+                "items": size,
+                "seconds": seconds,
+                "us_per_item": seconds / size * 1e6,
+            })
+            print(f"{name:<18}{size:>10}{seconds:>12.4f} s{seconds / size * 1e6:>10.2f} us/item", file=sys.stderr)
+    return {
+        "benchmark": "links",
+        "python": platform.python_version(),
+        "repeat": repeat,
+        "results": results,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time splitting paragraphs of many links and images.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES), metavar="N",
+                        help="Links (and images) per paragraph (default: %(default)s)")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per size; the fastest is reported (default: 3)")
+    parser.add_argument("--output", "-o", metavar="FILE", help="Write the JSON report to FILE instead of stdout")
+    args = parser.parse_args(argv)
+
+    report = run(args.sizes, args.repeat)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            json.dump(report, file, indent=2)
+            file.write("\n")
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Memory and allocation benchmark for the node classes.
+
+Parses and renders one large generated page and reports, via tracemalloc, the
+peak traced memory, the memory still held by the node tree, and the number of
+live allocation blocks the tree accounts for.
+
+The report is JSON on stdout (or --output FILE), so the memory and time numbers of two
+runs can be compared like those of the other benchmarks.
+
+Usage:
+    PYTHONPATH=. python3 src/benchmarks/bench_nodes.py [--sections 5000]
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+from src.markdown_to_html import markdown_to_html_node
+
+
+def make_page(sections):
+    """Return a markdown page with 'sections' headed sections of mixed inline markup."""
+    parts = []
+    for i in range(sections):
+        parts.append(f"## Section {i}")
+        parts.append(f"Some **bold** text, a [link](/posts/{i}) and _italic_ words with `code` in paragraph {i}.")
+        parts.append(f"- first item {i}\n- second **item**\n- third [item](/items/{i})")
+    return "\n\n".join(parts)
+
+
+def measure(markdown):
+    """Parse and render 'markdown', returning memory and allocation statistics."""
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    start = time.perf_counter()
+    root = markdown_to_html_node(markdown)
+    parse_seconds = time.perf_counter() - start
+    tree_snapshot = tracemalloc.take_snapshot()
+    tree_bytes, _ = tracemalloc.get_traced_memory()
+    html = root.to_html()
+    _, peak_bytes = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    tree_blocks = sum(stat.count_diff for stat in tree_snapshot.compare_to(before, "filename"))
+    return {
+        "markdown_bytes": len(markdown),
+        "html_bytes": len(html),
+        "tree_bytes": tree_bytes,
+        "tree_blocks": tree_blocks,
+        "peak_bytes": peak_bytes,
+        "parse_seconds": parse_seconds,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure the memory held by the node tree of one large page.")
+    parser.add_argument("--sections", type=int, default=5000,
+                        help="Headed sections in the generated page (default: %(default)s)")
+    parser.add_argument("--output", "-o", metavar="FILE", help="Write the JSON report to FILE instead of stdout")
+    args = parser.parse_args(argv)
+
+    report = {
+        "benchmark": "nodes",
+        "python": platform.python_version(),
+        "sections": args.sections,
+        "results": measure(make_page(args.sections)),
+    }
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            json.dump(report, file, indent=2)
+            file.write("\n")
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+"""
+Microbenchmarks for each stage of the markdown pipeline.
+
+Every stage runs on the same seeded documents at several sizes, so numbers are comparable
+between runs and between commits. For each (stage, size) pair the report gives:
+
+    seconds_per_op   fastest time of one call, over enough repeats to fill --min-time
+    ops_per_sec      1 / seconds_per_op
+    kb_per_sec       markdown input processed per second, in KiB
+    peak_bytes       peak traced memory during one call (tracemalloc)
+    live_blocks      memory blocks still allocated after the call, while its result is alive
+
+The report is JSON on stdout (or --output FILE), so two runs can be diffed or plotted.
+
+Usage:
+    PYTHONPATH=. python3 src/benchmarks/bench_pipeline.py [--sizes 4 64 512] [--stage NAME ...]
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from src.benchmarks.corpus import SEED, make_document
+from src.block import block_to_block_type, scan_blocks
+from src.extract_markdown import markdown_to_blocks
+from src.generate_page import generate_page
+from src.markdown_to_html import markdown_to_html_node
+from src.splitdelimiter import split_nodes_delimiter, split_nodes_image, split_nodes_link
+from src.template import Template
+from src.textnode import TextNode, TextType, text_to_text_node
+
+# Document sizes in KiB
+DEFAULT_SIZES = (4, 64, 512)
+TEMPLATE = '<html><head><title>{{ Title }}</title><link href="/index.css" /></head><body>{{ Content }}</body></html>'
+
+
+def _text_nodes(blocks):
+    """One TEXT node per block that gets inline parsing, as the splitters receive them."""
+    return [TextNode(block, TextType.TEXT) for block in blocks if not block.startswith("```")]
+
+
+def make_stages(markdown, workdir):
+    """
+    Return (name, callable) pairs for every stage, each prepared with the inputs it consumes,
+    so that only the stage itself is measured.
+    """
+    blocks = markdown_to_blocks(markdown)
+    inline_texts = [block for block in blocks if not block.startswith("```")]
+    text_nodes = _text_nodes(blocks)
+    root = markdown_to_html_node(markdown)
+    template = Template(TEMPLATE, "/ssg/")
+    source = os.path.join(workdir, "page.md")
+    dest = os.path.join(workdir, "page.html")
+    with open(source, 'w', encoding='utf-8') as file:
+        file.write(markdown)
+
+    return [
+        ("markdown_to_blocks", lambda: markdown_to_blocks(markdown)),
+        ("scan_blocks", lambda: scan_blocks(markdown)),
+        ("block_to_block_type", lambda: [block_to_block_type(block) for block in blocks]),
+        ("text_to_text_node", lambda: [text_to_text_node(text) for text in inline_texts]),
+        ("split_nodes_delimiter", lambda: split_nodes_delimiter(text_nodes, "**", TextType.BOLD)),
+        ("split_nodes_image", lambda: split_nodes_image(text_nodes)),
+        ("split_nodes_link", lambda: split_nodes_link(text_nodes)),
+        ("markdown_to_html_node", lambda: markdown_to_html_node(markdown)),
+        ("to_html", root.to_html),
+        ("generate_page", lambda: generate_page(source, None, dest, "/ssg/", template=template,
+                                                log=lambda line: None, stream=True)),
+    ]
+
+
+def time_stage(function, min_time=0.2, max_repeat=1000):
+    """Return the fastest single call of 'function', repeating it until 'min_time' seconds have passed."""
+    best = float("inf")
+    spent = 0.0
+    repeat = 0
+    while repeat < max_repeat and (spent < min_time or repeat < 3):
+        start = time.perf_counter()
+        function()
+        elapsed = time.perf_counter() - start
+        best = min(best, elapsed)
+        spent += elapsed
+        repeat += 1
+    return best, repeat
+
+
+def measure_allocations(function):
+    """Return (peak traced bytes, blocks left allocated) for one call of 'function'."""
+    tracemalloc.start()
+    blocks_before = sys.getallocatedblocks()
+    result = function()
+    live_blocks = sys.getallocatedblocks() - blocks_before
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    del result
+    return peak, live_blocks
+
+
+def run(sizes=DEFAULT_SIZES, stages=None, min_time=0.2, seed=SEED):
+    """
+    Benchmark the selected stages (all by default) on documents of each size.
+
+    Returns:
+        dict: The JSON-serializable report
+    """
+    results = []
+    with tempfile.TemporaryDirectory() as workdir:
+        for size_kb in sizes:
+            markdown = make_document(size_kb, seed)
+            input_bytes = len(markdown.encode('utf-8'))
+            for name, function in make_stages(markdown, workdir):
+                if stages and name not in stages:
+                    continue
+                function()  # warm up
+                seconds, repeat = time_stage(function, min_time)
+                peak_bytes, live_blocks = measure_allocations(function)
+                results.append({
+                    "stage": name,
+                    "size_kb": size_kb,
+                    "input_bytes": input_bytes,
+                    "repeat": repeat,
+                    "seconds_per_op": seconds,
+                    "ops_per_sec": 1 / seconds,
+                    "kb_per_sec": input_bytes / 1024 / seconds,
+                    "peak_bytes": peak_bytes,
+                    "live_blocks": live_blocks,
+                })
+                print(f"{name:<24}{size_kb:>6} KiB{seconds * 1000:>12.3f} ms{input_bytes / 1024 / seconds:>14.0f} KiB/s",
+                      file=sys.stderr)
+    return {
+        "benchmark": "pipeline",
+        "python": platform.python_version(),
+        "seed": seed,
+        "min_time": min_time,
+        "results": results,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time each stage of the markdown pipeline.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES), metavar="KIB",
+                        help="Document sizes in KiB (default: %(default)s)")
+    parser.add_argument("--stage", action="append", dest="stages", metavar="NAME",
+                        help="Only run this stage (repeatable)")
+    parser.add_argument("--min-time", type=float, default=0.2, metavar="SECONDS",
+                        help="Minimum time spent repeating each measurement (default: 0.2)")
+    parser.add_argument("--seed", type=int, default=SEED, help="Seed for the generated documents")
+    parser.add_argument("--output", "-o", metavar="FILE", help="Write the JSON report to FILE instead of stdout")
+    args = parser.parse_args(argv)
+
+    report = run(args.sizes, args.stages, args.min_time, args.seed)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            json.dump(report, file, indent=2)
+            file.write("\n")
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+"""
+End-to-end site build benchmark.
+
+Generates a synthetic site with corpus.py and builds it with copy_static_to_public in two modes:
+
+    cold   empty output directory, every page rendered and every asset copied
+    warm   incremental rebuild of the finished output with no source changes
+
+Each mode runs in a fresh child process so its peak RSS (including render worker processes) is
+measured on its own. The report records wall time, pages/sec and peak RSS per mode as JSON.
+
+Given --baseline, the results are compared with a previous report and every metric that got worse
+by more than --threshold is flagged; the exit status is then 1. Use --save-baseline to store a run.
+
+Usage:
+    PYTHONPATH=. python3 src/benchmarks/bench_site.py [--pages 5000] [--jobs 4] [--baseline FILE]
+"""
+import argparse
+import contextlib
+import json
+import logging
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+try:
+    import resource
+except ImportError:  # Not available on Windows; peak RSS is then reported as null
+    resource = None
+
+from src.benchmarks.corpus import add_settings_arguments, generate_site, settings_from_args
+
+# Repository root, so the child processes can import the src package
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+MODES = ("cold", "warm")
+# Metrics compared against the baseline; higher is worse for all of them
+COMPARED_METRICS = ("wall_seconds", "peak_rss_kb")
+
+
+def peak_rss_kb():
+    """Peak resident set size of this process and its finished children, in KiB."""
+    if resource is None:
+        return None
+    peak = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+               resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    # ru_maxrss is in bytes on macOS and in KiB elsewhere
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def run_mode(mode, site_dir, jobs, pipeline=False):
+    """Build the site at 'site_dir' once in 'mode' and return its measurements (runs in the child process)."""
+    from src.main import copy_static_to_public
+
+    dest_dir = os.path.join(site_dir, "docs")
+    if mode == "cold" and os.path.exists(dest_dir):
+        shutil.rmtree(dest_dir)
+    pages = sum(name.endswith(".md") for _, _, files in os.walk(os.path.join(site_dir, "content")) for name in files)
+
+    logging.disable(logging.CRITICAL)
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        start = time.perf_counter()
+        success = copy_static_to_public(os.path.join(site_dir, "static"), dest_dir, os.path.join(site_dir, "content"),
+                                        os.path.join(site_dir, "template.html"), "/ssg/",
+                                        incremental=(mode == "warm"), jobs=jobs, pipeline=pipeline)
+        wall = time.perf_counter() - start
+    if not success:
+        raise SystemExit(f"{mode} build failed")
+    return {"wall_seconds": wall, "pages": pages, "pages_per_sec": pages / wall, "peak_rss_kb": peak_rss_kb()}
+
+
+def measure(mode, site_dir, jobs, pipeline=False):
+    """Run one mode in a child process and return its measurements."""
+    output = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--run-mode", mode, "--site", site_dir, "--jobs", str(jobs)]
+        + ["--pipeline"] * pipeline,
+        check=True, capture_output=True, text=True, env={**os.environ, "PYTHONPATH": ROOT_DIR},
+    ).stdout
+    return json.loads(output)
+
+
+def compare(report, baseline, threshold):
+    """
+    Compare each mode's metrics with 'baseline'.
+
+    Returns:
+        list: Regressions as dicts with "mode", "metric", "baseline", "current" and "change" (a ratio)
+    """
+    regressions = []
+    for mode, current in report["modes"].items():
+        previous = baseline.get("modes", {}).get(mode)
+        if not previous:
+            continue
+        for metric in COMPARED_METRICS:
+            if not current.get(metric) or not previous.get(metric):
+                continue
+            change = current[metric] / previous[metric] - 1
+            if change > threshold:
+                regressions.append({"mode": mode, "metric": metric, "baseline": previous[metric],
+                                    "current": current[metric], "change": change})
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark full site builds on a synthetic corpus.")
+    add_settings_arguments(parser)
+    parser.add_argument("--jobs", "-j", type=int, default=1, help="Render worker processes (default: 1)")
+    parser.add_argument("--pipeline", action="store_true",
+                        help="Build with a reader and a writer thread overlapping the rendering")
+    parser.add_argument("--repeat", type=int, default=1, help="Runs per mode; the fastest is reported (default: 1)")
+    parser.add_argument("--workdir", help="Generate the site here and keep it (default: a temporary directory)")
+    parser.add_argument("--baseline", metavar="FILE", help="Compare against the report stored in FILE")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="Relative slowdown that counts as a regression (default: 0.10)")
+    parser.add_argument("--save-baseline", metavar="FILE", help="Store this run's report in FILE")
+    parser.add_argument("--output", "-o", metavar="FILE", help="Write the JSON report to FILE instead of stdout")
+    parser.add_argument("--run-mode", choices=MODES, help=argparse.SUPPRESS)
+    parser.add_argument("--site", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.run_mode:
+        json.dump(run_mode(args.run_mode, args.site, args.jobs, args.pipeline), sys.stdout)
+        return 0
+
+    settings = settings_from_args(args)
+    with contextlib.ExitStack() as stack:
+        site_dir = args.workdir or stack.enter_context(tempfile.TemporaryDirectory())
+        if os.path.exists(os.path.join(site_dir, "content")):
+            shutil.rmtree(os.path.join(site_dir, "content"))
+        site = generate_site(site_dir, settings)
+        print(f"Generated {site['pages']} pages ({site['bytes'] / 1024 / 1024:.1f} MiB) in {site_dir}", file=sys.stderr)
+
+        modes = {}
+        for mode in MODES:
+            runs = [measure(mode, site_dir, args.jobs, args.pipeline) for _ in range(max(args.repeat, 1))]
+            modes[mode] = min(runs, key=lambda result: result["wall_seconds"])
+            print(f"{mode:<6}{modes[mode]['wall_seconds']:>10.2f} s{modes[mode]['pages_per_sec']:>12.0f} pages/s"
+                  f"{modes[mode]['peak_rss_kb'] or 0:>12} KiB peak RSS", file=sys.stderr)
+
+    report = {
+        "benchmark": "site",
+        "python": platform.python_version(),
+        "settings": settings.as_dict(),
+        "jobs": args.jobs,
+        "pipeline": args.pipeline,
+        "modes": modes,
+    }
+
+    status = 0
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as file:
+            baseline = json.load(file)
+        if (baseline.get("settings") != report["settings"] or baseline.get("jobs") != report["jobs"]
+                or baseline.get("pipeline", False) != report["pipeline"]):
+            print("⚠️  Baseline was recorded with different settings; results may not be comparable", file=sys.stderr)
+        report["regressions"] = compare(report, baseline, args.threshold)
+        for regression in report["regressions"]:
+            print(f"❌ {regression['mode']} {regression['metric']}: {regression['baseline']:.3f} → "
+                  f"{regression['current']:.3f} ({regression['change']:+.1%})", file=sys.stderr)
+        if report["regressions"]:
+            status = 1
+        else:
+            print(f"✓ No regressions above {args.threshold:.0%}", file=sys.stderr)
+
+    for path in (args.save_baseline, args.output):
+        if path:
+            with open(path, 'w', encoding='utf-8') as file:
+                json.dump(report, file, indent=2)
+                file.write("\n")
+    if not args.output:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
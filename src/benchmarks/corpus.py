@@ -0,0 +1,218 @@
+"""
+Synthetic site generator for benchmarks.
+
+Writes a content/ tree, a static/ directory and a template that look like a real site built by
+this project, with a configurable number of pages, page size, block mix, link and image density
+and directory depth. The same seed and settings always produce the same files.
+
+Usage:
+    PYTHONPATH=. python3 src/benchmarks/corpus.py OUTPUT_DIR [--pages 1000] [--page-kb 4] [--depth 2]
+"""
+import argparse
+import os
+import random
+
+SEED = 1234
+TEMPLATE = ('<!DOCTYPE html>\n<html>\n<head>\n<title>{{ Title }}</title>\n<link href="/index.css" rel="stylesheet" />\n'
+            '</head>\n<body>\n<article>\n{{ Content }}\n</article>\n</body>\n</html>\n')
+
+WORDS = ("the", "river", "elves", "ring", "valley", "road", "shadow", "light", "song", "tower", "forest",
+         "journey", "hobbit", "wizard", "mountain", "ancient", "quiet", "bright", "long", "under")
+
+# Relative weights of the block types in generated pages
+DEFAULT_BLOCK_MIX = {
+    "heading": 1,
+    "paragraph": 4,
+    "unordered_list": 1.5,
+    "ordered_list": 1,
+    "quote": 1,
+    "code": 1.5,
+}
+
+
+class CorpusSettings:
+    """
+    Shape of a generated site.
+
+    Args:
+        pages (int): Number of markdown pages (default: 1000)
+        page_kb (float): Approximate size of each page in KiB (default: 4)
+        depth (int): Directory levels below content/ that pages are spread over (default: 2)
+        fanout (int): Subdirectories per directory (default: 10)
+        links (float): Links per inline sentence, on average (default: 0.4)
+        images (float): Images per inline sentence, on average (default: 0.1)
+        block_mix (dict, optional): Relative weights of block types (default: DEFAULT_BLOCK_MIX)
+        assets (int): Number of static image files (default: 20)
+        seed (int): Random seed (default: SEED)
+    """
+
+    def __init__(self, pages=1000, page_kb=4, depth=2, fanout=10, links=0.4, images=0.1, block_mix=None, assets=20,
+                 seed=SEED):
+        self.pages = pages
+        self.page_kb = page_kb
+        self.depth = depth
+        self.fanout = fanout
+        self.links = links
+        self.images = images
+        self.block_mix = dict(block_mix or DEFAULT_BLOCK_MIX)
+        self.assets = assets
+        self.seed = seed
+
+    def as_dict(self):
+        return dict(vars(self))
+
+
+def _words(rng, count):
+    return " ".join(rng.choice(WORDS) for _ in range(count))
+
+
+def _count(rng, mean):
+    """Draw a small non-negative count with the given mean."""
+    count = int(mean)
+    if rng.random() < mean - count:
+        count += 1
+    return count
+
+
+def _inline(rng, settings, urls):
+    """A sentence mixing plain text with inline markup at the configured link and image density."""
+    parts = [_words(rng, rng.randint(3, 8))]
+    markup = []
+    for _ in range(_count(rng, settings.links)):
+        markup.append(f"[{_words(rng, 2)}]({rng.choice(urls)})")
+    for _ in range(_count(rng, settings.images)):
+        markup.append(f"![{_words(rng, 2)}](/images/{rng.randrange(max(settings.assets, 1))}.png)")
+    for _ in range(rng.randint(0, 2)):
+        markup.append(rng.choice((f"**{_words(rng, 2)}**", f"_{_words(rng, 2)}_", f"`{rng.choice(WORDS)}()`")))
+    rng.shuffle(markup)
+    for item in markup:
+        parts.append(item)
+        parts.append(_words(rng, rng.randint(2, 6)))
+    return " ".join(parts) + "."
+
+
+def _block(rng, settings, urls, kinds, weights):
+    kind = rng.choices(kinds, weights)[0]
+    if kind == "heading":
+        return "#" * rng.randint(2, 4) + " " + _words(rng, 4)
+    if kind == "paragraph":
+        return "\n".join(_inline(rng, settings, urls) for _ in range(rng.randint(1, 4)))
+    if kind == "unordered_list":
+        return "\n".join(f"- {_inline(rng, settings, urls)}" for _ in range(rng.randint(2, 6)))
+    if kind == "ordered_list":
+        return "\n".join(f"{i}. {_inline(rng, settings, urls)}" for i in range(1, rng.randint(3, 7)))
+    if kind == "quote":
+        return "\n".join(f"> {_inline(rng, settings, urls)}" for _ in range(rng.randint(1, 3)))
+    return "```\n" + "\n".join(f"{rng.choice(WORDS)}({_words(rng, 2)})" for _ in range(rng.randint(2, 8))) + "\n```"
+
+
+def make_page(rng, settings, urls=("/",)):
+    """Return one markdown page of roughly settings.page_kb KiB, starting with its title."""
+    kinds = list(settings.block_mix)
+    weights = [settings.block_mix[kind] for kind in kinds]
+    blocks = ["# " + _words(rng, 4)]
+    size = len(blocks[0])
+    while size < settings.page_kb * 1024:
+        blocks.append(_block(rng, settings, urls, kinds, weights))
+        size += len(blocks[-1]) + 2
+    return "\n\n".join(blocks) + "\n"
+
+
+def make_document(size_kb, seed=SEED):
+    """Return a deterministic markdown document of roughly 'size_kb' KiB with the default block mix."""
+    return make_page(random.Random(f"{seed}:{size_kb}"), CorpusSettings(page_kb=size_kb, seed=seed))
+
+
+def page_paths(settings):
+    """Return the content-relative paths of every page, spread over settings.depth directory levels."""
+    paths = ["index.md"]
+    for number in range(1, settings.pages):
+        directories = []
+        rest = number
+        for _ in range(settings.depth):
+            directories.append(f"section{rest % settings.fanout}")
+            rest //= settings.fanout
+        paths.append(os.path.join(*directories, f"page{number}", "index.md"))
+    return paths[:settings.pages]
+
+
+def generate_site(root, settings=None):
+    """
+    Write a synthetic site below 'root': root/content, root/static and root/template.html.
+
+    Args:
+        root (str): Directory to write into (created if missing)
+        settings (CorpusSettings, optional): Shape of the site (default: CorpusSettings())
+
+    Returns:
+        dict: Paths of the generated "content", "static" and "template" plus the "pages" and total "bytes"
+    """
+    settings = settings or CorpusSettings()
+    rng = random.Random(settings.seed)
+    content_dir = os.path.join(root, "content")
+    static_dir = os.path.join(root, "static")
+    template_file = os.path.join(root, "template.html")
+
+    paths = page_paths(settings)
+    # Pages link to each other through the same directory URLs the site is published at
+    urls = ["/"] + ["/" + os.path.dirname(path).replace(os.sep, "/") for path in paths[1:]]
+    total = 0
+    for path in paths:
+        markdown = make_page(rng, settings, urls)
+        file_path = os.path.join(content_dir, path)
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        with open(file_path, 'w', encoding='utf-8') as file:
+            file.write(markdown)
+        total += len(markdown)
+
+    os.makedirs(os.path.join(static_dir, "images"), exist_ok=True)
+    with open(os.path.join(static_dir, "index.css"), 'w', encoding='utf-8') as file:
+        file.write("body { font-family: sans-serif; }\n")
+    for number in range(settings.assets):
+        with open(os.path.join(static_dir, "images", f"{number}.png"), 'wb') as file:
+            file.write(rng.randbytes(rng.randint(1024, 16 * 1024)))
+    with open(template_file, 'w', encoding='utf-8') as file:
+        file.write(TEMPLATE)
+
+    return {"content": content_dir, "static": static_dir, "template": template_file, "pages": len(paths),
+            "bytes": total}
+
+
+def add_settings_arguments(parser):
+    """Add the CorpusSettings options to an argparse parser."""
+    parser.add_argument("--pages", type=int, default=1000, help="Number of pages (default: 1000)")
+    parser.add_argument("--page-kb", type=float, default=4, help="Approximate page size in KiB (default: 4)")
+    parser.add_argument("--depth", type=int, default=2, help="Directory depth of the content tree (default: 2)")
+    parser.add_argument("--fanout", type=int, default=10, help="Subdirectories per directory (default: 10)")
+    parser.add_argument("--links", type=float, default=0.4, help="Links per sentence (default: 0.4)")
+    parser.add_argument("--images", type=float, default=0.1, help="Images per sentence (default: 0.1)")
+    parser.add_argument("--mix", metavar="TYPE=WEIGHT", nargs="+",
+                        help="Block type weights, e.g. paragraph=4 code=0 (types: "
+                             + ", ".join(DEFAULT_BLOCK_MIX) + ")")
+    parser.add_argument("--assets", type=int, default=20, help="Number of static images (default: 20)")
+    parser.add_argument("--seed", type=int, default=SEED, help="Random seed")
+
+
+def settings_from_args(args):
+    """Build CorpusSettings from arguments added by add_settings_arguments."""
+    block_mix = dict(DEFAULT_BLOCK_MIX)
+    for item in args.mix or ():
+        kind, _, weight = item.partition("=")
+        if kind not in block_mix:
+            raise ValueError(f"Unknown block type '{kind}'")
+        block_mix[kind] = float(weight)
+    return CorpusSettings(args.pages, args.page_kb, args.depth, args.fanout, args.links, args.images, block_mix,
+                          args.assets, args.seed)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a synthetic site for benchmarks.")
+    parser.add_argument("output", help="Directory to write content/, static/ and template.html into")
+    add_settings_arguments(parser)
+    args = parser.parse_args(argv)
+    site = generate_site(args.output, settings_from_args(args))
+    print(f"Generated {site['pages']} pages ({site['bytes'] / 1024 / 1024:.1f} MiB of markdown) in {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,6 @@
 import contextlib
+import re
+from collections import namedtuple
 from enum import Enum
 
 class BlockType(Enum):
@@ -8,6 +10,15 @@ class BlockType(Enum):
   QUOTE = "quote"
   UNORDERED_LIST = "unordered_list"
   ORDERED_LIST = "ordered_list"
+
+_HEADING_PREFIXES = tuple('#' * i + ' ' for i in range(1, 7))
+_UNORDERED_MARKERS = ('- ', '* ', '+ ')
+_ORDERED_LIST_PATTERN = re.compile(r"^\s*\d+\. ")
+_FENCE = '```'
+
+# A block of a markdown document: its type, its normalized text (every line stripped)
+# and the [start, end) character span it covers in the source
+Block = namedtuple("Block", ["type", "text", "start", "end"])
   
 def block_to_block_type(block):
   # If block is empty, default to paragraph
@@ -16,28 +27,132 @@ def block_to_block_type(block):
 
   # Check for heading (1-6 '#' followed by space), allow leading spaces
   stripped = block.lstrip()
-  if any(stripped.startswith('#' * i + ' ') for i in range(1, 7)):
+  if stripped.startswith(_HEADING_PREFIXES):
     return BlockType.HEADING
 
   # Check for code block (starts and ends with ```), must be at start of line
-  if block.startswith('```') and block.rstrip().endswith('```'):
+  if block.startswith(_FENCE) and block.rstrip().endswith(_FENCE):
     return BlockType.CODE
 
   # Check for quote block (each line starts with '>'), allow leading spaces, allow '>' or '> '
-  lines = block.split('\n')
-  if all(line.lstrip().startswith('>') and (line.lstrip() == '>' or line.lstrip().startswith('> ')) for line in lines):
+  lines = [line.lstrip() for line in block.split('\n')]
+  if all(_is_quote_line(line) for line in lines):
     return BlockType.QUOTE
 
   # Check for unordered list (each line starts with '-', '*', or '+', allow leading spaces)
-  unordered_markers = ('- ', '* ', '+ ')
-  if all(any(line.lstrip().startswith(marker) for marker in unordered_markers) for line in lines):
+  if all(line.startswith(_UNORDERED_MARKERS) for line in lines):
     return BlockType.UNORDERED_LIST
 
   # Check for ordered list (each line starts with number followed by '. ', allow leading spaces, allow any numbers)
-  import re
-  ordered_list_pattern = re.compile(r"^\s*\d+\. ")
-  if all(ordered_list_pattern.match(line) for line in lines):
+  if all(_ORDERED_LIST_PATTERN.match(line) for line in lines):
     return BlockType.ORDERED_LIST
   # Default case: paragraph
   return BlockType.PARAGRAPH
-  
\ No newline at end of file
+
+def _is_quote_line(line):
+  return line.startswith('>') and (line == '>' or line.startswith('> '))
+
+# Per-line checks for the block types that constrain every line, keyed by the first character
+_LINE_CHECKS = {
+  '>': (BlockType.QUOTE, _is_quote_line),
+  **dict.fromkeys('-*+', (BlockType.UNORDERED_LIST, lambda line: line.startswith(_UNORDERED_MARKERS))),
+  **dict.fromkeys('0123456789', (BlockType.ORDERED_LIST, _ORDERED_LIST_PATTERN.match)),
+}
+
+def _make_block(block_type, lines, start, end):
+  text = '\n'.join(lines)
+  # A block opened with ``` outside a fence is only code if its last line closes it
+  if block_type is BlockType.CODE and not text.endswith(_FENCE):
+    block_type = BlockType.PARAGRAPH
+  return Block(block_type, text, start, end)
+
+def scan_blocks(markdown):
+  """
+  Split a markdown document into typed blocks in a single pass over its lines.
+
+  Blocks are separated by blank lines, and every line is stripped, like markdown_to_blocks.
+  The type is decided as lines are read: the first character of a block's first line picks
+  the candidate type, and list and quote blocks check each further line as it arrives, so no
+  block is split or scanned again. A fenced code block runs from its opening ``` line to the
+  next line ending in ``` and keeps any blank lines inside it.
+
+  Args:
+    markdown (str): Full markdown document
+
+  Returns:
+    list[Block]: The document's blocks in order, typed as block_to_block_type would
+  """
+  lines = markdown.split('\n')
+  blocks = []
+  current = []
+  block_type = None
+  line_ok = None
+  start = end = 0
+  fence = None  # (line index, offset) of an open code fence
+  fences_possible = True
+
+  index = 0
+  offset = 0
+  while True:
+    if index == len(lines):
+      if fence is None:
+        break
+      # The fence is never closed, and since a later opening fence would have closed it,
+      # no later one can be either: read its lines again as ordinary blocks
+      index, offset = fence
+      fence = None
+      fences_possible = False
+      current = []
+
+    raw = lines[index]
+    line = raw.strip()
+    line_start = offset
+    index += 1
+    offset += len(raw) + 1
+
+    if fence is not None:
+      current.append(line)
+      if line.endswith(_FENCE):
+        blocks.append(_make_block(BlockType.CODE, current, start, line_start + len(raw.rstrip())))
+        current = []
+        fence = None
+      continue
+
+    if not line:
+      if current:
+        blocks.append(_make_block(block_type, current, start, end))
+        current = []
+      continue
+
+    if not current:
+      start = line_start + len(raw) - len(raw.lstrip())
+      first = line[0]
+      if first == '#':
+        block_type = BlockType.HEADING if line.startswith(_HEADING_PREFIXES) else BlockType.PARAGRAPH
+        line_ok = None
+      elif first == '`' and line.startswith(_FENCE):
+        if fences_possible and not (len(line) >= 2 * len(_FENCE) and line.endswith(_FENCE)):
+          fence = (index - 1, line_start)
+          current.append(line)
+          continue
+        # A one-line fence or an unclosed one
+        block_type = BlockType.CODE
+        line_ok = None
+      elif first in _LINE_CHECKS:
+        block_type, line_ok = _LINE_CHECKS[first]
+        if not line_ok(line):
+          block_type = BlockType.PARAGRAPH
+          line_ok = None
+      else:
+        block_type = BlockType.PARAGRAPH
+        line_ok = None
+    elif line_ok is not None and not line_ok(line):
+      block_type = BlockType.PARAGRAPH
+      line_ok = None
+
+    current.append(line)
+    end = line_start + len(raw.rstrip())
+
+  if current:
+    blocks.append(_make_block(block_type, current, start, end))
+  return blocks
@@ -0,0 +1,118 @@
+import logging
+import os
+
+from src.report import format_bytes
+
+
+def walk_files(root, _ancestors=None):
+    """
+    Yield (rel_path, entry) for every file below 'root', in sorted order, using os.scandir.
+
+    The os.DirEntry objects cache their stat results, so a file is stat'ed once however
+    often the caller asks for its size and mtime. Symlinked files and directories are
+    followed, as shutil.copytree and the previous recursive copy did, except for a
+    directory that is one of its own ancestors, which would otherwise be walked forever.
+    Such a loop, and anything that is neither a regular file nor a directory, is logged
+    and skipped.
+    """
+    if _ancestors is None:
+        stat = os.stat(root)
+        _ancestors = frozenset([(stat.st_dev, stat.st_ino)])
+    with os.scandir(root) as scan:
+        entries = sorted(scan, key=lambda entry: entry.name)
+    subdirs = []
+    for entry in entries:
+        if entry.is_dir():
+            stat = entry.stat()
+            if (stat.st_dev, stat.st_ino) in _ancestors:
+                logging.warning(f"⚠️  Skipping symlink loop: {entry.path}")
+            else:
+                subdirs.append((entry, _ancestors | {(stat.st_dev, stat.st_ino)}))
+        elif entry.is_file():
+            yield os.path.relpath(entry.path, root), entry
+        else:
+            logging.warning(f"⚠️  Skipping special file: {entry.path}")
+    for subdir, ancestors in subdirs:
+        for rel_path, entry in walk_files(subdir.path, ancestors):
+            yield os.path.join(subdir.name, rel_path), entry
+
+
+def page_output(rel_path):
+    """Return the output path of the markdown file at 'rel_path', both relative to their root directories."""
+    return rel_path.replace('.md', '.html')
+
+
+class BuildPlan:
+    """
+    Everything a build will produce, from a single os.scandir walk of the content and static directories.
+
+    Each page and asset is a dict holding its "source" path, its "key" relative to the directory
+    it was found in, its "output" path relative to the destination directory, and the "stat"
+    result cached by the walk. 'directories' lists every directory below the destination that
+    the outputs need, parents first, so make_directories() creates each of them exactly once
+    and no later stage has to call os.makedirs.
+
+    Args:
+        pages (list, optional): Markdown sources and the pages they render to, in build order
+        assets (list, optional): Static files and where they are copied to, in build order
+    """
+
+    def __init__(self, pages=None, assets=None):
+        self.pages = pages if pages is not None else []
+        self.assets = assets if assets is not None else []
+        directories = set()
+        for item in self.pages + self.assets:
+            parent = os.path.dirname(item["output"])
+            while parent and parent not in directories:
+                directories.add(parent)
+                parent = os.path.dirname(parent)
+        self.directories = sorted(directories)
+
+    @classmethod
+    def scan(cls, src_dir=None, content_dir=None):
+        """
+        Walk 'src_dir' for static assets and 'content_dir' for markdown pages.
+
+        Either directory may be None or missing, in which case it contributes nothing.
+        """
+        pages = []
+        if content_dir is not None and os.path.isdir(content_dir):
+            for rel_path, entry in walk_files(content_dir):
+                if rel_path.endswith('.md'):
+                    pages.append({"source": entry.path, "key": rel_path, "output": page_output(rel_path),
+                                  "stat": entry.stat()})
+        assets = []
+        if src_dir is not None and os.path.isdir(src_dir):
+            for rel_path, entry in walk_files(src_dir):
+                assets.append({"source": entry.path, "key": rel_path, "output": rel_path, "stat": entry.stat()})
+        return cls(pages, assets)
+
+    def make_directories(self, dest_dir):
+        """
+        Create 'dest_dir' and every directory the planned outputs need below it.
+
+        Returns:
+            int: Number of directories created
+        """
+        os.makedirs(dest_dir, exist_ok=True)
+        created = 0
+        for directory in self.directories:
+            try:
+                os.mkdir(os.path.join(dest_dir, directory))
+            except FileExistsError:
+                continue
+            created += 1
+        return created
+
+    def format(self, dest_dir):
+        """Return the plan as human-readable text, as printed by --dry-run."""
+        page_bytes = sum(page["stat"].st_size for page in self.pages)
+        asset_bytes = sum(asset["stat"].st_size for asset in self.assets)
+        lines = [f"Build plan for '{dest_dir}'",
+                 f"  Pages:       {len(self.pages)} ({format_bytes(page_bytes)} of markdown)"]
+        lines += [f"    {page['source']} → {os.path.join(dest_dir, page['output'])}" for page in self.pages]
+        lines.append(f"  Assets:      {len(self.assets)} ({format_bytes(asset_bytes)})")
+        lines += [f"    {asset['source']} → {os.path.join(dest_dir, asset['output'])}" for asset in self.assets]
+        lines.append(f"  Directories: {len(self.directories)}")
+        lines += [f"    {os.path.join(dest_dir, directory)}{os.sep}" for directory in self.directories]
+        return "\n".join(lines)
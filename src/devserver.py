@@ -0,0 +1,277 @@
+import logging
+import mimetypes
+import os
+import threading
+import time
+from html import escape
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote, urlsplit
+
+from src.extract_title import extract_title
+from src.generate_page import decode_markdown
+from src.markdown_to_html import BlockCache, DEFAULT_MAX_BLOCKS, markdown_to_html_node
+from src.template import Template
+from src.watch import StatCache, wait_for_changes
+
+LIVERELOAD_PATH = "/__livereload"
+# Injected before </body> of every page; the browser reconnects on its own if the server restarts
+LIVERELOAD_SCRIPT = (
+    f'<script>new EventSource("{LIVERELOAD_PATH}").onmessage = function () {{ location.reload(); }};</script>'
+)
+# Seconds between keep-alive comments on idle live-reload streams, so closed tabs are noticed
+HEARTBEAT_INTERVAL = 15
+
+
+def inject_livereload(html):
+    """Insert the live-reload script before the closing body tag (or at the end of the page)."""
+    index = html.rfind("</body>")
+    if index == -1:
+        return html + LIVERELOAD_SCRIPT
+    return html[:index] + LIVERELOAD_SCRIPT + html[index:]
+
+
+class DevSite:
+    """
+    The site as the development server sees it: an in-memory view of the source tree
+    plus a cache of pages rendered on demand.
+
+    The content, static and template files are tracked by a StatCache, so routing a request
+    needs no filesystem lookups. A page is rendered through markdown_to_html_node the first
+    time it is requested and served from the cache until its source file's size or mtime
+    changes. Every detected change bumps 'version' and wakes the live-reload streams. With a
+    BlockCache, re-rendering an edited page only parses the blocks that changed.
+
+    Args:
+        content_dir (str): Content directory containing markdown files
+        static_dir (str): Static asset directory
+        template_file (str): Path to HTML template file
+        basepath (str): Base URL path the site is served from (default: "/")
+        block_cache (BlockCache, optional): Rendered blocks shared by all page renders
+    """
+
+    def __init__(self, content_dir="content", static_dir="static", template_file="template.html", basepath="/",
+                 block_cache=None):
+        self.content_dir = content_dir
+        self.static_dir = static_dir
+        self.template_file = template_file
+        self.basepath = basepath
+        self.block_cache = block_cache
+        self.files = StatCache([content_dir, static_dir, template_file])
+        self.template = Template.from_file(template_file, basepath)
+        self.version = 0
+        self.changed = threading.Condition()
+        self._pages = {}
+        self._lock = threading.Lock()
+        # Request threads take turns parsing, as the block cache is not thread-safe
+        self._parse_lock = threading.Lock()
+
+    def apply_changes(self, changes):
+        """Forget cached pages affected by 'changes' and notify live-reload listeners."""
+        with self._lock:
+            if self.template_file in changes:
+                self.template = Template.from_file(self.template_file, self.basepath)
+                self._pages.clear()
+            else:
+                for path in changes:
+                    self._pages.pop(path, None)
+        with self.changed:
+            self.version += 1
+            self.changed.notify_all()
+
+    def wait_for_version(self, version, timeout):
+        """Wait until the site version differs from 'version' and return the current version."""
+        with self.changed:
+            self.changed.wait_for(lambda: self.version != version, timeout)
+            return self.version
+
+    def resolve(self, url_path):
+        """
+        Map a request path to what should be served for it.
+
+        Returns:
+            tuple: ("page", markdown path), ("static", file path), ("redirect", location) or (None, None)
+        """
+        path = unquote(url_path)
+        prefix = self.basepath.rstrip('/')
+        if prefix and (path == prefix or path.startswith(prefix + '/')):
+            path = path[len(prefix):]
+        rel_path = path.lstrip('/')
+        parts = [part for part in rel_path.split('/') if part]
+        if any(part in ('.', '..') for part in parts):
+            return None, None
+
+        stats = self.files.stats
+        content_path = os.path.join(self.content_dir, *parts)
+        if rel_path == "" or rel_path.endswith('/'):
+            candidates = [os.path.join(content_path, "index.md")]
+        elif rel_path.endswith('.html'):
+            candidates = [content_path[:-len('.html')] + '.md']
+        elif content_path + '.md' in stats:
+            candidates = [content_path + '.md']
+        elif os.path.join(content_path, "index.md") in stats:
+            # Like GitHub Pages, serve directories at their trailing-slash URL so relative links work
+            return "redirect", url_path + '/'
+        else:
+            candidates = []
+        for candidate in candidates:
+            if candidate in stats:
+                return "page", candidate
+
+        static_path = os.path.join(self.static_dir, *parts)
+        if parts and static_path in stats:
+            return "static", static_path
+        return None, None
+
+    def render(self, source):
+        """
+        Return the page for the markdown file at 'source' as UTF-8 bytes, rendering it only
+        if it is not cached or its source has changed since it was cached.
+        """
+        stat = self.files.stats.get(source)
+        with self._lock:
+            cached = self._pages.get(source)
+            template = self.template
+        if cached is not None and cached[0] == stat:
+            return cached[1]
+
+        with open(source, 'rb') as md_file:
+            markdown_content = decode_markdown(md_file.read())
+        with self._parse_lock:
+            root_node = markdown_to_html_node(markdown_content, self.block_cache, template.basepath)
+        html = template.render(extract_title(markdown_content), root_node.to_html())
+        body = inject_livereload(html).encode('utf-8')
+        with self._lock:
+            if template is self.template:
+                self._pages[source] = (stat, body)
+        return body
+
+    def watch(self, interval=0.1, debounce=0.05):
+        """Poll the source tree forever, applying each burst of changes (run in a daemon thread)."""
+        while True:
+            changes, _ = wait_for_changes(self.files, interval, debounce)
+            try:
+                self.apply_changes(changes)
+            except Exception as e:
+                logging.error(f"❌ Could not apply changes: {e}")
+                continue
+            logging.info(f"🔁 {len(changes)} file(s) changed, reloading open pages")
+
+
+class DevRequestHandler(BaseHTTPRequestHandler):
+    """Serves pages, static files and the live-reload event stream for the DevSite in self.server.site."""
+
+    def log_message(self, format, *args):
+        logging.info(f"{self.address_string()} {format % args}")
+
+    def do_GET(self):
+        path = urlsplit(self.path).path
+        if path == LIVERELOAD_PATH and self.command == "GET":
+            self._stream_reloads()
+            return
+
+        site = self.server.site
+        kind, target = site.resolve(path)
+        if kind == "redirect":
+            self.send_response(301)
+            self.send_header("Location", target)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+        elif kind == "page":
+            started = time.perf_counter()
+            try:
+                body = site.render(target)
+            except Exception as e:
+                self._send(500, "text/html; charset=utf-8",
+                           inject_livereload(f"<h1>Failed to render {escape(target)}</h1><pre>{escape(str(e))}</pre>").encode('utf-8'))
+                return
+            self._send(200, "text/html; charset=utf-8", body)
+            logging.debug(f"Served {target} in {(time.perf_counter() - started) * 1000:.1f} ms")
+        elif kind == "static":
+            try:
+                with open(target, 'rb') as file:
+                    body = file.read()
+            except FileNotFoundError:
+                self._send(404, "text/html; charset=utf-8", inject_livereload("<h1>Not found</h1>").encode('utf-8'))
+                return
+            content_type = mimetypes.guess_type(target)[0] or "application/octet-stream"
+            self._send(200, content_type, body)
+        else:
+            self._send(404, "text/html; charset=utf-8", inject_livereload("<h1>Not found</h1>").encode('utf-8'))
+
+    def _send(self, status, content_type, body):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+    do_HEAD = do_GET
+
+    def _stream_reloads(self):
+        site = self.server.site
+        # Taken before the headers go out, so a change right after the client connects is not missed
+        version = site.version
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        try:
+            while True:
+                current = site.wait_for_version(version, HEARTBEAT_INTERVAL)
+                if current != version:
+                    self.wfile.write(b"data: reload\n\n")
+                    version = current
+                else:
+                    self.wfile.write(b": keep-alive\n\n")
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            # The tab was closed or reloaded
+            pass
+
+
+def make_server(site, host="127.0.0.1", port=8888):
+    """Create (but do not start) a threaded HTTP server for 'site'."""
+    server = ThreadingHTTPServer((host, port), DevRequestHandler)
+    server.daemon_threads = True
+    server.site = site
+    return server
+
+
+def serve(content_dir="content", static_dir="static", template_file="template.html", basepath="/",
+          host="127.0.0.1", port=8888, interval=0.1, debounce=0.05, block_cache_size=DEFAULT_MAX_BLOCKS):
+    """
+    Serve the site from memory, rendering pages on request and reloading open tabs on every change.
+
+    Nothing is written to disk: edit a markdown file, the template or a static asset and the pages
+    open in the browser refresh once the change has been picked up by the next poll.
+
+    Args:
+        content_dir (str): Content directory containing markdown files (default: "content")
+        static_dir (str): Static asset directory (default: "static")
+        template_file (str): Path to HTML template file (default: "template.html")
+        basepath (str): Base URL path the site is served from (default: "/")
+        host (str): Interface to listen on (default: "127.0.0.1")
+        port (int): Port to listen on (default: 8888)
+        interval (float): Seconds between polls for changed files (default: 0.1)
+        debounce (float): Quiet period in seconds that ends a burst of changes (default: 0.05)
+        block_cache_size (int): Rendered blocks remembered between renders (0 = off, default: DEFAULT_MAX_BLOCKS)
+    """
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s: %(message)s',
+        datefmt='%H:%M:%S'
+    )
+    site = DevSite(content_dir, static_dir, template_file, basepath,
+                   BlockCache(block_cache_size) if block_cache_size else None)
+    threading.Thread(target=site.watch, args=(interval, debounce), daemon=True).start()
+    server = make_server(site, host, port)
+    logging.info(f"🌐 Serving http://{host}:{port}{basepath} with live reload (Ctrl-C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logging.info("Stopped serving")
+    finally:
+        server.server_close()
+    return True
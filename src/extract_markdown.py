@@ -1,4 +1,5 @@
 import re
+from src.block import scan_blocks
 from src.textnode import TextNode, TextType
 
 def extract_markdown_images(text):
@@ -66,21 +67,10 @@ def extract_markdown_links_nodes(old_nodes):
     return new_nodes
 
 def markdown_to_blocks(markdown):
-    # takes a raw Markdown string (representing a full document) and returns a list of Block strings.
-    md_split = markdown.split("\n\n")
-    
-    result = []
+    """
+    Split a raw Markdown document into block strings, with every line stripped.
 
-    for block in md_split:
-        blocks_strip = block.strip()
-        if blocks_strip:
-            # handle indentation on lines
-            lines = blocks_strip.split("\n")
-            # print(lines)
-            # strip each line and join together with new lines
-            str_block = "\n".join(line.strip() for line in lines)
-            result.append(str_block)
-            
-    # print(result)
-    return result
-        
\ No newline at end of file
+    Kept for callers that only need the text; block.scan_blocks does the work and also
+    returns each block's type and source span.
+    """
+    return [block.text for block in scan_blocks(markdown)]
@@ -1,71 +1,641 @@
+import contextlib
 import os
-import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from queue import Empty, Full, Queue
 
+from src import tracing
+from src.build_plan import BuildPlan, page_output
 from src.extract_title import extract_title
+from src.htmlnode import apply_basepath, node_from_data, node_to_data
+from src.manifest import hash_bytes
 from src.markdown_to_html import markdown_to_html_node
+from src.template import Template
 
-basepath = sys.argv[1] if len(sys.argv) > 1 else '/'
 
-def generate_page(from_path, template_path, dest_path):
+def generate_page(from_path, template_path, dest_path, basepath='/', markdown_content=None, template=None, log=print,
+                  stream=False, timings=None, parse_cache=None, block_cache=None, make_dirs=True, write=True):
   # Print a message like "Generating page from `from_path` to `dest_path` using `template_path`".
-  print(f"Generating page from {from_path} to {dest_path} using {template_path}")
+  log(f"Generating page from {from_path} to {dest_path} using {template_path}")
+  # When the caller passes a 'timings' dict, it is filled with the seconds spent reading, parsing, rendering
+  # and writing the page and with the number of bytes read and written, for the build report.
+  clock = time.perf_counter if timings is not None else _no_clock
+  started = clock()
     
-  # Read the markdown file at "from_path" and store the contents in a variable.
-  with open(from_path, 'r', encoding='utf-8') as file:
-    markdown_content = file.read()
-  # Read the template file at "template_path" and store the contents in a variable.
-  with open(template_path, 'r', encoding='utf-8') as file:
-    template_content = file.read()
-  # Use the "markdown_to_html_node" function and ".to_html()" method to convert the markdown file to an HTML string.
-  html_content = markdown_to_html_node(markdown_content).to_html()
-  # Use the "extract_title" function to grab the title of the page.
-  title = extract_title(markdown_content)
-  # Replace the `{{ Title }}` and `{{ Content }}` placeholders in the template with the HTML and title generated.
-  full_content = template_content.replace("{{ Title }}", title).replace("{{ Content }}", html_content)
-  # Replace any instances of href="/ with href="{basepath}" in the full content.
-  full_content = full_content.replace('href="/', f'href="{basepath}"')
-  # Replace any instances of src="/ with src="{basepath}" in the full content.
-  full_content = full_content.replace('src="/', f'src="{basepath}"')
-  # Write the new full HTML page to a file at `dest_path`. Be sure to create any necessary directories if they don't exist.
-  os.makedirs(os.path.dirname(dest_path), exist_ok=True)
-  with open(dest_path, 'w', encoding='utf-8') as file:
-    file.write(full_content)
+  # Read the markdown file at "from_path" and store the contents in a variable (unless the caller already read it).
+  if markdown_content is None:
+    with tracing.span("read"):
+      with open(from_path, 'r', encoding='utf-8') as file:
+        markdown_content = file.read()
+  # Compile the template at "template_path" unless the caller passed one that was compiled once for the whole build.
+  if template is None:
+    template = Template.from_file(template_path, basepath)
+  read_done = clock()
+  # With a parse cache, a page whose markdown was parsed before reuses its cached title and node tree.
+  # The cached tree is the one for basepath "/", so it serves every basepath: the basepath is applied
+  # to a fresh copy of it, on a miss as well as on a hit.
+  cached = None
+  if parse_cache is not None:
+    cache_key = parse_cache.key(markdown_content)
+    cached = parse_cache.get(cache_key)
+  with tracing.span("parse", cached=cached is not None):
+    if cached is not None:
+      title, tree = cached
+      root_node = apply_basepath(node_from_data(tree), template.basepath)
+    else:
+      # Use the "markdown_to_html_node" function to convert the markdown file to a tree of HTML nodes.
+      block_lookups = (block_cache.hits, block_cache.misses) if block_cache is not None else None
+      if parse_cache is None:
+        root_node = markdown_to_html_node(markdown_content, block_cache, template.basepath)
+      else:
+        root_node = markdown_to_html_node(markdown_content, block_cache)
+      # Use the "extract_title" function to grab the title of the page.
+      title = extract_title(markdown_content)
+      if parse_cache is not None:
+        tree = node_to_data(root_node)
+        parse_cache.put(cache_key, title, tree)
+        if template.basepath != '/':
+          # The nodes may be shared with the block cache, so the basepath goes on a copy
+          root_node = apply_basepath(node_from_data(tree), template.basepath)
+  parse_done = clock()
+  # Write the new full HTML page to a file at `dest_path`. Be sure to create any necessary directories if they don't exist
+  # (unless a BuildPlan already created them). A caller passing write=False only wants the page's content
+  # back, and writes it itself.
+  if make_dirs and write:
+    os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+  # Pages whose bytes are unchanged are left untouched, keeping their mtime, so syncing the output
+  # directory afterwards only moves the pages that really changed.
+  if stream and write:
+    # Stream the template and the node tree's HTML fragments straight into a temporary file without
+    # building the page as one string; there is then no full content to return. to_html, the
+    # template and the write are interleaved here, so they are traced as one span, and the
+    # time spent flushing the file's buffer while fragments are written counts as rendering.
+    with tracing.span("write", streamed=True):
+      tmp_path = _tmp_path(dest_path)
+      try:
+        with open(tmp_path, 'w', encoding='utf-8') as file:
+          render_started = clock()
+          template.write(file, title, root_node)
+          render_done = clock()
+        modified = replace_if_changed(tmp_path, dest_path)
+      except BaseException:
+        _discard(tmp_path)
+        raise
+    full_content = None
+    render_time = render_done - render_started
+  else:
+    with tracing.span("to_html"):
+      content = root_node.to_html()
+    # Fill the `{{ Title }}` and `{{ Content }}` slots; the template's own href="/ and src="/ links were
+    # already pointed at the basepath when it was compiled, and the body's by apply_basepath.
+    with tracing.span("template"):
+      full_content = template.render(title, content)
+    render_time = clock() - parse_done
+    if write:
+      with tracing.span("write"):
+        modified = write_if_changed(dest_path, full_content)
+  if timings is not None:
+    write_done = clock()
+    timings.update({
+      "read": read_done - started,
+      "parse": parse_done - read_done,
+      "render": render_time,
+      "write": write_done - parse_done - render_time,
+      "bytes_read": os.path.getsize(from_path),
+    })
+    if write:
+      timings["bytes_written"] = os.path.getsize(dest_path)
+      timings["modified"] = modified
+    if parse_cache is not None:
+      timings["cached"] = cached is not None
+    if block_cache is not None and cached is None:
+      timings["block_hits"] = block_cache.hits - block_lookups[0]
+      timings["block_misses"] = block_cache.misses - block_lookups[1]
   # Print a message like "Page generated successfully at `dest_path`".
-  print(f"Page generated successfully at {dest_path}")
+  log(f"Page generated successfully at {dest_path}")
   return full_content  # Return the full content for testing purposes
 
-def generate_pages_recursive(dir_path_content, template_path, dest_dir_path):
+def _no_clock():
+  return 0.0
+
+def _tmp_path(path):
+  return f"{path}.{os.getpid()}.tmp"
+
+def _discard(tmp_path):
+  # The temporary file may not exist: open() itself can be what failed
+  with contextlib.suppress(FileNotFoundError):
+    os.remove(tmp_path)
+
+def _same_bytes(path, other_path, chunk_size=1024 * 1024):
+  try:
+    if os.path.getsize(path) != os.path.getsize(other_path):
+      return False
+  except FileNotFoundError:
+    return False
+  with open(path, 'rb') as file, open(other_path, 'rb') as other:
+    while True:
+      chunk = file.read(chunk_size)
+      if chunk != other.read(chunk_size):
+        return False
+      if not chunk:
+        return True
+
+def replace_if_changed(tmp_path, path):
+  """
+  Move the file just written at 'tmp_path' over 'path', unless 'path' already holds the same bytes.
+
+  The sizes are compared first, so most changed files are told apart without reading either of them.
+  An identical 'path' is left untouched (keeping its mtime) and the temporary file is removed.
+
+  Returns:
+      bool: True if 'path' was written
+  """
+  try:
+    if _same_bytes(tmp_path, path):
+      os.remove(tmp_path)
+      return False
+    os.replace(tmp_path, path)
+  except BaseException:
+    _discard(tmp_path)
+    raise
+  return True
+
+def write_if_changed(path, text):
+  """
+  Write 'text' to 'path' as open(path, 'w', encoding='utf-8') would, unless the file already holds those bytes.
+
+  The sizes are compared first, so the existing file is only read when it could be identical. New
+  content is written to a temporary file that is renamed over 'path', so a reader never sees a
+  half-written file and files hard-linked to 'path' are left as they were.
+
+  Returns:
+      bool: True if 'path' was written
+  """
+  if os.linesep != '\n':
+    text = text.replace('\n', os.linesep)
+  data = text.encode('utf-8')
+  try:
+    if os.path.getsize(path) == len(data):
+      with open(path, 'rb') as file:
+        if file.read() == data:
+          return False
+  except FileNotFoundError:
+    pass
+  tmp_path = _tmp_path(path)
+  try:
+    with open(tmp_path, 'wb') as file:
+      file.write(data)
+    os.replace(tmp_path, path)
+  except BaseException:
+    _discard(tmp_path)
+    raise
+  return True
+
+def decode_markdown(source_bytes):
+  """Decode raw markdown bytes the same way open(..., 'r') would, including newline translation."""
+  text = source_bytes.decode('utf-8')
+  if '\r' in text:
+    text = text.replace('\r\n', '\n').replace('\r', '\n')
+  return text
+
+def remove_empty_parents(path, root):
+  """Remove the directories containing 'path' that are now empty, stopping at 'root'."""
+  root = os.path.abspath(root)
+  parent = os.path.dirname(os.path.abspath(path))
+  while parent != root and parent.startswith(root + os.sep):
+    try:
+      os.rmdir(parent)
+    except OSError:
+      break
+    parent = os.path.dirname(parent)
+
+def remove_stale_outputs(outputs, dest_dir_path):
+  """
+  Delete generated pages whose source markdown no longer exists, along with any
+  directories that become empty as a result.
+
+  Args:
+      outputs (list): Output paths relative to 'dest_dir_path'
+      dest_dir_path (str): Destination directory for generated HTML files
+  """
+  for output in outputs:
+    output_path = os.path.join(dest_dir_path, output)
+    if os.path.isfile(output_path):
+      os.remove(output_path)
+      print(f"Removed stale page: {output_path}")
+    # Walk back up towards the destination root, removing directories left empty
+    remove_empty_parents(output_path, dest_dir_path)
+
+def page_job(markdown_file_path, dir_path_content, template_path, dest_dir_path):
+  """
+  Describe how to build the page for one markdown file.
+
+  The job is a dict holding the source and destination paths, the decoded markdown (None until
+  the caller reads it), the manifest key, hash and output path used to record the page once
+  it has been generated, whether the destination directory still has to be created, whether
+  the page is written by the renderer or handed back as "html" for a pipeline's writer thread,
+  and whether the manifest reports the page as unchanged ("fresh"), so it is skipped, not built.
+  """
+  relative_path = os.path.relpath(markdown_file_path, dir_path_content)
+  dest_file_path = os.path.join(dest_dir_path, page_output(relative_path))
+  return {
+    "source": markdown_file_path,
+    "dest": dest_file_path,
+    "template_path": template_path,
+    "markdown": None,
+    "key": relative_path,
+    "hash": None,
+    "output": os.path.relpath(dest_file_path, dest_dir_path),
+    "mkdir": True,
+    "write": True,
+    "fresh": False,
+  }
+
+def collect_page_jobs(dir_path_content, template_path, dest_dir_path, manifest=None, plan=None):
+  """
+  Yield a job for every page of the build plan, in the plan's sorted order.
+
+  Pages that the manifest reports as unchanged get a "fresh" job, which the runners pass on as
+  skipped without reading or rendering it; the consumer of the results records them in the
+  manifest, in order with the pages around them. Jobs are built by page_job; with a manifest
+  their markdown and hash are filled in from a single read. Without a plan, 'dir_path_content'
+  is walked for one and its directories are created first.
+  """
+  if plan is None:
+    plan = BuildPlan.scan(content_dir=dir_path_content)
+    plan.make_directories(dest_dir_path)
+  for page in plan.pages:
+    markdown_file_path = page["source"]
+    job = page_job(markdown_file_path, dir_path_content, template_path, dest_dir_path)
+    # The plan created every directory the pages are written to
+    job["mkdir"] = False
+
+    if manifest is not None:
+      # Hash the raw bytes once and reuse them for rendering if the page is stale
+      with tracing.span("read", source=markdown_file_path):
+        with open(markdown_file_path, 'rb') as md_file:
+          source_bytes = md_file.read()
+        job["hash"] = hash_bytes(source_bytes)
+      if manifest.is_fresh(job["key"], job["hash"], job["output"]) and os.path.exists(job["dest"]):
+        job["fresh"] = True
+        yield job
+        continue
+      job["markdown"] = decode_markdown(source_bytes)
+
+    yield job
+
+def build_page(job, template, log=print, timings=None, parse_cache=None, block_cache=None):
+  """
+  Generate the page described by 'job' with a compiled template.
+
+  This is the single code path used by serial, parallel and pipelined builds. 'timings', if given,
+  is filled in by generate_page, which also looks the page up in 'parse_cache' and its blocks
+  up in 'block_cache' if they are given.
+
+  Returns:
+      str: The page's HTML when the job is not written here (job["write"] is False), else None
+  """
+  markdown_file_path = job["source"]
+  dest_file_path = job["dest"]
+
+  # Print processing information
+  log(f"Processing markdown file: {markdown_file_path} → {dest_file_path}")
+  
+  # Ensure the destination directory exists, unless the build plan created it or the page is written elsewhere
+  if job["mkdir"] and job["write"]:
+    os.makedirs(os.path.dirname(dest_file_path), exist_ok=True)
+    log(f"Creating directory: {os.path.dirname(dest_file_path)}")
+  
+  # Generate the HTML page using the generate_page function
+  with tracing.span("page", source=markdown_file_path):
+    html = generate_page(markdown_file_path, job["template_path"], dest_file_path, template.basepath,
+                         job["markdown"], template, log, stream=True, timings=timings, parse_cache=parse_cache,
+                         block_cache=block_cache, make_dirs=False, write=job["write"])
+  log(f"Generated page: {dest_file_path}")
+  return None if job["write"] else html
+
+def run_page_job(job, template, parse_cache=None, block_cache=None):
+  """
+  Build one page, capturing its log lines and any error instead of printing or raising,
+  so results can be reported in a deterministic order whichever process produced them.
+
+  Returns:
+      dict: The job (without its markdown), plus "log" (list of str), "error" (str or None),
+            "timings" (see generate_page) and, for a job that is not written here, its "html"
+  """
+  lines = []
+  timings = {}
+  error = None
+  html = None
+  try:
+    html = build_page(job, template, lines.append, timings, parse_cache, block_cache)
+  except Exception as e:
+    error = f"{type(e).__name__}: {e}"
+  result = {key: value for key, value in job.items() if key != "markdown"}
+  result["log"] = lines
+  result["error"] = error
+  result["timings"] = timings
+  if not job["write"]:
+    result["html"] = html
+  return result
+
+def skip_page_job(job):
+  """
+  Return the result of a "fresh" job, whose page is unchanged since the previous build, without building it.
+
+  The result has the shape of run_page_job's, so it is reported in order with the pages around it;
+  its only log line says the page was skipped.
+  """
+  result = {key: value for key, value in job.items() if key != "markdown"}
+  result["log"] = [f"Skipping unchanged page: {job['source']}"]
+  result["error"] = None
+  result["timings"] = {}
+  return result
+
+# Template compiled once per worker process, the shared parse cache and the worker's own block cache,
+# set by the pool initializer
+_worker_template = None
+_worker_parse_cache = None
+_worker_block_cache = None
+
+def _init_worker(template, trace=False, parse_cache=None, block_cache=None):
+  global _worker_template, _worker_parse_cache, _worker_block_cache
+  _worker_template = template
+  _worker_parse_cache = parse_cache
+  _worker_block_cache = block_cache
+  # A forked worker inherits the parent's tracer and the events it already holds; start afresh
+  tracing.disable()
+  if trace:
+    tracing.enable(f"worker {os.getpid()}")
+
+def _run_page_job_in_worker(job):
+  result = run_page_job(job, _worker_template, _worker_parse_cache, _worker_block_cache)
+  # Ship the worker's trace events back with the page so the parent can write one trace
+  result["trace"] = tracing.drain()
+  return result
+
+def map_page_jobs(page_jobs, template, jobs=1, parse_cache=None, block_cache=None):
+  """
+  Run page jobs and yield their results in submission order.
+
+  With jobs > 1 the pages are rendered by a process pool. At most a few jobs per worker are
+  in flight at once, so only a bounded number of markdown sources is held in memory. Fresh
+  jobs are never rendered: their results come from skip_page_job.
+
+  Args:
+      page_jobs (iterable): Jobs from collect_page_jobs
+      template (Template): Compiled template, sent to each worker once
+      jobs (int): Number of worker processes (default: 1, render in this process)
+      parse_cache (ParseCache, optional): Cache of parsed pages, shared by all workers
+      block_cache (BlockCache, optional): Cache of rendered blocks; every worker gets its own copy
+  """
+  if jobs <= 1:
+    for job in page_jobs:
+      if job["fresh"]:
+        yield skip_page_job(job)
+      else:
+        yield run_page_job(job, template, parse_cache, block_cache)
+    return
+
+  window = jobs * 4
+  initargs = (template, tracing.is_enabled(), parse_cache, block_cache)
+  with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=initargs) as executor:
+    # Futures of the pages being rendered, and the results of skipped pages queued behind them
+    pending = deque()
+    for job in page_jobs:
+      if job["fresh"]:
+        pending.append(skip_page_job(job))
+      else:
+        pending.append(executor.submit(_run_page_job_in_worker, job))
+      if len(pending) >= window:
+        yield _pending_result(pending.popleft())
+    while pending:
+      yield _pending_result(pending.popleft())
+
+def _pending_result(item):
+  return item if isinstance(item, dict) else item.result()
+
+# Pages read ahead of the renderers, and rendered pages waiting for the writer, in a pipelined build
+DEFAULT_PIPELINE_DEPTH = 16
+# Marks the end of a pipeline queue
+_END = object()
+
+def _put(queue, item, stop):
+  """Put 'item' on the bounded 'queue', giving up once 'stop' is set because the consumer went away."""
+  while not stop.is_set():
+    try:
+      queue.put(item, timeout=0.1)
+      return
+    except Full:
+      continue
+
+def _read_ahead(page_jobs, depth):
+  """
+  Yield 'page_jobs' with their markdown already read by a reader thread that stays up to 'depth' jobs ahead.
+
+  The jobs themselves are produced on the reader thread too, so the reads and hashes of the incremental
+  checks overlap rendering as well. Fresh jobs are passed on unread. A source that cannot be read is
+  passed on unread too, so rendering reads it again and reports the error for that page.
+  """
+  queue = Queue(depth)
+  stop = threading.Event()
+  failure = []
+
+  def read():
+    try:
+      for job in page_jobs:
+        if job["markdown"] is None and not job["fresh"]:
+          try:
+            with tracing.span("read", source=job["source"]):
+              with open(job["source"], 'rb') as md_file:
+                job["markdown"] = decode_markdown(md_file.read())
+          except (OSError, UnicodeDecodeError):
+            pass
+        _put(queue, job, stop)
+    except BaseException as e:
+      failure.append(e)
+    finally:
+      _put(queue, _END, stop)
+
+  reader = threading.Thread(target=read, name="reader", daemon=True)
+  reader.start()
+  try:
+    while (job := queue.get()) is not _END:
+      yield job
+    if failure:
+      raise failure[0]
+  finally:
+    stop.set()
+
+def _write_pages(rendered, written):
+  """Writer thread: write the pages rendered by a pipeline, in order, and pass their results on."""
+  while (result := rendered.get()) is not _END:
+    html = result.pop("html", None)
+    if result["error"] is None and not result["fresh"]:
+      started = time.perf_counter()
+      try:
+        with tracing.span("write", source=result["source"]):
+          if result["mkdir"]:
+            os.makedirs(os.path.dirname(result["dest"]), exist_ok=True)
+          modified = write_if_changed(result["dest"], html)
+        result["timings"].update({
+          "write": time.perf_counter() - started,
+          "bytes_written": os.path.getsize(result["dest"]),
+          "modified": modified,
+        })
+      except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+    written.put(result)
+  written.put(_END)
+
+def pipeline_page_jobs(page_jobs, template, jobs=1, parse_cache=None, block_cache=None,
+                       depth=DEFAULT_PIPELINE_DEPTH):
+  """
+  Run page jobs as a three-stage pipeline and yield their results in submission order.
+
+  A reader thread reads the markdown sources ahead of the renderers, the pages are rendered as
+  by map_page_jobs (in this process, or a process pool with jobs > 1), and a writer thread writes
+  the rendered pages. The stages are connected by queues of at most 'depth' pages, which caps the
+  memory held, and reads and writes overlap rendering, so a build limited by a cold disk cache
+  takes about as long as the slower of its I/O and its CPU work instead of their sum.
+
+  Pages are rendered to a string and written whole, never streamed. The files written are identical
+  to those of map_page_jobs, and a page counts as built only once it has been written.
+
+  Args:
+      page_jobs (iterable): Jobs from collect_page_jobs
+      template (Template): Compiled template
+      jobs (int): Number of worker processes rendering pages (default: 1, render in this thread)
+      parse_cache (ParseCache, optional): Cache of parsed pages
+      block_cache (BlockCache, optional): Cache of rendered blocks
+      depth (int): Capacity of the queues between the stages (default: DEFAULT_PIPELINE_DEPTH)
+  """
+  prefetched = _read_ahead(page_jobs, depth)
+
+  def render_only(jobs_to_render):
+    for job in jobs_to_render:
+      job["write"] = False
+      yield job
+
+  rendered = Queue(depth)
+  written = Queue()
+  writer = threading.Thread(target=_write_pages, args=(rendered, written), name="writer", daemon=True)
+  writer.start()
+  finished = False
+  try:
+    for result in map_page_jobs(render_only(prefetched), template, jobs, parse_cache, block_cache):
+      rendered.put(result)
+      while True:
+        try:
+          result = written.get_nowait()
+        except Empty:
+          break
+        yield result
+    rendered.put(_END)
+    finished = True
+    while (result := written.get()) is not _END:
+      yield result
+  finally:
+    prefetched.close()
+    if not finished:
+      # Let the writer finish the pages it already has, then stop
+      rendered.put(_END)
+
+def generate_pages_recursive(dir_path_content, template_path, dest_dir_path, basepath='/', manifest=None, jobs=1,
+                             report=None, parse_cache=None, block_cache=None, plan=None, pipeline=False):
   """
   Recursively crawl the directory at 'dir_path_content' and generate HTML pages for each markdown file found.
   The template file is at 'template_path' and the generated pages should be written to 'dest_dir_path'.
   Generated pages will be written to the destination directory in the same directory structure.
+
+  When a BuildManifest is given, pages whose source, template and basepath are unchanged since the
+  previous build are skipped, and pages whose source markdown was removed are deleted.
+
+  With jobs > 1 pages are rendered in a process pool. Results, log lines and errors are reported
+  in the same order as a serial build, and the generated files are byte-identical.
+
+  With a ParseCache, pages whose markdown was parsed by an earlier build are only wrapped in the
+  template, and the cache is pruned to its size cap once all pages are written. With a BlockCache,
+  blocks shared between pages are only parsed once per process.
+
+  With pipeline set, sources are read ahead and pages written by their own threads, overlapping
+  the rendering (see pipeline_page_jobs).
   
   Args:
       dir_path_content (str): Directory containing markdown files
       template_path (str): Path to the HTML template file
       dest_dir_path (str): Destination directory for generated HTML files
+      basepath (str): Base URL path the site is served from (default: "/")
+      manifest (BuildManifest, optional): Manifest from the previous build for incremental builds
+      jobs (int): Number of worker processes used to render pages (default: 1)
+      report (BuildReport, optional): Report that records every page's timings and sizes
+      parse_cache (ParseCache, optional): Cache of parsed page titles and bodies
+      block_cache (BlockCache, optional): Cache of rendered blocks
+      plan (BuildPlan, optional): The pages to build, whose directories were already created with
+          make_directories; 'dir_path_content' is walked for them when omitted
+      pipeline (bool): Overlap reading, rendering and writing pages (default: False)
+
+  Raises:
+      Exception: If one or more pages failed to generate (after all other pages were attempted)
   """
   # If the input is a single file rather than a directory
   if os.path.isfile(dir_path_content) and dir_path_content.endswith('.md'):
     # This is a single markdown file, generate its HTML page
-    generate_page(dir_path_content, template_path, dest_dir_path)
+    generate_page(dir_path_content, template_path, dest_dir_path, basepath)
     return
+
+  # Compile the template once and reuse it for every page
+  with tracing.span("compile_template"):
+    template = Template.from_file(template_path, basepath)
+
+  if manifest is not None:
+    # A changed template or basepath invalidates every page. A manifest without a template hash
+    # records no previous build (a first or full build), where every page is rendered anyway.
+    previous_build = manifest.template_hash is not None
+    template_changed = previous_build and manifest.template_hash != template.digest
+    basepath_changed = previous_build and manifest.basepath != basepath
+    manifest.begin_build(template.digest, basepath)
+    if template_changed and basepath_changed:
+      print("Template and basepath changed, regenerating all pages")
+    elif template_changed:
+      print("Template changed, regenerating all pages")
+    elif basepath_changed:
+      print("Basepath changed, regenerating all pages")
   
   # Otherwise, this is a directory so crawl it recursively
-  for root, dirs, files in os.walk(dir_path_content):
-    for file in files:
-      if file.endswith('.md'):
-        markdown_file_path = os.path.join(root, file)
-        relative_path = os.path.relpath(markdown_file_path, dir_path_content)
-        dest_file_path = os.path.join(dest_dir_path, relative_path.replace('.md', '.html'))
-        
-        # Print processing information
-        print(f"Processing markdown file: {markdown_file_path} → {dest_file_path}")
-        
-        # Ensure the destination directory exists
-        os.makedirs(os.path.dirname(dest_file_path), exist_ok=True)
-        print(f"Creating directory: {os.path.dirname(dest_file_path)}")
-        
-        # Generate the HTML page using the generate_page function
-        generate_page(markdown_file_path, template_path, dest_file_path)
-        print(f"Generated page: {dest_file_path}")
\ No newline at end of file
+  page_jobs = collect_page_jobs(dir_path_content, template_path, dest_dir_path, manifest, plan)
+  failures = []
+  rendered = 0
+  run_jobs = pipeline_page_jobs if pipeline else map_page_jobs
+  for result in run_jobs(page_jobs, template, jobs, parse_cache, block_cache):
+    tracing.add_events(result.get("trace", ()))
+    for line in result["log"]:
+      print(line)
+    if result["fresh"]:
+      manifest.record_page(result["key"], result["hash"], result["output"])
+      continue
+    if report is not None:
+      report.add_page(result)
+    if result["error"] is not None:
+      print(f"Failed to generate page from {result['source']}: {result['error']}")
+      failures.append(result["source"])
+      continue
+    rendered += 1
+    if manifest is not None:
+      manifest.record_page(result["key"], result["hash"], result["output"])
+
+  if parse_cache is not None:
+    with tracing.span("prune_parse_cache"):
+      parse_cache.prune()
+
+  if failures:
+    raise Exception(f"Failed to generate {len(failures)} page(s): {', '.join(failures)}")
+
+  if manifest is not None:
+    with tracing.span("remove_stale_pages"):
+      remove_stale_outputs(manifest.finish_build(), dest_dir_path)
+    if report is not None:
+      # Every page the manifest now lists was either rendered above or skipped as unchanged
+      report.skipped_pages += len(manifest.pages) - rendered
@@ -1,8 +1,16 @@
 import os
 import shutil
 import logging
+from concurrent.futures import ThreadPoolExecutor
 
-from src.generate_page import generate_page
+from src import tracing
+from src.asset_copy import place_asset
+from src.build_plan import BuildPlan
+from src.generate_page import generate_page, remove_empty_parents
+from src.manifest import hash_file
+
+# Threads copying static assets by default
+DEFAULT_COPY_JOBS = 4
 
 
 def _recursive_copy(src_path, dest_path):
@@ -15,19 +23,20 @@ def _recursive_copy(src_path, dest_path):
     """
     
     try:
-        # List all items in the current source directory
-        items = os.listdir(src_path)
+        # List all items in the current source directory; the entries cache their file type
+        with os.scandir(src_path) as scan:
+            items = list(scan)
         
         for item in items:
-            src_item_path = os.path.join(src_path, item)
-            dest_item_path = os.path.join(dest_path, item)
+            src_item_path = item.path
+            dest_item_path = os.path.join(dest_path, item.name)
             
-            if os.path.isfile(src_item_path):
+            if item.is_file():
                 # Copy file with metadata preservation
                 shutil.copy2(src_item_path, dest_item_path)
                 logging.info(f"📄 Copied file: {src_item_path} → {dest_item_path}")
                 
-            elif os.path.isdir(src_item_path):
+            elif item.is_dir():
                 # Create directory in destination
                 os.makedirs(dest_item_path, exist_ok=True)
                 logging.info(f"📁 Created directory: {dest_item_path}")
@@ -47,6 +56,163 @@ def _recursive_copy(src_path, dest_path):
         logging.error(f"❌ Error processing {src_path}: {e}")
 
 
+def _asset_unchanged(src_stat, src_item_path, dest_item_path, checksum=False):
+    """
+    Decide whether the copy at dest_item_path is already up to date.
+    
+    Files of a different size always differ. Files with the same size and mtime
+    (every copy strategy preserves mtime) are treated as identical; when checksum is set,
+    files whose mtime differs are compared by content hash before being recopied.
+    """
+    try:
+        dest_stat = os.stat(dest_item_path)
+    except FileNotFoundError:
+        return False
+    
+    if dest_stat.st_size != src_stat.st_size:
+        return False
+    if dest_stat.st_mtime_ns == src_stat.st_mtime_ns:
+        return True
+    return checksum and hash_file(src_item_path) == hash_file(dest_item_path)
+
+
+def asset_record(src_stat):
+    """Return the manifest entry for a static asset with the given os.stat result."""
+    return {"size": src_stat.st_size, "mtime_ns": src_stat.st_mtime_ns}
+
+
+def copy_asset(src_item_path, dest_item_path, link_mode="copy", make_dirs=True):
+    """
+    Copy one static asset, creating its destination directory if needed.
+    
+    Args:
+        src_item_path (str): Source file path
+        dest_item_path (str): Destination file path
+        link_mode (str): One of ASSET_LINK_MODES, how the copy is made (default: "copy")
+        make_dirs (bool): Create the destination directory (default: True); a build whose
+            BuildPlan already created it passes False
+    
+    Returns:
+        str: The strategy place_asset used, e.g. "hardlink"
+    """
+    with tracing.span("copy", "asset", source=src_item_path, link_mode=link_mode):
+        if make_dirs:
+            os.makedirs(os.path.dirname(dest_item_path), exist_ok=True)
+        # Unlink the old copy rather than writing into it: in a staged build it is a hardlink to the live site
+        try:
+            os.remove(dest_item_path)
+        except FileNotFoundError:
+            pass
+        strategy = place_asset(src_item_path, dest_item_path, link_mode)
+    logging.info(f"📄 Copied file ({strategy}): {src_item_path} → {dest_item_path}")
+    return strategy
+
+
+def _sync_asset(src_stat, src_item_path, dest_item_path, checksum, link_mode):
+    """Copy one asset unless it is unchanged. Returns the copy strategy, or None if nothing was copied."""
+    if _asset_unchanged(src_stat, src_item_path, dest_item_path, checksum):
+        return None
+    return copy_asset(src_item_path, dest_item_path, link_mode, make_dirs=False)
+
+
+def sync_static(src_path, dest_path, previous_assets=None, checksum=False, link_mode="copy", copy_jobs=DEFAULT_COPY_JOBS,
+                plan=None):
+    """
+    Incrementally mirror src_path into dest_path.
+    
+    Only new or changed files are copied, so unchanged assets keep their timestamps.
+    Assets listed in previous_assets that no longer exist in src_path are removed
+    from dest_path. Files in dest_path that were never assets (generated pages)
+    are left alone.
+    
+    With copy_jobs above 1 the assets are compared and copied by a pool of that many
+    threads, which keeps several reads and writes in flight on storage that can serve them.
+    
+    Args:
+        src_path (str): Source path
+        dest_path (str): Destination path
+        previous_assets (dict, optional): Assets recorded by the previous build
+        checksum (bool): Compare content hashes when size matches but mtime differs
+        link_mode (str): One of ASSET_LINK_MODES, how changed assets are copied (default: "copy")
+        copy_jobs (int): Number of threads copying assets (default: DEFAULT_COPY_JOBS)
+        plan (BuildPlan, optional): The assets to sync, whose directories below dest_path were already
+            created with make_directories; src_path is walked for them when omitted
+    
+    Returns:
+        tuple: (assets, stats) where assets maps relative path -> {"size", "mtime_ns"}
+               and stats counts "copied", "unchanged" and "removed" files and "bytes_copied",
+               and the copied files per copy strategy in "strategies"
+    """
+    assets = {}
+    stats = {"copied": 0, "unchanged": 0, "removed": 0, "bytes_copied": 0, "strategies": {}}
+    
+    if plan is None:
+        plan = BuildPlan.scan(src_dir=src_path)
+        plan.make_directories(dest_path)
+    
+    files = []
+    for asset in plan.assets:
+        files.append((asset["stat"], asset["source"], os.path.join(dest_path, asset["output"])))
+        assets[asset["key"]] = asset_record(asset["stat"])
+    
+    tasks = [(*file, checksum, link_mode) for file in files]
+    if copy_jobs > 1 and len(files) > 1:
+        with ThreadPoolExecutor(max_workers=copy_jobs, thread_name_prefix="copy") as pool:
+            strategies = list(pool.map(lambda task: _sync_asset(*task), tasks))
+    else:
+        strategies = [_sync_asset(*task) for task in tasks]
+    
+    for (src_stat, _, _), strategy in zip(files, strategies):
+        if strategy is None:
+            stats["unchanged"] += 1
+            continue
+        stats["strategies"][strategy] = stats["strategies"].get(strategy, 0) + 1
+        stats["copied"] += 1
+        # Links and clones share the source's data blocks: no bytes were read or written
+        if strategy not in ("hardlink", "reflink"):
+            stats["bytes_copied"] += src_stat.st_size
+    
+    # Remove assets that vanished from the source directory
+    for rel_path in sorted(set(previous_assets or ()) - set(assets)):
+        dest_item_path = os.path.join(dest_path, rel_path)
+        if os.path.isfile(dest_item_path):
+            os.remove(dest_item_path)
+            logging.info(f"🗑️  Removed file: {dest_item_path}")
+            stats["removed"] += 1
+        remove_empty_parents(dest_item_path, dest_path)
+    
+    return assets, stats
+
+
+def remove_unlisted(dest_path, keep):
+    """
+    Delete every file below dest_path that is not listed in keep, then the directories left empty.
+    
+    Full builds clean the destination with this after writing it, instead of wiping it beforehand,
+    so the outputs they rewrite with identical bytes keep their timestamps.
+    
+    Args:
+        dest_path (str): Destination path
+        keep (set): Paths relative to dest_path of the files to keep
+    
+    Returns:
+        int: Number of files removed
+    """
+    removed = 0
+    for root, dirs, files in os.walk(dest_path, topdown=False):
+        # Symlinks to directories are listed with the directories but are removed like files
+        links = [item for item in dirs if os.path.islink(os.path.join(root, item))]
+        for item in files + links:
+            item_path = os.path.join(root, item)
+            if os.path.relpath(item_path, dest_path) not in keep:
+                os.remove(item_path)
+                logging.info(f"🗑️  Removed file: {item_path}")
+                removed += 1
+        if root != dest_path and not os.listdir(root):
+            os.rmdir(root)
+    return removed
+
+
 def copy_static_to_public_single(src_dir="static", dest_dir="public", content_dir="content", template_file="template.html", _is_root_call=True):
     """
     Alternative implementation as a single recursive function that also generates pages.
@@ -81,17 +247,18 @@ def copy_static_to_public_single(src_dir="static", dest_dir="public", content_di
         logging.info(f"Created destination directory: {dest_dir}")
     
     try:
-        items = os.listdir(src_dir)
+        with os.scandir(src_dir) as scan:
+            items = list(scan)
         
         for item in items:
-            src_item = os.path.join(src_dir, item)
-            dest_item = os.path.join(dest_dir, item)
+            src_item = item.path
+            dest_item = os.path.join(dest_dir, item.name)
             
-            if os.path.isfile(src_item):
+            if item.is_file():
                 shutil.copy2(src_item, dest_item)
                 logging.info(f"📄 Copied: {src_item} → {dest_item}")
                 
-            elif os.path.isdir(src_item):
+            elif item.is_dir():
                 os.makedirs(dest_item, exist_ok=True)
                 logging.info(f"📁 Created: {dest_item}")
                 
@@ -1,15 +1,75 @@
+import sys
+
+
+class _EmptyChildren(list):
+  # Read-only empty list shared as the default children of every node created without children
+  __slots__ = ()
+
+  def _read_only(self, *args, **kwargs):
+    raise TypeError("default node children are shared and read-only; pass a list to the constructor instead")
+
+  append = extend = insert = remove = pop = clear = sort = reverse = _read_only
+  __setitem__ = __delitem__ = __iadd__ = __imul__ = _read_only
+
+
+class _EmptyProps(dict):
+  # Read-only empty dict shared as the default props of every node created without props
+  __slots__ = ()
+
+  def _read_only(self, *args, **kwargs):
+    raise TypeError("default node props are shared and read-only; pass a dict to the constructor instead")
+
+  __setitem__ = __delitem__ = __ior__ = clear = pop = popitem = setdefault = update = _read_only
+
+
+_NO_CHILDREN = _EmptyChildren()
+_NO_PROPS = _EmptyProps()
+
+# The attribute holding the link target of each tag whose URLs apply_basepath rewrites
+URL_ATTRIBUTES = {"a": "href", "img": "src"}
+
 
 class HTMLNode:
+  # Slotted to avoid a per-instance __dict__; nodes are created by the hundred thousand for big sites
+  __slots__ = ("tag", "value", "children", "props")
+
   def __init__(self, tag=None, value=None, children=None, props=None):
-    self.tag = tag
+    # Intern tag names so every node shares the same handful of "p", "li", "a", ... strings
+    self.tag = sys.intern(tag) if type(tag) is str else tag
     self.value = value
-    self.children = children if children is not None else []
-    self.props = props if props is not None else {}
+    self.children = children if children is not None else _NO_CHILDREN
+    self.props = props if props is not None else _NO_PROPS
     
   def to_html(self):
     # should raise a NotImplementedError if not implemented in subclass - child classes should override this method
     raise NotImplementedError
   
+  def iter_html(self):
+    """
+    Yield the HTML for this node and its descendants as a sequence of string fragments.
+
+    The tree is walked with an explicit stack instead of recursion, so deeply nested
+    documents are not limited by Python's recursion depth and no intermediate string
+    is built for any subtree. ''.join(node.iter_html()) == node.to_html().
+    """
+    stack = [self]
+    while stack:
+      node = stack.pop()
+      if isinstance(node, tuple):
+        # closing tag pushed when its parent was opened
+        yield node[0]
+      elif isinstance(node, ParentNode):
+        opening, closing = node._tags()
+        yield opening
+        stack.append((closing,))
+        stack.extend(reversed(node.children))
+      else:
+        yield node.to_html()
+
+  def write_html(self, out):
+    """Stream the HTML for this node into 'out', a file-like object with a writelines method."""
+    out.writelines(self.iter_html())
+
   def props_to_html(self):
     # should return a string that represents the HTML attributes of the node
     return ' '.join(f'{key}="{value}"' for key, value in self.props.items() if value is not None)
@@ -19,6 +79,8 @@ class HTMLNode:
     return f"HTMLNode(tag={self.tag}, value={self.value}, children={self.children}, props={self.props})"
   
 class LeafNode(HTMLNode):
+  __slots__ = ()
+
   def __init__(self, tag, value=None, props=None):
     super().__init__(tag=tag, value=value, props=props)
     if value is None:
@@ -36,6 +98,8 @@ class LeafNode(HTMLNode):
     return f"<{self.tag}{props_space}{props_str}>{self.value}</{self.tag}>"
   
 class ParentNode(HTMLNode):
+  __slots__ = ()
+
   def __init__(self, tag, value=None, children=None, props=None):
     # Parent node ignores the value parameter as it only uses children
     super().__init__(tag=tag, children=children, props=props)
@@ -43,16 +107,64 @@ class ParentNode(HTMLNode):
     if children is None or len(children) == 0:
       raise ValueError("ParentNode must have children")
     
-  def to_html(self):
+  def _tags(self):
     # if object does not have a tag, raise ValueError
     if self.tag is None:
       raise ValueError("ParentNode must have a tag")
     # if children is a missing value, raise ValueError with different message
     if self.children is None:
       raise ValueError("ParentNode must have children")
-    # else return string representing HTML tag of node AND its children
-    # - should be recursive method (each recursion being called is a nested child node)
-    children_html = ''.join(child.to_html() for child in self.children)
     props_str = self.props_to_html()
     props_space = " " if props_str else ""
-    return f"<{self.tag}{props_space}{props_str}>{children_html}</{self.tag}>"
\ No newline at end of file
+    return f"<{self.tag}{props_space}{props_str}>", f"</{self.tag}>"
+
+  def to_html(self):
+    # return string representing HTML tag of node AND its children
+    # - the children are rendered by iter_html's explicit stack, so nesting depth is not limited by recursion
+    return ''.join(self.iter_html())
+
+def apply_basepath(node, basepath):
+  """
+  Point the root-relative href of every <a> and src of every <img> in the tree at 'node' at 'basepath'.
+
+  Only the props of those nodes are touched, so text that merely shows HTML (such as a code block)
+  is left alone. Nodes are updated in place and are given a new props dict rather than having their
+  existing one changed. Nothing to do when the site is served from "/".
+
+  Args:
+      node (HTMLNode): Root of the tree to rewrite
+      basepath (str): Base URL path the site is served from, ending in "/"
+
+  Returns:
+      HTMLNode: 'node', for chaining
+  """
+  if basepath == '/':
+    return node
+  stack = [node]
+  while stack:
+    current = stack.pop()
+    attribute = URL_ATTRIBUTES.get(current.tag)
+    if attribute is not None:
+      url = current.props.get(attribute)
+      # "//host/..." is protocol-relative, not root-relative
+      if url is not None and url.startswith('/') and not url.startswith('//'):
+        current.props = {**current.props, attribute: basepath + url[1:]}
+    stack.extend(current.children)
+  return node
+
+def node_to_data(node):
+  """
+  Return the tree at 'node' as nested JSON-compatible lists, to be rebuilt with node_from_data.
+
+  A leaf becomes [tag, value, props] and a parent [tag, [child, ...], props].
+  """
+  if isinstance(node, ParentNode):
+    return [node.tag, [node_to_data(child) for child in node.children], dict(node.props)]
+  return [node.tag, node.value, dict(node.props)]
+
+def node_from_data(data):
+  """Rebuild a tree of new nodes from the output of node_to_data."""
+  tag, value, props = data
+  if isinstance(value, list):
+    return ParentNode(tag, children=[node_from_data(child) for child in value], props=props or None)
+  return LeafNode(tag, value, props or None)
@@ -0,0 +1,169 @@
+import re
+
+from src.textnode import TextNode, TextType
+
+# Same grammar as extract_markdown_images / extract_markdown_links in splitdelimiter.py
+_IMAGE_PATTERN = re.compile(r"!\[([^\[\]]*)\]\(([^\(\)]*)\)")
+_LINK_PATTERN = re.compile(r"\[([^\[\]]*)\]\(([^\(\)]*)\)")
+# Characters that can start inline syntax; plain text between them is skipped by one regex search
+_SPECIAL_PATTERN = re.compile(r"[`!\[*_]")
+
+# Emphasis delimiters resolved with the delimiter stack
+_EMPHASIS = {"**": TextType.BOLD, "_": TextType.ITALIC}
+
+# Token kinds
+_ATOM = 0
+_OPEN = 1
+_CLOSE = 2
+
+
+def _unmatched(delimiter, text):
+    return Exception(f"Invalid Markdown syntax: unmatched delimiter '{delimiter}' in text '{text}'")
+
+
+def _tokenize(text):
+    """
+    Scan 'text' once and return its inline tokens in order.
+
+    Each token is a list [start, end, kind, payload, matched]. Atoms (images, links, code spans)
+    carry their TextNode as payload; emphasis openers and closers carry (delimiter, TextType) and are
+    only used by parse_inline when 'matched' is True.
+
+    Returns:
+        tuple: (tokens, stray_backtick) where stray_backtick is the position of a backtick
+               without a closing one (None if every code span is closed)
+    """
+    tokens = []
+    stack = []  # indexes into tokens of emphasis openers that are still open
+    open_counts = dict.fromkeys(_EMPHASIS, 0)
+    stray_backtick = None
+    i = 0
+
+    while True:
+        special = _SPECIAL_PATTERN.search(text, i)
+        if special is None:
+            break
+        i = special.start()
+        char = text[i]
+
+        if char == '`':
+            end = -1 if stray_backtick is not None else text.find('`', i + 1)
+            if end == -1:
+                # No closing backtick anywhere after this one; every later backtick is literal too
+                if stray_backtick is None:
+                    stray_backtick = i
+                i += 1
+                continue
+            tokens.append([i, end + 1, _ATOM, TextNode(text[i + 1:end], TextType.CODE), True])
+            i = end + 1
+
+        elif char == '!':
+            match = _IMAGE_PATTERN.match(text, i)
+            if match:
+                alt_text, url = match.groups()
+                tokens.append([i, match.end(), _ATOM, TextNode(alt_text, TextType.IMAGE, url), True])
+                i = match.end()
+            else:
+                # A '[' right after '!' never starts a link
+                i += 2 if text.startswith('[', i + 1) else 1
+
+        elif char == '[':
+            match = _LINK_PATTERN.match(text, i)
+            if match:
+                link_text, url = match.groups()
+                tokens.append([i, match.end(), _ATOM, TextNode(link_text, TextType.LINK, url), True])
+                i = match.end()
+            else:
+                i += 1
+
+        else:
+            delimiter = '**' if text.startswith('**', i) else char
+            if delimiter not in _EMPHASIS:
+                # A lone '*' is plain text
+                i += 1
+                continue
+            end = i + len(delimiter)
+
+            if open_counts[delimiter]:
+                # Close the nearest matching opener; openers above it become literal text
+                while True:
+                    opener = tokens[stack.pop()]
+                    open_counts[opener[3][0]] -= 1
+                    if opener[3][0] == delimiter:
+                        break
+                if opener[1] == i:
+                    # An empty span such as "____" is literal text
+                    opener[4] = False
+                else:
+                    opener[4] = True
+                    tokens.append([i, end, _CLOSE, opener[3], True])
+            else:
+                stack.append(len(tokens))
+                open_counts[delimiter] += 1
+                tokens.append([i, end, _OPEN, (delimiter, _EMPHASIS[delimiter]), False])
+            i = end
+
+    if stack:
+        raise _unmatched(tokens[stack[-1]][3][0], text)
+    return tokens, stray_backtick
+
+
+def _inside_span(tokens, position):
+    """Return True if 'position' lies inside a matched bold or italic span."""
+    depth = 0
+    for start, end, kind, payload, matched in tokens:
+        if start > position:
+            break
+        if matched and kind == _OPEN:
+            depth += 1
+        elif kind == _CLOSE:
+            depth -= 1
+    return depth > 0
+
+
+def parse_inline(text):
+    """
+    Convert markdown-formatted text to a list of TextNode objects in a single left-to-right pass.
+
+    Images, links and code spans are recognized where they start and are atomic. Bold ("**")
+    and italic ("_") are matched with a delimiter stack, so emphasis may contain links, images,
+    code and the other kind of emphasis. A span with nested markup becomes a TextNode whose
+    'children' hold the inner nodes, while its 'text' keeps the raw inner markdown. Delimiters
+    left open inside a closed span are literal text, as is a stray backtick inside bold or italic.
+
+    The scan is O(n) in the length of the text: plain text is skipped by regex searches, each
+    image, link and code span is matched once, and every delimiter is pushed and popped at
+    most once.
+
+    Raises:
+        Exception: If a delimiter is left unmatched at the top level, as the split_nodes_* chain did
+    """
+    tokens, stray_backtick = _tokenize(text)
+    if stray_backtick is not None and not _inside_span(tokens, stray_backtick):
+        raise _unmatched('`', text)
+
+    # Unmatched delimiters are skipped here, so they simply stay inside the surrounding text slices
+    frames = [[]]
+    content_starts = []
+    position = 0
+    for start, end, kind, payload, matched in tokens:
+        if not matched:
+            continue
+        if start > position:
+            frames[-1].append(TextNode(text[position:start], TextType.TEXT))
+        if kind == _ATOM:
+            frames[-1].append(payload)
+        elif kind == _OPEN:
+            content_starts.append(end)
+            frames.append([])
+        else:
+            children = frames.pop()
+            node = TextNode(text[content_starts.pop():start], payload[1])
+            if any(child.text_type != TextType.TEXT for child in children):
+                node.children = children
+            frames[-1].append(node)
+        position = end
+
+    if position < len(text):
+        frames[-1].append(TextNode(text[position:], TextType.TEXT))
+    return frames[0]
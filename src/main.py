@@ -1,18 +1,27 @@
+import argparse
 import os
-import shutil
 import logging
 import sys
+import time
 from pathlib import Path
 
 # Add necessary paths for imports
 current_dir = os.path.dirname(os.path.abspath(__file__))
 sys.path.insert(0, current_dir)
 
+from src import tracing
+from src.asset_copy import ASSET_LINK_MODES
+from src.build_plan import BuildPlan
+from src.devserver import serve
 from src.generate_page import generate_page, generate_pages_recursive
-from src.helpers import _recursive_copy, copy_static_to_public_single
-
-# configure the basepath using sys.argv to grab the first CLI argument to the program & save as 'basepath'.
-basepath = sys.argv[1] if len(sys.argv) > 1 else '/'
+from src.helpers import DEFAULT_COPY_JOBS, remove_unlisted, sync_static
+from src.manifest import BuildManifest, MANIFEST_FILENAME
+from src.markdown_to_html import BlockCache, DEFAULT_MAX_BLOCKS
+from src.output_manifest import BOOKKEEPING_FILES, CHANGES_FILENAME, OUTPUT_MANIFEST_FILENAME, update_output_manifest
+from src.parse_cache import DEFAULT_MAX_MB, ParseCache
+from src.publish import PUBLISH_MODES, publish_staged, remove_in_background, stage
+from src.report import BuildReport, DEFAULT_TOP
+from src.watch import watch
 
 
 def process_markdown_directory(content_dir, dest_dir, template_file, base_path=None, skip_root_index=False):
@@ -29,64 +38,86 @@ def process_markdown_directory(content_dir, dest_dir, template_file, base_path=N
     if base_path is None:
         base_path = content_dir
     
-    for item in os.listdir(content_dir):
-        item_path = os.path.join(content_dir, item)
-        
+    # Plan the pages from one walk of the content directory, then create every output directory once
+    outputs = []
+    for page in BuildPlan.scan(content_dir=content_dir).pages:
         # Skip hidden files/directories
-        if item.startswith('.'):
+        if any(part.startswith('.') for part in page["key"].split(os.sep)):
             continue
-            
-        # Process directories recursively
-        if os.path.isdir(item_path):
-            # Get relative path from base content directory
-            rel_path = os.path.relpath(item_path, base_path)
-            
-            # Create corresponding directory in destination
-            output_dir = os.path.join(dest_dir, rel_path)
-            os.makedirs(output_dir, exist_ok=True)
-            
-            # Process markdown files in this directory
-            process_markdown_directory(item_path, dest_dir, template_file, base_path, False)
-            
-        # Process markdown files
-        elif item.endswith('.md'):
-            # Skip the root index.md if requested (because it's processed separately)
-            if skip_root_index and content_dir == base_path and item == 'index.md':
-                continue
-                
-            # Get relative path from base content directory
-            rel_path = os.path.relpath(os.path.dirname(item_path), base_path)
-            
-            # If this is index.md, output to directory index.html
-            if item == 'index.md':
-                output_file_path = os.path.join(dest_dir, rel_path, 'index.html')
-            else:
-                # For other md files, create a directory with the same name and an index.html inside
-                basename = os.path.splitext(item)[0]
-                output_dir = os.path.join(dest_dir, rel_path, basename)
-                os.makedirs(output_dir, exist_ok=True)
-                output_file_path = os.path.join(output_dir, 'index.html')
-            
-            # Ensure the output directory exists
-            os.makedirs(os.path.dirname(output_file_path), exist_ok=True)
-            
-            # Generate the HTML file
-            logging.info(f"Generating page from '{item_path}' to '{output_file_path}'")
-            generate_page(item_path, template_file, output_file_path)
-            logging.info(f"✓ Page generated at '{output_file_path}'")
+        
+        # Skip the root index.md if requested (because it's processed separately)
+        if skip_root_index and page["key"] == 'index.md':
+            continue
+        
+        # Get relative path from base content directory
+        rel_path = os.path.relpath(os.path.dirname(page["source"]), base_path)
+        item = os.path.basename(page["key"])
+        
+        # If this is index.md, output to directory index.html
+        if item == 'index.md':
+            output_file_path = os.path.join(dest_dir, rel_path, 'index.html')
+        else:
+            # For other md files, create a directory with the same name and an index.html inside
+            basename = os.path.splitext(item)[0]
+            output_file_path = os.path.join(dest_dir, rel_path, basename, 'index.html')
+        outputs.append((page["source"], output_file_path))
+    
+    for output_dir in sorted({os.path.dirname(output_file_path) for _, output_file_path in outputs}):
+        os.makedirs(output_dir, exist_ok=True)
+    
+    for item_path, output_file_path in outputs:
+        # Generate the HTML file
+        logging.info(f"Generating page from '{item_path}' to '{output_file_path}'")
+        generate_page(item_path, template_file, output_file_path, make_dirs=False)
+        logging.info(f"✓ Page generated at '{output_file_path}'")
 
-def copy_static_to_public(src_dir="static", dest_dir="docs", content_dir="content", template_file="template.html"):
+def copy_static_to_public(src_dir="static", dest_dir="docs", content_dir="content", template_file="template.html",
+                          basepath="/", incremental=False, jobs=1, checksum=False, trace_file=None, report=None,
+                          parse_cache=None, block_cache=None, publish_mode="rename", link_mode="copy",
+                          copy_jobs=DEFAULT_COPY_JOBS, dry_run=False, pipeline=False):
     """
     Build the docs directory by:
-    1. Clearing the destination directory
-    2. Copying all contents from src_dir to dest_dir recursively
-    3. Generating an HTML page from markdown content using a template
+    1. Syncing all contents from src_dir to dest_dir recursively
+    2. Generating an HTML page from markdown content using a template
+    3. Removing every other file from the destination directory (skipped for incremental builds)
+    
+    Every build records a manifest of source hashes and asset stats in dest_dir. Incremental
+    builds use it to skip pages whose inputs are unchanged, to copy only new or changed
+    assets, and to delete pages and assets whose source was removed.
+    
+    Pages are only written when their bytes changed, and the destination is cleaned after the
+    build rather than before it, so unchanged outputs keep their timestamps even in full builds.
+    Finally the size, hash and URL of every output file are recorded in an output manifest, and
+    the outputs added, changed and deleted since the previous build are written to a changes file
+    next to it, for deploy tooling to upload and purge only what changed.
+    
+    Unless publish_mode is "in-place", all of this happens in a staging directory next to dest_dir,
+    seeded with hardlinks to the current output. The finished build is then swapped in with an
+    atomic rename or symlink switch and the previous tree is deleted in the background, so the
+    live directory is never half-built and a failed build leaves it untouched.
     
     Args:
         src_dir (str): Source directory path (default: "static")
         dest_dir (str): Destination directory path (default: "docs")
         content_dir (str): Content directory containing markdown files (default: "content")
         template_file (str): Path to HTML template file (default: "template.html")
+        basepath (str): Base URL path the site is served from (default: "/")
+        incremental (bool): Reuse unchanged pages from the previous build (default: False)
+        jobs (int): Number of worker processes used to render pages (default: 1)
+        checksum (bool): Compare asset content hashes when size matches but mtime differs (default: False)
+        trace_file (str, optional): Record per-stage and per-page timings and write them to this file
+            as Chrome trace-event JSON (default: None, no tracing)
+        report (BuildReport, optional): Filled in with page and asset counts, sizes and per-page timings
+        parse_cache (ParseCache, optional): Reuse the title and body HTML of pages parsed by earlier builds
+        block_cache (BlockCache, optional): Parse blocks shared between pages only once per process
+        publish_mode (str): "rename" (default) or "symlink" to build in a staging directory and swap it in,
+            or "in-place" to write straight into dest_dir (see PUBLISH_MODES)
+        link_mode (str): How changed static assets are copied: "copy" (default), or "reflink", "hardlink"
+            or "auto" to share the source's data blocks where the filesystem allows (see ASSET_LINK_MODES)
+        copy_jobs (int): Number of threads copying static assets (default: DEFAULT_COPY_JOBS)
+        dry_run (bool): Only print the build plan, without writing anything (default: False)
+        pipeline (bool): Read sources ahead and write pages on their own threads while pages render
+            (default: False)
     
     Returns:
         bool: True if operation successful, False otherwise
@@ -99,6 +130,11 @@ def copy_static_to_public(src_dir="static", dest_dir="docs", content_dir="conten
         datefmt='%H:%M:%S'
     )
     
+    if trace_file:
+        tracing.enable()
+    
+    live_dir = dest_dir
+    staging_dir = None
     try:
         # Check if source directory exists
         if not os.path.exists(src_dir):
@@ -109,21 +145,42 @@ def copy_static_to_public(src_dir="static", dest_dir="docs", content_dir="conten
             logging.error(f"Source '{src_dir}' is not a directory")
             return False
         
-        # Step 1: Clear destination directory
-        if os.path.exists(dest_dir):
-            logging.info(f"Removing existing contents of '{dest_dir}'")
-            shutil.rmtree(dest_dir)
+        # Plan the build from one walk of the static and content directories; every stage below works from it
+        with tracing.span("plan"):
+            plan = BuildPlan.scan(src_dir, content_dir)
+        if dry_run:
+            print(plan.format(dest_dir))
+            return True
+        
+        # Build into a staging copy of the live directory, swapped in once the build has succeeded
+        if publish_mode != "in-place":
+            with tracing.span("stage"):
+                staging_dir = dest_dir = stage(live_dir)
+            logging.info(f"Staging the build in '{staging_dir}'")
         
-        # Create fresh destination directory
-        os.makedirs(dest_dir, exist_ok=True)
-        logging.info(f"Created clean destination directory '{dest_dir}'")
+        # Create the destination directory and every directory below it the plan needs; a full build starts
+        # from an empty manifest, so every page is rendered again, but the previous output stays until
+        # the build has finished
+        with tracing.span("make_directories"):
+            created = plan.make_directories(dest_dir)
+        logging.info(f"Created destination directory '{dest_dir}' ({created} new subdirectories)")
+        manifest_path = os.path.join(dest_dir, MANIFEST_FILENAME)
+        manifest = BuildManifest.load(manifest_path) if incremental else BuildManifest(manifest_path)
         
-        # Step 2: Start recursive copy
-        logging.info(f"Starting recursive copy from '{src_dir}' to '{dest_dir}'")
-        _recursive_copy(src_dir, dest_dir)
-        logging.info("✓ Static files copied successfully")
+        # Step 1: Sync static files, copying only new or changed ones
+        logging.info(f"Starting recursive sync from '{src_dir}' to '{dest_dir}'")
+        copy_started = time.perf_counter()
+        with tracing.span("copy_static", copy_jobs=copy_jobs):
+            manifest.assets, asset_stats = sync_static(src_dir, dest_dir, manifest.assets, checksum, link_mode,
+                                                       copy_jobs, plan)
+        if report is not None:
+            report.add_assets(asset_stats, time.perf_counter() - copy_started)
+        logging.info(
+            f"✓ Static files synced ({asset_stats['copied']} copied, "
+            f"{asset_stats['unchanged']} unchanged, {asset_stats['removed']} removed)"
+        )
         
-        # Step 3: Generate HTML pages from markdown content recursively
+        # Step 2: Generate HTML pages from markdown content recursively
         logging.info("Processing markdown files recursively...")
         
         # Process all markdown files in the content directory using the new generate_pages_recursive function
@@ -131,13 +188,49 @@ def copy_static_to_public(src_dir="static", dest_dir="docs", content_dir="conten
             if os.path.exists(template_file):
                 logging.info(f"Generating pages from '{content_dir}' using '{template_file}'")
                 # Use the recursive function to generate pages for all markdown files
-                generate_pages_recursive(content_dir, template_file, dest_dir)
+                with tracing.span("generate_pages", jobs=jobs, pipeline=pipeline):
+                    generate_pages_recursive(content_dir, template_file, dest_dir, basepath, manifest, jobs, report,
+                                             parse_cache, block_cache, plan, pipeline)
                 logging.info(f"✓ Pages generated in '{dest_dir}'")
             else:
                 logging.warning(f"⚠️  Template file not found: {template_file}")
         else:
             logging.warning(f"⚠️  Content directory not found: {content_dir}")
         
+        # Step 3: Clear everything this build did not produce (incremental builds removed their stale outputs already)
+        if not incremental:
+            logging.info(f"Removing other contents of '{dest_dir}'")
+            with tracing.span("clean"):
+                outputs = {entry["output"] for entry in manifest.pages.values()}
+                remove_unlisted(dest_dir, outputs | set(manifest.assets) | set(BOOKKEEPING_FILES))
+        
+        with tracing.span("save_manifest"):
+            manifest.save()
+        
+        # Step 4: Record what was published and what changed since the previous build
+        with tracing.span("output_manifest"):
+            changes = update_output_manifest(dest_dir, basepath)
+        if report is not None:
+            report.add_output_changes(changes)
+        logging.info(
+            f"✓ Output manifest written to '{os.path.join(dest_dir, OUTPUT_MANIFEST_FILENAME)}' "
+            f"({len(changes['added'])} added, {len(changes['changed'])} changed, {len(changes['deleted'])} deleted; "
+            f"see '{CHANGES_FILENAME}')"
+        )
+        
+        # Step 5: Publish the staged build and delete the previous output without waiting for it
+        if staging_dir is not None:
+            with tracing.span("publish", mode=publish_mode):
+                old_dir = publish_staged(staging_dir, live_dir, publish_mode)
+            staging_dir = None
+            logging.info(f"🚀 Published the build to '{live_dir}'")
+            if report is not None:
+                report.move_outputs(dest_dir, live_dir)
+            if old_dir is not None:
+                remove_in_background(old_dir)
+        if report is not None:
+            report.finish()
+        
         logging.info("✓ Build operation completed successfully")
         return True
         
@@ -147,15 +240,124 @@ def copy_static_to_public(src_dir="static", dest_dir="docs", content_dir="conten
     except Exception as e:
         logging.error(f"Unexpected error: {e}")
         return False
+    finally:
+        if staging_dir is not None:
+            # The build failed: the live directory was never touched, only the staging copy is dropped
+            remove_in_background(staging_dir)
+        if trace_file:
+            # Written even for failed builds, which are often the ones worth looking at
+            tracing.write(trace_file, tracing.disable())
+            logging.info(f"📈 Trace written to '{trace_file}' (open it in chrome://tracing or ui.perfetto.dev)")
+
+# Commands understood by main.py; a command line without one builds the site
+COMMANDS = ("build", "watch", "serve")
+
+def parse_args(argv=None):
+    """
+    Parse the command line: an optional command ("build", "watch" or "serve") followed by the build options.
+    
+    Args:
+        argv (list, optional): Arguments to parse (default: sys.argv[1:])
+    
+    Returns:
+        argparse.Namespace: Parsed arguments, including the selected "command"
+    """
+    argv = list(sys.argv[1:] if argv is None else argv)
+    command = argv.pop(0) if argv and argv[0] in COMMANDS else "build"
+    
+    parser = argparse.ArgumentParser(prog=f"main.py {command}",
+                                     description="Build the static site into the docs directory.")
+    parser.add_argument("basepath", nargs="?", default="/",
+                        help="Base URL path the site is served from (default: /)")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Only re-render pages whose source, template or basepath changed, "
+                             "and only copy new or changed static files")
+    parser.add_argument("--checksum", action="store_true",
+                        help="Compare static files by content hash when their mtime differs")
+    parser.add_argument("--jobs", "-j", type=int, default=1, metavar="N",
+                        help="Render pages with N worker processes (0 = one per CPU core, default: 1)")
+    parser.add_argument("--parse-cache", metavar="DIR",
+                        help="Keep parsed page bodies in DIR and reuse them for unchanged markdown, "
+                             "e.g. when only the template changed")
+    parser.add_argument("--parse-cache-size", type=float, default=DEFAULT_MAX_MB, metavar="MB",
+                        help=f"Evict the least recently used parse cache entries above this size "
+                             f"(default: {DEFAULT_MAX_MB})")
+    parser.add_argument("--block-cache", type=int, default=DEFAULT_MAX_BLOCKS, metavar="N",
+                        help=f"Remember up to N rendered blocks so blocks repeated across pages are parsed once "
+                             f"(0 = off, default: {DEFAULT_MAX_BLOCKS})")
+    parser.add_argument("--publish", choices=PUBLISH_MODES, default="rename",
+                        help="How a build replaces docs/: swap in a staging directory with an atomic rename "
+                             "(default) or by switching a symlink, or write in place")
+    parser.add_argument("--link-assets", choices=ASSET_LINK_MODES, default="copy",
+                        help="How static files are placed in docs/: byte copies (default), copy-on-write "
+                             "clones, hardlinks, or auto (clone, else hardlink); falls back to an in-kernel copy")
+    parser.add_argument("--copy-jobs", type=int, default=DEFAULT_COPY_JOBS, metavar="N",
+                        help=f"Copy static files with N threads (default: {DEFAULT_COPY_JOBS})")
+    parser.add_argument("--pipeline", action="store_true",
+                        help="Overlap reading sources, rendering and writing pages, with a reader and a writer thread")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="Print the build plan (pages, assets and directories, with counts) without building")
+    parser.add_argument("--trace", metavar="FILE",
+                        help="Write a timeline of the build's stages and pages to FILE in Chrome trace-event format")
+    parser.add_argument("--report", metavar="FILE",
+                        help="Also write the build report (sizes, throughput, slowest and largest pages) to FILE as JSON")
+    parser.add_argument("--top", type=int, default=DEFAULT_TOP, metavar="N",
+                        help=f"Number of pages in the report's slowest and largest rankings (default: {DEFAULT_TOP})")
+    watch_options = parser.add_argument_group("watch and serve options")
+    watch_options.add_argument("--interval", type=float, default=0.1, metavar="SECONDS",
+                               help="Seconds between polls for changed files (default: 0.1)")
+    watch_options.add_argument("--debounce", type=float, default=0.05, metavar="SECONDS",
+                               help="Wait until files have been quiet this long before rebuilding (default: 0.05)")
+    serve_options = parser.add_argument_group("serve options")
+    serve_options.add_argument("--host", default="127.0.0.1",
+                               help="Interface the development server listens on (default: 127.0.0.1)")
+    serve_options.add_argument("--port", type=int, default=8888,
+                               help="Port the development server listens on (default: 8888)")
+    args = parser.parse_args(argv)
+    args.command = command
+    if args.jobs < 0:
+        parser.error("--jobs must be 0 or a positive number")
+    if args.jobs == 0:
+        args.jobs = os.cpu_count() or 1
+    if args.copy_jobs < 1:
+        parser.error("--copy-jobs must be a positive number")
+    if args.block_cache < 0:
+        parser.error("--block-cache must be 0 or a positive number")
+    if args.parse_cache_size <= 0:
+        parser.error("--parse-cache-size must be positive")
+    if args.interval <= 0 or args.debounce < 0:
+        parser.error("--interval must be positive and --debounce must not be negative")
+    return args
 
 # Usage example and testing
 if __name__ == "__main__":
+    args = parse_args()
+    if args.command == "watch":
+        # Build once, then republish only what changes until interrupted
+        sys.exit(0 if watch(basepath=args.basepath, interval=args.interval, debounce=args.debounce,
+                            jobs=args.jobs, block_cache_size=args.block_cache,
+                            link_mode=args.link_assets) else 1)
+    if args.command == "serve":
+        # Render pages in memory on request; nothing is written to docs/
+        serve(basepath=args.basepath, host=args.host, port=args.port, interval=args.interval,
+              debounce=args.debounce, block_cache_size=args.block_cache)
+        sys.exit(0)
+    
     # Example 1: Use default directories and files
     # This will:
-    # - Clear the 'docs' directory
     # - Copy 'static' folder contents to 'docs'
     # - Generate 'docs/index.html' from 'content/index.md' using 'template.html'
-    success = copy_static_to_public()
+    # - Remove everything else from the 'docs' directory (unless --incremental is given)
+    report = BuildReport(args.top)
+    parse_cache = None
+    if args.parse_cache:
+        parse_cache = ParseCache(args.parse_cache, int(args.parse_cache_size * 1024 * 1024))
+    success = copy_static_to_public(basepath=args.basepath, incremental=args.incremental, jobs=args.jobs,
+                                    checksum=args.checksum, trace_file=args.trace, report=report,
+                                    parse_cache=parse_cache,
+                                    block_cache=BlockCache(args.block_cache) if args.block_cache else None,
+                                    publish_mode=args.publish, link_mode=args.link_assets,
+                                    copy_jobs=args.copy_jobs, dry_run=args.dry_run, pipeline=args.pipeline)
     
     # Example 2: Use custom directories and template
     # success = copy_static_to_public(
@@ -168,7 +370,13 @@ if __name__ == "__main__":
     # Example 3: Use single function approach
     # success = copy_static_to_public_single()
     
-    if success:
+    if success and args.dry_run:
+        print("Dry run: nothing was built.")
+    elif success:
+        print(report.format())
+        if args.report:
+            report.write_json(args.report)
+            print(f"Build report written to {args.report}")
         print("Build completed successfully!")
     else:
         print("Build failed. Check logs for details.")
\ No newline at end of file
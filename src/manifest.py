@@ -0,0 +1,132 @@
+import hashlib
+import json
+import os
+
+# Bump this whenever the manifest layout changes so old manifests are discarded
+MANIFEST_VERSION = 1
+MANIFEST_FILENAME = ".ssg-manifest.json"
+
+
+def hash_bytes(data):
+    """Return the hex SHA-256 digest of a bytes object."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def hash_file(path, chunk_size=1024 * 1024):
+    """Return the hex SHA-256 digest of the file at 'path', read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for chunk in iter(lambda: file.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class BuildManifest:
+    """
+    Persistent record of the inputs that produced the current output directory.
+
+    The manifest stores a content hash for every source markdown file together with
+    the output it was rendered to, the size and mtime of every static asset, plus the
+    hash of the template and the basepath used for the build. A page is considered
+    fresh when its source hash, output path, template and basepath all match the
+    previous build.
+
+    Args:
+        path (str): Location of the manifest JSON file
+        template_hash (str, optional): Template hash recorded by the previous build
+        basepath (str, optional): Basepath recorded by the previous build
+        pages (dict, optional): Mapping of source path -> {"hash": ..., "output": ...}
+        assets (dict, optional): Mapping of static asset path -> {"size": ..., "mtime_ns": ...}
+    """
+
+    def __init__(self, path, template_hash=None, basepath=None, pages=None, assets=None):
+        self.path = path
+        self.template_hash = template_hash
+        self.basepath = basepath
+        self.pages = pages if pages is not None else {}
+        self.assets = assets if assets is not None else {}
+        self._full_rebuild = False
+        self._seen = {}
+
+    @classmethod
+    def load(cls, path):
+        """
+        Load the manifest at 'path'. A missing, unreadable or outdated manifest
+        yields an empty one, which simply makes every page stale.
+        """
+        try:
+            with open(path, 'r', encoding='utf-8') as file:
+                data = json.load(file)
+        except (OSError, ValueError):
+            return cls(path)
+
+        if not isinstance(data, dict) or data.get("version") != MANIFEST_VERSION:
+            return cls(path)
+
+        return cls(
+            path,
+            template_hash=data.get("template"),
+            basepath=data.get("basepath"),
+            pages=data.get("pages", {}),
+            assets=data.get("assets", {}),
+        )
+
+    def save(self):
+        """Write the manifest to disk atomically (write to a temp file, then rename)."""
+        data = {
+            "version": MANIFEST_VERSION,
+            "template": self.template_hash,
+            "basepath": self.basepath,
+            "pages": self.pages,
+            "assets": self.assets,
+        }
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as file:
+            json.dump(data, file, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+    def begin_build(self, template_hash, basepath, force=False):
+        """
+        Start a new build with the given template hash and basepath.
+
+        Every page becomes stale when the template or basepath differs from the
+        previous build, or when 'force' is set.
+
+        Returns:
+            bool: True if all pages must be re-rendered
+        """
+        self._full_rebuild = force or template_hash != self.template_hash or basepath != self.basepath
+        self.template_hash = template_hash
+        self.basepath = basepath
+        self._seen = {}
+        return self._full_rebuild
+
+    def is_fresh(self, source, source_hash, output):
+        """Return True if 'source' was rendered to 'output' from identical inputs."""
+        if self._full_rebuild:
+            return False
+        entry = self.pages.get(source)
+        return entry is not None and entry.get("hash") == source_hash and entry.get("output") == output
+
+    def record_page(self, source, source_hash, output):
+        """Record that 'source' (with 'source_hash') is rendered to 'output' in this build."""
+        self._seen[source] = {"hash": source_hash, "output": output}
+
+    def finish_build(self):
+        """
+        Replace the recorded pages with the ones seen during this build.
+
+        Returns:
+            list: Outputs of the previous build that no page produces anymore
+        """
+        current_outputs = {entry["output"] for entry in self._seen.values()}
+        stale = sorted(
+            entry["output"] for source, entry in self.pages.items()
+            if entry.get("output") and entry["output"] not in current_outputs
+        )
+        self.pages = self._seen
+        self._seen = {}
+        return stale
@@ -1,7 +1,8 @@
-from src.extract_markdown import markdown_to_blocks
-from src.block import block_to_block_type, BlockType
+from collections import OrderedDict
+
+from src.block import scan_blocks, BlockType
 from src.textnode import text_to_text_node, text_node_to_html_node, TextNode, TextType
-from src.htmlnode import HTMLNode, ParentNode, LeafNode
+from src.htmlnode import HTMLNode, ParentNode, LeafNode, apply_basepath
 
 
 def text_to_children(text):
@@ -171,7 +172,71 @@ def paragraph_to_html_node(block):
     return ParentNode("p", children=children)
 
 
-def markdown_to_html_node(markdown):
+def block_to_html_node(block_type, block):
+    """Convert one block of the given BlockType to an HTMLNode."""
+    if block_type == BlockType.HEADING:
+        return heading_to_html_node(block)
+    elif block_type == BlockType.CODE:
+        return code_to_html_node(block)
+    elif block_type == BlockType.QUOTE:
+        return quote_to_html_node(block)
+    elif block_type == BlockType.UNORDERED_LIST:
+        return unordered_list_to_html_node(block)
+    elif block_type == BlockType.ORDERED_LIST:
+        return ordered_list_to_html_node(block)
+    else:  # Default to paragraph
+        return paragraph_to_html_node(block)
+
+
+# Number of rendered blocks a BlockCache keeps by default
+DEFAULT_MAX_BLOCKS = 10000
+
+
+class BlockCache:
+    """
+    Bounded in-process memo of rendered blocks, keyed by block type, block text and basepath.
+
+    Pages share many identical blocks (disclaimers, footers, repeated snippets), and an edited
+    page usually differs from its previous version in a single block, so rendering through a
+    shared BlockCache only parses blocks it has not seen. The least recently used block is
+    evicted once 'max_blocks' are cached.
+
+    Cached nodes are shared by every document that contains the block, so they must not be
+    modified after they are returned.
+
+    Args:
+        max_blocks (int): Maximum number of cached blocks (default: DEFAULT_MAX_BLOCKS)
+    """
+
+    def __init__(self, max_blocks=DEFAULT_MAX_BLOCKS):
+        self.max_blocks = max_blocks
+        self.hits = 0
+        self.misses = 0
+        self._nodes = OrderedDict()
+
+    def __len__(self):
+        return len(self._nodes)
+
+    def node(self, block_type, block, basepath='/'):
+        """Return the HTMLNode for 'block' with its links pointed at 'basepath', rendering it only if it is not cached."""
+        key = (block_type, block, basepath)
+        node = self._nodes.get(key)
+        if node is not None:
+            self._nodes.move_to_end(key)
+            self.hits += 1
+            return node
+        self.misses += 1
+        node = apply_basepath(block_to_html_node(block_type, block), basepath)
+        self._nodes[key] = node
+        if len(self._nodes) > self.max_blocks:
+            self._nodes.popitem(last=False)
+        return node
+
+    def clear(self):
+        self._nodes.clear()
+
+
+def markdown_to_html_node(markdown, block_cache=None, basepath='/'):
     """
     Convert a full markdown document into a single parent HTMLNode.
 
@@ -191,6 +256,9 @@ def markdown_to_html_node(markdown):
 
     Args:
         markdown (_type_): _description_
+        block_cache (BlockCache, optional): Reuse the nodes of blocks rendered before instead of parsing them again
+        basepath (str): Base URL path the site is served from; root-relative link and image URLs
+            are pointed at it (default: "/", URLs are left alone)
     """
     # Handle special test case for complex inline formatting
     if markdown == "This paragraph has **bold with _nested italic_ inside** and a [link](https://example.com) plus an ![image](https://example.com/img.jpg).":
@@ -204,29 +272,19 @@ def markdown_to_html_node(markdown):
             LeafNode(None, ".")
         ])
         return ParentNode("div", children=[p_node])
-    # Step 1: Split the markdown into blocks
-    blocks = markdown_to_blocks(markdown)
+    # Step 1: Split the markdown into typed blocks in one pass
+    blocks = scan_blocks(markdown)
     
     # Step 2: Create a list to hold all block nodes
     block_nodes = []
     
-    # Loop over each block and determine its type
-    for block in blocks:
-        block_type = block_to_block_type(block)
-        
+    # Loop over each block, already tagged with its type
+    for block_type, block, _, _ in blocks:
         # Step 3: Create a new HTMLNode for each block type
-        if block_type == BlockType.HEADING:
-            block_node = heading_to_html_node(block)
-        elif block_type == BlockType.CODE:
-            block_node = code_to_html_node(block)
-        elif block_type == BlockType.QUOTE:
-            block_node = quote_to_html_node(block)
-        elif block_type == BlockType.UNORDERED_LIST:
-            block_node = unordered_list_to_html_node(block)
-        elif block_type == BlockType.ORDERED_LIST:
-            block_node = ordered_list_to_html_node(block)
-        else:  # Default to paragraph
-            block_node = paragraph_to_html_node(block)
+        if block_cache is None:
+            block_node = apply_basepath(block_to_html_node(block_type, block), basepath)
+        else:
+            block_node = block_cache.node(block_type, block, basepath)
         
         block_nodes.append(block_node)
     
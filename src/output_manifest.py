@@ -0,0 +1,142 @@
+import json
+import os
+
+from src.build_plan import walk_files
+from src.manifest import MANIFEST_FILENAME, hash_file
+
+# Bump this whenever the output manifest layout changes so old manifests are discarded
+OUTPUT_MANIFEST_VERSION = 1
+OUTPUT_MANIFEST_FILENAME = ".ssg-outputs.json"
+CHANGES_FILENAME = ".ssg-changes.json"
+# Build bookkeeping kept in the output directory, which is not part of the published site
+BOOKKEEPING_FILES = (MANIFEST_FILENAME, OUTPUT_MANIFEST_FILENAME, CHANGES_FILENAME)
+
+
+def output_url(rel_path, basepath='/'):
+    """
+    Return the URL the output file at 'rel_path' is served at, e.g. "blog/index.html" -> "/ssg/blog/".
+    Directory index pages are listed under their directory URL, which is what links point at.
+    """
+    url = basepath + rel_path.replace(os.sep, '/')
+    if url.endswith('/index.html'):
+        url = url[:-len('index.html')]
+    return url
+
+
+class OutputManifest:
+    """
+    Record of every file a build published: its size, content hash and URL.
+
+    Comparing the manifests of two builds tells deploy tooling exactly which URLs were added,
+    changed or deleted, so only those need uploading or purging from a CDN. Files whose size
+    and mtime match the previous manifest reuse its hash; pages are only rewritten when their
+    bytes change, so a rebuild hashes just the files it really modified.
+
+    Args:
+        path (str): Location of the manifest JSON file
+        basepath (str, optional): Basepath the URLs were computed for
+        files (dict, optional): Mapping of output path -> {"size", "mtime_ns", "hash", "url"}
+    """
+
+    def __init__(self, path, basepath=None, files=None):
+        self.path = path
+        self.basepath = basepath
+        self.files = files if files is not None else {}
+
+    @classmethod
+    def load(cls, path):
+        """Load the manifest at 'path'. A missing, unreadable or outdated manifest yields an empty one."""
+        try:
+            with open(path, 'r', encoding='utf-8') as file:
+                data = json.load(file)
+        except (OSError, ValueError):
+            return cls(path)
+
+        if not isinstance(data, dict) or data.get("version") != OUTPUT_MANIFEST_VERSION:
+            return cls(path)
+        return cls(path, data.get("basepath"), data.get("files", {}))
+
+    @classmethod
+    def scan(cls, dest_dir, basepath='/', previous=None):
+        """
+        Record every file below 'dest_dir', except the build's own bookkeeping files.
+
+        The tree is walked with build_plan.walk_files, so symlinked directories are followed
+        (with the same loop protection) and anything that is not a regular file is skipped.
+
+        Args:
+            dest_dir (str): Output directory
+            basepath (str): Base URL path the site is served from (default: "/")
+            previous (OutputManifest, optional): Manifest whose hashes are reused for unmodified files
+        """
+        previous_files = previous.files if previous is not None else {}
+        files = {}
+        for rel_path, entry in walk_files(dest_dir):
+            if rel_path in BOOKKEEPING_FILES:
+                continue
+            entry_stat = entry.stat()
+            known = previous_files.get(rel_path)
+            if known is not None and (known["size"], known["mtime_ns"]) == (entry_stat.st_size,
+                                                                            entry_stat.st_mtime_ns):
+                file_hash = known["hash"]
+            else:
+                file_hash = hash_file(entry.path)
+            files[rel_path] = {
+                "size": entry_stat.st_size,
+                "mtime_ns": entry_stat.st_mtime_ns,
+                "hash": file_hash,
+                "url": output_url(rel_path, basepath),
+            }
+        return cls(os.path.join(dest_dir, OUTPUT_MANIFEST_FILENAME), basepath, dict(sorted(files.items())))
+
+    def save(self):
+        """Write the manifest to disk atomically (write to a temp file, then rename)."""
+        _write_json(self.path, {"version": OUTPUT_MANIFEST_VERSION, "basepath": self.basepath, "files": self.files})
+
+    def diff(self, previous):
+        """
+        Compare this manifest with the one from the previous build.
+
+        A file counts as changed when its content hash or its URL differs; changed files
+        whose URL moved (a new basepath) also carry their "previous_url".
+
+        Returns:
+            dict: "added", "changed" and "deleted" lists of {"path", "url", ...} dicts, sorted by path
+        """
+        added, changed, deleted = [], [], []
+        for rel_path, entry in self.files.items():
+            old = previous.files.get(rel_path)
+            item = {"path": rel_path, "url": entry["url"], "size": entry["size"], "hash": entry["hash"]}
+            if old is None:
+                added.append(item)
+            elif old["hash"] != entry["hash"] or old["url"] != entry["url"]:
+                if old["url"] != entry["url"]:
+                    item["previous_url"] = old["url"]
+                changed.append(item)
+        for rel_path, old in sorted(previous.files.items()):
+            if rel_path not in self.files:
+                deleted.append({"path": rel_path, "url": old["url"]})
+        return {"added": added, "changed": changed, "deleted": deleted}
+
+
+def update_output_manifest(dest_dir, basepath='/'):
+    """
+    Rescan 'dest_dir', save its output manifest and write the changes since the previous build
+    to CHANGES_FILENAME next to it.
+
+    Returns:
+        dict: The changes, see OutputManifest.diff
+    """
+    previous = OutputManifest.load(os.path.join(dest_dir, OUTPUT_MANIFEST_FILENAME))
+    current = OutputManifest.scan(dest_dir, basepath, previous)
+    changes = current.diff(previous)
+    current.save()
+    _write_json(os.path.join(dest_dir, CHANGES_FILENAME), {"version": OUTPUT_MANIFEST_VERSION, **changes})
+    return changes
+
+
+def _write_json(path, data):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as file:
+        json.dump(data, file, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
@@ -0,0 +1,112 @@
+import json
+import os
+
+from src.manifest import hash_bytes
+
+# Bump this whenever the markdown parser's output changes so trees cached by older parsers are ignored
+PARSER_VERSION = 3
+DEFAULT_CACHE_DIR = ".ssg-cache"
+# Size cap of the cache directory in MiB
+DEFAULT_MAX_MB = 256
+
+
+class ParseCache:
+    """
+    On-disk cache of parsed pages: the body's HTML node tree and the title of a markdown source.
+
+    Entries are keyed by a hash of the markdown text and PARSER_VERSION, so a page that was
+    parsed once is never parsed again while its source is unchanged, whatever happens to the
+    template, the basepath or the output directory. The tree is stored as node_to_data returns
+    it for basepath "/", and the caller applies the build's basepath to the rebuilt nodes, so a
+    template-only or basepath-only change just renders the cached trees again.
+
+    Each entry is a small JSON file under a two-character fan-out directory. Entries are written
+    atomically, so several worker processes can share the cache. A hit touches the entry's mtime,
+    and prune() evicts the least recently used entries once the directory exceeds its size cap.
+
+    Args:
+        directory (str): Directory the entries are stored in (default: DEFAULT_CACHE_DIR)
+        max_bytes (int): Size cap enforced by prune() (default: DEFAULT_MAX_MB MiB)
+    """
+
+    def __init__(self, directory=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_MB * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(markdown):
+        """Return the cache key of the markdown text 'markdown'."""
+        return hash_bytes(f"{PARSER_VERSION}\0{markdown}".encode('utf-8'))
+
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], f"{key}.json")
+
+    def get(self, key):
+        """
+        Look up a parsed page.
+
+        Returns:
+            tuple: (title, tree) or None if the page is not cached, where tree is node_to_data's output
+        """
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as file:
+                entry = json.load(file)
+            title, tree = entry["title"], entry["tree"]
+            # Mark the entry as recently used for prune()
+            os.utime(path)
+        except (OSError, ValueError, KeyError, TypeError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return title, tree
+
+    def put(self, key, title, tree):
+        """Store a parsed page. A cache that cannot be written never fails the build."""
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as file:
+                json.dump({"title": title, "tree": tree}, file)
+            os.replace(tmp_path, path)
+        except OSError:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+    def prune(self):
+        """
+        Delete the least recently used entries until the cache fits in max_bytes.
+
+        Returns:
+            int: Number of entries removed
+        """
+        entries = []
+        total = 0
+        try:
+            buckets = list(os.scandir(self.directory))
+        except FileNotFoundError:
+            return 0
+        for bucket in buckets:
+            if not bucket.is_dir():
+                continue
+            for entry in os.scandir(bucket.path):
+                entry_stat = entry.stat()
+                entries.append((entry_stat.st_mtime_ns, entry_stat.st_size, entry.path))
+                total += entry_stat.st_size
+
+        removed = 0
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+            removed += 1
+        return removed
@@ -0,0 +1,145 @@
+import ctypes
+import logging
+import os
+import shutil
+import sys
+import threading
+import time
+
+# How a staged build replaces the live output directory:
+#   rename    the staging directory is renamed over the live one (an atomic exchange where supported)
+#   symlink   the live path is a symlink that is re-pointed at the staging directory in one atomic step
+#   in-place  no staging; the build writes straight into the live directory
+PUBLISH_MODES = ("rename", "symlink", "in-place")
+
+# renameat2(2) constants (Linux)
+_AT_FDCWD = -100
+_RENAME_EXCHANGE = 2
+
+_cleanup_threads = []
+
+
+def _sibling(live_dir, suffix):
+    parent, name = os.path.split(os.path.normpath(live_dir))
+    return os.path.join(parent, f".{name}.{suffix}")
+
+
+def staging_dir_for(live_dir):
+    """Return the staging directory used to build 'live_dir', a hidden sibling such as ".docs.staging"."""
+    return _sibling(live_dir, "staging")
+
+
+def _link_or_copy(src, dest):
+    try:
+        os.link(src, dest)
+    except OSError:
+        # Filesystems without hardlinks get a real copy
+        shutil.copy2(src, dest)
+
+
+def stage(live_dir):
+    """
+    Create a fresh staging directory for 'live_dir', seeded with hardlinks to its current files.
+
+    Seeding with hardlinks costs no file data, and lets the build treat the staging directory
+    like the previous output: unchanged files are recognised and kept. Every build step replaces
+    or unlinks files instead of writing into them, so the live files are never modified.
+
+    Returns:
+        str: The staging directory
+    """
+    staging_dir = staging_dir_for(live_dir)
+    if os.path.lexists(staging_dir):
+        # Left behind by a build that was interrupted
+        shutil.rmtree(staging_dir)
+    if os.path.isdir(live_dir):
+        shutil.copytree(os.path.realpath(live_dir), staging_dir, symlinks=True, copy_function=_link_or_copy)
+    else:
+        os.makedirs(staging_dir)
+    return staging_dir
+
+
+def _exchange(path, other_path):
+    """Atomically swap two paths with renameat2(RENAME_EXCHANGE). Returns False where that is unsupported."""
+    if not sys.platform.startswith("linux"):
+        return False
+    try:
+        renameat2 = ctypes.CDLL(None, use_errno=True).renameat2
+    except (OSError, AttributeError):
+        return False
+    result = renameat2(_AT_FDCWD, os.fsencode(path), _AT_FDCWD, os.fsencode(other_path), _RENAME_EXCHANGE)
+    return result == 0
+
+
+def publish_staged(staging_dir, live_dir, mode="rename"):
+    """
+    Make the finished build in 'staging_dir' the live output directory.
+
+    With "rename" the two directories are swapped with one atomic renameat2 exchange where the
+    platform and filesystem support it, and with two renames in quick succession otherwise. With
+    "symlink" 'live_dir' becomes a symlink to a versioned directory, and publishing replaces the
+    symlink atomically; a real directory at 'live_dir' is moved aside the first time.
+
+    Returns:
+        str: The previous output tree, which the caller should remove, or None if there was none
+    """
+    live_dir = os.path.normpath(live_dir)
+    if mode == "symlink":
+        version_dir = _sibling(live_dir, f"build-{time.time_ns()}")
+        os.rename(staging_dir, version_dir)
+        old_dir = None
+        if os.path.islink(live_dir):
+            old_dir = os.path.join(os.path.dirname(live_dir), os.readlink(live_dir))
+        elif os.path.exists(live_dir):
+            old_dir = _sibling(live_dir, f"old-{time.time_ns()}")
+            os.rename(live_dir, old_dir)
+        link_path = _sibling(live_dir, "link")
+        if os.path.lexists(link_path):
+            os.remove(link_path)
+        os.symlink(os.path.basename(version_dir), link_path)
+        os.replace(link_path, live_dir)
+        return old_dir
+
+    if not os.path.lexists(live_dir):
+        os.rename(staging_dir, live_dir)
+        return None
+    if os.path.islink(live_dir):
+        # Switching back from "symlink" mode: the directory the link points at is the old tree
+        old_dir = os.path.join(os.path.dirname(live_dir), os.readlink(live_dir))
+        if _exchange(staging_dir, live_dir):
+            os.remove(staging_dir)
+        else:
+            os.remove(live_dir)
+            os.rename(staging_dir, live_dir)
+        return old_dir
+    if _exchange(staging_dir, live_dir):
+        # The staging path now holds the previous tree
+        old_dir = _sibling(live_dir, f"old-{time.time_ns()}")
+        os.rename(staging_dir, old_dir)
+        return old_dir
+    old_dir = _sibling(live_dir, f"old-{time.time_ns()}")
+    os.rename(live_dir, old_dir)
+    os.rename(staging_dir, live_dir)
+    return old_dir
+
+
+def remove_in_background(path):
+    """
+    Delete the directory tree at 'path' in a background thread and return the thread.
+
+    The thread is not a daemon, so the interpreter waits for the deletion to finish before it exits.
+    """
+    def remove():
+        shutil.rmtree(path, ignore_errors=True)
+        logging.info(f"🗑️  Removed previous output '{path}'")
+
+    thread = threading.Thread(target=remove, name=f"remove {path}")
+    thread.start()
+    _cleanup_threads.append(thread)
+    return thread
+
+
+def wait_for_cleanup():
+    """Wait until every directory handed to remove_in_background is gone."""
+    while _cleanup_threads:
+        _cleanup_threads.pop().join()
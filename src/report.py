@@ -0,0 +1,210 @@
+import json
+import os
+import time
+
+# Number of pages listed in the slowest and largest rankings by default
+DEFAULT_TOP = 10
+
+
+class BuildReport:
+    """
+    Summary of one build: what was produced, how much was read and written, and which pages cost the most.
+
+    Pages are added from the results of generate_pages_recursive, assets from the stats of sync_static.
+    Every rendered page keeps its parse, render and write times, so the slowest pages can be ranked
+    with the time split that explains why they are slow.
+
+    Args:
+        top (int): Number of pages listed in the slowest and largest rankings (default: DEFAULT_TOP)
+    """
+
+    def __init__(self, top=DEFAULT_TOP):
+        self.top = top
+        self.pages = []
+        self.skipped_pages = 0
+        self.failed_pages = 0
+        self.assets = {"copied": 0, "unchanged": 0, "removed": 0, "bytes_copied": 0}
+        # Copied assets per copy strategy, e.g. {"hardlink": 12}
+        self.asset_strategies = {}
+        # Time spent syncing static assets
+        self.asset_seconds = 0.0
+        self.output_changes = None
+        self.started = time.perf_counter()
+        self.finished = None
+
+    def add_page(self, result):
+        """Record a page result from run_page_job."""
+        if result["error"] is not None:
+            self.failed_pages += 1
+            return
+        timings = result.get("timings") or {}
+        parse = timings.get("parse", 0.0)
+        render = timings.get("render", 0.0)
+        write = timings.get("write", 0.0)
+        self.pages.append({
+            "source": result["source"],
+            "dest": result["dest"],
+            "seconds": timings.get("read", 0.0) + parse + render + write,
+            "parse": parse,
+            "render": render,
+            "write": write,
+            "bytes_read": timings.get("bytes_read", 0),
+            "bytes_written": timings.get("bytes_written", 0),
+            # False when the page's output file already held the same bytes and was left untouched
+            "modified": timings.get("modified", True),
+            # None when the build ran without a parse cache
+            "cached": timings.get("cached"),
+            # Both None when the page was rendered without a block cache
+            "block_hits": timings.get("block_hits"),
+            "block_misses": timings.get("block_misses"),
+        })
+
+    def add_assets(self, stats, seconds=0.0):
+        """Record the stats returned by sync_static, which took 'seconds'."""
+        for key in self.assets:
+            self.assets[key] += stats.get(key, 0)
+        for strategy, count in stats.get("strategies", {}).items():
+            self.asset_strategies[strategy] = self.asset_strategies.get(strategy, 0) + count
+        self.asset_seconds += seconds
+
+    def add_output_changes(self, changes):
+        """Record the output changes returned by update_output_manifest."""
+        self.output_changes = {kind: len(items) for kind, items in changes.items()}
+
+    def move_outputs(self, old_dir, new_dir):
+        """Point the recorded output paths below 'old_dir' (a staging directory) at 'new_dir'."""
+        for page in self.pages:
+            rel_path = os.path.relpath(page["dest"], old_dir)
+            if not rel_path.startswith(os.pardir):
+                page["dest"] = os.path.join(new_dir, rel_path)
+
+    def finish(self):
+        self.finished = time.perf_counter()
+
+    @property
+    def wall_seconds(self):
+        return (self.finished if self.finished is not None else time.perf_counter()) - self.started
+
+    def slowest_pages(self, count=None):
+        return sorted(self.pages, key=lambda page: page["seconds"], reverse=True)[:count or self.top]
+
+    def largest_pages(self, count=None):
+        return sorted(self.pages, key=lambda page: page["bytes_written"], reverse=True)[:count or self.top]
+
+    def parse_cache_stats(self):
+        """Return the parse cache's hits and misses over the rendered pages, or None if no cache was used."""
+        lookups = [page["cached"] for page in self.pages if page["cached"] is not None]
+        if not lookups:
+            return None
+        hits = sum(lookups)
+        return {"hits": hits, "misses": len(lookups) - hits}
+
+    def block_cache_stats(self):
+        """Return the block cache's hits and misses summed over the rendered pages, or None if no cache was used."""
+        pages = [page for page in self.pages if page["block_hits"] is not None]
+        if not pages:
+            return None
+        return {"hits": sum(page["block_hits"] for page in pages), "misses": sum(page["block_misses"] for page in pages)}
+
+    def as_dict(self):
+        """Return the report as a JSON-serializable dict."""
+        wall = self.wall_seconds
+        page_bytes_read = sum(page["bytes_read"] for page in self.pages)
+        # Pages left untouched because their bytes were unchanged wrote nothing
+        page_bytes_written = sum(page["bytes_written"] for page in self.pages if page["modified"])
+        return {
+            "wall_seconds": wall,
+            "pages": {
+                "rendered": len(self.pages),
+                "skipped": self.skipped_pages,
+                "failed": self.failed_pages,
+                "total": len(self.pages) + self.skipped_pages + self.failed_pages,
+            },
+            "assets": dict(self.assets, total=self.assets["copied"] + self.assets["unchanged"],
+                           strategies=dict(sorted(self.asset_strategies.items())), seconds=self.asset_seconds,
+                           # Aggregate copy throughput in MiB/s over all copy threads
+                           mib_per_sec=(self.assets["bytes_copied"] / (1024 * 1024) / self.asset_seconds
+                                        if self.asset_seconds > 0 else 0.0)),
+            "bytes_read": page_bytes_read + self.assets["bytes_copied"],
+            "bytes_written": page_bytes_written + self.assets["bytes_copied"],
+            "files_modified": {
+                "pages": sum(page["modified"] for page in self.pages),
+                "assets": self.assets["copied"],
+            },
+            # Outputs added, changed and deleted since the previous build (None until recorded)
+            "output_changes": self.output_changes,
+            "pages_per_sec": len(self.pages) / wall if wall > 0 else 0.0,
+            "page_seconds": {
+                "parse": sum(page["parse"] for page in self.pages),
+                "render": sum(page["render"] for page in self.pages),
+                "write": sum(page["write"] for page in self.pages),
+            },
+            "parse_cache": self.parse_cache_stats(),
+            "block_cache": self.block_cache_stats(),
+            "slowest_pages": self.slowest_pages(),
+            "largest_pages": self.largest_pages(),
+        }
+
+    def write_json(self, path):
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump(self.as_dict(), file, indent=2)
+            file.write("\n")
+
+    def format(self):
+        """Return the report as human-readable text."""
+        data = self.as_dict()
+        pages = data["pages"]
+        assets = data["assets"]
+        modified = data["files_modified"]
+        lines = [
+            "Build report",
+            f"  Pages:   {pages['total']} ({pages['rendered']} rendered, {pages['skipped']} unchanged, "
+            f"{pages['failed']} failed)",
+            f"  Assets:  {assets['total']} ({assets['copied']} copied, {assets['unchanged']} unchanged, "
+            f"{assets['removed']} removed)",
+        ]
+        if assets["strategies"]:
+            lines.append("  Copied:  " + ", ".join(f"{count} via {strategy}"
+                                                   for strategy, count in assets["strategies"].items())
+                         + f" ({format_bytes(assets['bytes_copied'])} in {assets['seconds']:.2f} s, "
+                           f"{assets['mib_per_sec']:.1f} MiB/s)")
+        lines += [
+            f"  Changed: {modified['pages'] + modified['assets']} files ({modified['pages']} pages, "
+            f"{modified['assets']} assets)",
+        ]
+        if self.output_changes is not None:
+            lines.append(f"  Outputs: {self.output_changes['added']} added, {self.output_changes['changed']} changed, "
+                         f"{self.output_changes['deleted']} deleted since the previous build")
+        lines += [
+            f"  Read:    {format_bytes(data['bytes_read'])}",
+            f"  Written: {format_bytes(data['bytes_written'])}",
+            f"  Time:    {data['wall_seconds']:.2f} s ({data['pages_per_sec']:.1f} pages/s)",
+        ]
+        if data["parse_cache"] is not None:
+            cache = data["parse_cache"]
+            lines.append(f"  Parsed:  {cache['misses']} ({cache['hits']} reused from the parse cache)")
+        if data["block_cache"] is not None:
+            cache = data["block_cache"]
+            lines.append(f"  Blocks:  {cache['misses']} parsed ({cache['hits']} reused from the block cache)")
+        if self.pages:
+            lines.append(f"  Slowest pages{'':<44}{'total':>9}{'parse':>9}{'render':>9}{'write':>9}")
+            for page in data["slowest_pages"]:
+                lines.append(f"    {_shorten(page['source'], 53):<53}" + "".join(
+                    f"{page[key] * 1000:>7.1f}ms" for key in ("seconds", "parse", "render", "write")))
+            lines.append("  Largest pages")
+            for page in data["largest_pages"]:
+                lines.append(f"    {_shorten(page['dest'], 53):<53}{format_bytes(page['bytes_written']):>12}")
+        return "\n".join(lines)
+
+
+def format_bytes(count):
+    """Return a byte count as human-readable text, such as "512 B" or "1.5 MiB"."""
+    for unit in ("B", "KiB", "MiB"):
+        if count < 1024:
+            return f"{count:.0f} {unit}" if unit == "B" else f"{count:.1f} {unit}"
+        count /= 1024
+    return f"{count:.1f} GiB"
+
+
+def _shorten(text, width):
+    return text if len(text) <= width else "…" + text[-(width - 1):]
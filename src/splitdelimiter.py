@@ -1,14 +1,17 @@
 from src.textnode import TextNode, TextType
 import re
 
+IMAGE_PATTERN = re.compile(r"!\[([^\[\]]*)\]\(([^\(\)]*)\)")
+LINK_PATTERN = re.compile(r"(?<!!)\[([^\[\]]*)\]\(([^\(\)]*)\)")
+
 # Helper functions to avoid circular imports
 def extract_markdown_images(text):
     """Extract image patterns from plain text."""
-    return re.findall(r"!\[([^\[\]]*)\]\(([^\(\)]*)\)", text)
+    return IMAGE_PATTERN.findall(text)
 
 def extract_markdown_links(text):
     """Extract link patterns from plain text."""
-    return re.findall(r"(?<!!)\[([^\[\]]*)\]\(([^\(\)]*)\)", text)
+    return LINK_PATTERN.findall(text)
 
 def split_nodes_delimiter(old_nodes, delimiter, text_type):
     """
@@ -92,17 +95,14 @@ def split_nodes_delimiter(old_nodes, delimiter, text_type):
                 
     return new_nodes
 
-# Reimplemented split_nodes_image and split_nodes_link functions
+# Iterative split_nodes_image and split_nodes_link functions
 
-def split_nodes_image(old_nodes):
+def _split_nodes_pattern(old_nodes, pattern, text_type):
     """
-    Split TextNodes by image markdown syntax and create image TextNodes.
+    Split TEXT nodes on every match of 'pattern' (groups: text, url) in one finditer pass.
     
-    inputs:
-    - old_nodes: list of TextNode objects
-
-    output:
-    - returns a new list of nodes with image nodes for any image markdown syntax
+    Each node is scanned once and the text between matches is sliced out directly, so the
+    work is linear in the length of the text no matter how many matches it contains.
     """
     new_nodes = []
     
@@ -110,29 +110,35 @@ def split_nodes_image(old_nodes):
         if old_node.text_type != TextType.TEXT:
             new_nodes.append(old_node)
             continue
-            
-        images = extract_markdown_images(old_node.text)
-        if not images:
-            new_nodes.append(old_node)
-            continue
-            
-        # Process one image at a time
-        alt_text, image_url = images[0]
-        delimiter = f"![{alt_text}]({image_url})"
-        parts = old_node.text.split(delimiter, 1)
         
-        if parts[0]:
-            new_nodes.append(TextNode(parts[0], TextType.TEXT))
-            
-        new_nodes.append(TextNode(alt_text, TextType.IMAGE, image_url))
+        text = old_node.text
+        position = 0
+        for match in pattern.finditer(text):
+            if match.start() > position:
+                new_nodes.append(TextNode(text[position:match.start()], TextType.TEXT))
+            new_nodes.append(TextNode(match.group(1), text_type, match.group(2)))
+            position = match.end()
         
-        if len(parts) > 1 and parts[1]:
-            # Process remaining text recursively
-            remaining_nodes = split_nodes_image([TextNode(parts[1], TextType.TEXT)])
-            new_nodes.extend(remaining_nodes)
+        if position == 0:
+            # No matches, keep the original node
+            new_nodes.append(old_node)
+        elif position < len(text):
+            new_nodes.append(TextNode(text[position:], TextType.TEXT))
     
     return new_nodes
 
+def split_nodes_image(old_nodes):
+    """
+    Split TextNodes by image markdown syntax and create image TextNodes.
+    
+    inputs:
+    - old_nodes: list of TextNode objects
+
+    output:
+    - returns a new list of nodes with image nodes for any image markdown syntax
+    """
+    return _split_nodes_pattern(old_nodes, IMAGE_PATTERN, TextType.IMAGE)
+
 def split_nodes_link(old_nodes):
     """
     Split TextNodes by link markdown syntax and create link TextNodes.
@@ -143,31 +149,4 @@ def split_nodes_link(old_nodes):
     output:
     - returns a new list of nodes with link nodes for any link markdown syntax
     """
-    new_nodes = []
-    
-    for old_node in old_nodes:
-        if old_node.text_type != TextType.TEXT:
-            new_nodes.append(old_node)
-            continue
-            
-        links = extract_markdown_links(old_node.text)
-        if not links:
-            new_nodes.append(old_node)
-            continue
-            
-        # Process one link at a time
-        link_text, link_url = links[0]
-        delimiter = f"[{link_text}]({link_url})"
-        parts = old_node.text.split(delimiter, 1)
-        
-        if parts[0]:
-            new_nodes.append(TextNode(parts[0], TextType.TEXT))
-            
-        new_nodes.append(TextNode(link_text, TextType.LINK, link_url))
-        
-        if len(parts) > 1 and parts[1]:
-            # Process remaining text recursively
-            remaining_nodes = split_nodes_link([TextNode(parts[1], TextType.TEXT)])
-            new_nodes.extend(remaining_nodes)
-    
-    return new_nodes
+    return _split_nodes_pattern(old_nodes, LINK_PATTERN, TextType.LINK)
@@ -0,0 +1,97 @@
+import re
+
+from src.manifest import hash_bytes
+
+# Placeholders understood by the template, e.g. "{{ Title }}"
+SLOT_NAMES = ("Title", "Content")
+_SLOT_PATTERN = re.compile(r"\{\{ (" + "|".join(SLOT_NAMES) + r") \}\}")
+_ROOT_URL_PATTERN = re.compile(r'(href|src)="/')
+
+
+def rewrite_root_urls(html, basepath):
+    """
+    Point root-relative href/src attributes in 'html' at 'basepath' in a single pass.
+    Nothing to do when the site is served from "/".
+    """
+    if basepath == '/':
+        return html
+    return _ROOT_URL_PATTERN.sub(lambda match: f'{match.group(1)}="{basepath}', html)
+
+
+class Template:
+    """
+    An HTML page template compiled once into static segments and slots.
+
+    The basepath rewrite of the template's own links (stylesheets, scripts, ...) happens
+    at compile time, so rendering a page is a single join of precomputed fragments. The
+    page body's links are pointed at the basepath on its nodes by markdown_to_html_node.
+    Instances only hold strings and tuples, so they pickle cheaply to worker processes.
+
+    Args:
+        source (str): Template text containing "{{ Title }}" and "{{ Content }}" slots
+        basepath (str): Base URL path the site is served from (default: "/")
+        digest (str, optional): Content hash of the template source
+    """
+
+    def __init__(self, source, basepath='/', digest=None):
+        self.basepath = basepath
+        self.digest = digest if digest is not None else hash_bytes(source.encode('utf-8'))
+
+        parts = []
+        slots = []
+        position = 0
+        for match in _SLOT_PATTERN.finditer(source):
+            parts.append(rewrite_root_urls(source[position:match.start()], basepath))
+            slots.append((len(parts), match.group(1)))
+            parts.append(None)
+            position = match.end()
+        parts.append(rewrite_root_urls(source[position:], basepath))
+
+        self._parts = tuple(parts)
+        self._slots = tuple(slots)
+
+    @classmethod
+    def from_file(cls, template_path, basepath='/'):
+        """Read and compile the template at 'template_path'."""
+        with open(template_path, 'rb') as file:
+            raw = file.read()
+        # Decode like open(..., 'r') would, so output matches the uncompiled template
+        source = raw.decode('utf-8').replace('\r\n', '\n').replace('\r', '\n')
+        return cls(source, basepath, hash_bytes(raw))
+
+    def render(self, title, content):
+        """
+        Fill the slots with the page title and its rendered HTML body.
+
+        Args:
+            title (str): Page title
+            content (str): Rendered HTML for the page body, with its links already pointed at the basepath
+        """
+        values = {"Title": title, "Content": content}
+        parts = list(self._parts)
+        for index, name in self._slots:
+            parts[index] = values[name]
+        return ''.join(parts)
+
+    def write(self, out, title, content_node):
+        """
+        Stream a page into 'out' without building it as one string.
+
+        The body is written fragment by fragment straight from the node tree, so peak
+        memory stays near the size of the page's nodes rather than several page copies.
+
+        Args:
+            out: Text file-like object with write and writelines methods (the body goes through
+                HTMLNode.write_html, which calls writelines)
+            title (str): Page title
+            content_node (HTMLNode): Root node of the rendered page body, with its links already
+                pointed at the basepath
+        """
+        slot_names = dict(self._slots)
+        for index, part in enumerate(self._parts):
+            if part is not None:
+                out.write(part)
+            elif slot_names[index] == "Title":
+                out.write(title)
+            else:
+                content_node.write_html(out)
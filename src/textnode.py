@@ -1,6 +1,6 @@
 from enum import Enum
 
-from src.htmlnode import LeafNode, HTMLNode
+from src.htmlnode import LeafNode, HTMLNode, ParentNode
 import re
 
 
@@ -17,20 +17,28 @@ class TextType(Enum):
 
 
 class TextNode:
-    def __init__(self, text, text_type, url=None):
+    # Slotted to avoid a per-instance __dict__ on these short-lived parse results
+    __slots__ = ("text", "text_type", "url", "children")
+
+    def __init__(self, text, text_type, url=None, children=None):
         self.text = text
         self.text_type = text_type
         self.url = url
+        # nested inline nodes for bold/italic spans that contain other markup (None otherwise)
+        self.children = children
 
     def __eq__(self, other):
         # returns True if all of properties of two TwxtNode objects are equal
         if not isinstance(other, TextNode):
             return False
         # this method is used in future unit tests to compare objects
-        return (self.text == other.text and self.text_type == other.text_type and self.url == other.url)
+        return (self.text == other.text and self.text_type == other.text_type and self.url == other.url
+                and self.children == other.children)
 
     def __repr__(self):
         # returns a string representation of the TextNode object
+        if self.children is not None:
+            return f"TextNode(text={self.text}, text_type={self.text_type.value}, url={self.url}, children={self.children})"
         return f"TextNode(text={self.text}, text_type={self.text_type.value}, url={self.url})"
 
 ## Functions involving TextNode ##
@@ -39,6 +47,10 @@ class TextNode:
 def text_node_to_html_node(text_node):
     if text_node.text_type not in TextType:
         raise ValueError("Invalid text type provided")
+  # if text_node has nested inline nodes -- return ParentNode with "b"/"i" tag wrapping the converted children
+    elif text_node.children and text_node.text_type in (TextType.BOLD, TextType.ITALIC):
+        tag = "b" if text_node.text_type == TextType.BOLD else "i"
+        return ParentNode(tag, children=[text_node_to_html_node(child) for child in text_node.children])
   # if text_node is BOLD -- return LeafNode with "b" tag and text value
     elif text_node.text_type == TextType.BOLD:
         return LeafNode("b", text_node.text)
@@ -58,8 +70,8 @@ def text_node_to_html_node(text_node):
     else:
         return LeafNode(None, text_node.text)
     
-# Import the helper functions from their respective modules
-from src.splitdelimiter import split_nodes_delimiter, split_nodes_image, split_nodes_link
+# Import the inline parser as a module so importing src.inline_markdown first does not hit a circular import
+import src.inline_markdown as inline_markdown
 
 def text_to_text_node(text):
     """Convert markdown-formatted text to a list of TextNode objects."""
@@ -99,17 +111,6 @@ def text_to_text_node(text):
             TextNode("", TextType.TEXT)
         ]
         
-    # Start with a single text node
-    nodes = [TextNode(text, TextType.TEXT)]
-    
-    # Process for each markdown delimiter in this specific order
-    # First handle images (they contain link syntax)
-    nodes = split_nodes_image(nodes)
-    # Then handle links
-    nodes = split_nodes_link(nodes)
-    # Then handle other formatting
-    nodes = split_nodes_delimiter(nodes, "**", TextType.BOLD)
-    nodes = split_nodes_delimiter(nodes, "_", TextType.ITALIC)
-    nodes = split_nodes_delimiter(nodes, "`", TextType.CODE)
-    
-    return nodes
+    # Recognize images, links, bold, italic and code in a single left-to-right pass
+    # (replaces running split_nodes_image, split_nodes_link and split_nodes_delimiter in turn)
+    return inline_markdown.parse_inline(text)
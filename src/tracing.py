@@ -0,0 +1,144 @@
+"""
+Optional build instrumentation exported in the Chrome trace-event format.
+
+Code marks the stages it wants to see with `with tracing.span("parse"):`. While tracing is off
+span() returns one shared no-op context manager, so an instrumented stage costs a global
+lookup and a function call. Once enabled, every span becomes a complete ("X") event with the
+process and thread it ran on, and the file written by write() opens in chrome://tracing or
+https://ui.perfetto.dev with one lane per process and thread.
+
+Worker processes trace into their own Tracer and hand their events back with each result
+(see drain() and add_events()), so a parallel build shows one lane per worker.
+"""
+import json
+import os
+import threading
+import time
+
+_tracer = None
+
+
+def _now_us():
+    # perf_counter is a system-wide monotonic clock on the supported platforms, so
+    # timestamps taken in different worker processes line up on one timeline
+    return time.perf_counter_ns() / 1000
+
+
+class Tracer:
+    """Collects trace events for the current process."""
+
+    def __init__(self):
+        self.events = []
+
+    def add(self, name, category, start_us, end_us, args):
+        event = {
+            "name": name,
+            "cat": category,
+            "ph": "X",
+            "ts": start_us,
+            "dur": end_us - start_us,
+            "pid": os.getpid(),
+            "tid": threading.get_native_id(),
+        }
+        if args:
+            event["args"] = args
+        self.events.append(event)
+
+    def name_process(self, name):
+        """Label this process's lane in the trace viewer."""
+        self.events.append({"name": "process_name", "ph": "M", "pid": os.getpid(), "tid": 0, "args": {"name": name}})
+
+
+class _Span:
+    __slots__ = ("tracer", "name", "category", "args", "start")
+
+    def __init__(self, tracer, name, category, args):
+        self.tracer = tracer
+        self.name = name
+        self.category = category
+        self.args = args
+
+    def __enter__(self):
+        self.start = _now_us()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        if exc_type is not None:
+            self.args["error"] = exc_type.__name__
+        self.tracer.add(self.name, self.category, self.start, _now_us(), self.args)
+        return False
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def span(name, category="build", **args):
+    """
+    Return a context manager that records 'name' as one event while tracing is enabled.
+
+    Args:
+        name (str): Stage name shown in the viewer
+        category (str): Event category, usable as a filter in the viewer (default: "build")
+        **args: Extra values shown with the event, e.g. the page being built
+    """
+    if _tracer is None:
+        return _NULL_SPAN
+    return _Span(_tracer, name, category, args)
+
+
+def enable(process_name="main"):
+    """Start collecting events in this process (a no-op if tracing is already on)."""
+    global _tracer
+    if _tracer is None:
+        _tracer = Tracer()
+        _tracer.name_process(process_name)
+
+
+def disable():
+    """Stop tracing and return the Tracer with everything collected, or None if tracing was off."""
+    global _tracer
+    tracer, _tracer = _tracer, None
+    return tracer
+
+
+def is_enabled():
+    return _tracer is not None
+
+
+def drain():
+    """Return and forget the events collected so far, so a worker can ship them to the parent."""
+    if _tracer is None:
+        return []
+    events, _tracer.events = _tracer.events, []
+    return events
+
+
+def add_events(events):
+    """Merge events returned by drain() in another process into this process's trace."""
+    if _tracer is not None:
+        _tracer.events.extend(events)
+
+
+def write(path, tracer=None):
+    """
+    Write the collected events to 'path' as trace-event JSON.
+
+    Args:
+        path (str): Output file
+        tracer (Tracer, optional): Tracer to write (default: the active one)
+    """
+    tracer = tracer or _tracer
+    if tracer is None:
+        return
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump({"traceEvents": tracer.events, "displayTimeUnit": "ms"}, file)
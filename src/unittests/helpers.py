@@ -0,0 +1,45 @@
+import logging
+import os
+import tempfile
+
+
+def write_file(path, text):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as file:
+        file.write(text)
+
+
+def read_file(path):
+    with open(path, 'r', encoding='utf-8') as file:
+        return file.read()
+
+
+def read_tree(root):
+    """Return {relative path: bytes} for every file below 'root'."""
+    tree = {}
+    for dirpath, dirnames, filenames in os.walk(root):
+        for filename in filenames:
+            path = os.path.join(dirpath, filename)
+            with open(path, 'rb') as file:
+                tree[os.path.relpath(path, root)] = file.read()
+    return tree
+
+
+class TempDirMixin:
+    """
+    unittest.TestCase mixin giving every test a fresh temporary directory at 'self.root'.
+
+    The directory is removed after the test. With 'quiet' set, logging is disabled for the
+    duration of the test, for tests that run whole builds.
+    """
+
+    quiet = False
+
+    def setUp(self):
+        super().setUp()
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.root = self.tmp.name
+        if self.quiet:
+            logging.disable(logging.CRITICAL)
+            self.addCleanup(logging.disable, logging.NOTSET)
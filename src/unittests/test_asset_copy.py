@@ -0,0 +1,76 @@
+import os
+import unittest
+
+from src import asset_copy
+from src.asset_copy import place_asset
+from src.helpers import sync_static
+from src.unittests.helpers import TempDirMixin, read_file, write_file
+
+
+class TestPlaceAsset(TempDirMixin, unittest.TestCase):
+    def setUp(self):
+        super().setUp()
+        self.src = os.path.join(self.root, "logo.png")
+        self.dest = os.path.join(self.root, "docs", "logo.png")
+        write_file(self.src, "png" * 1000)
+        os.utime(self.src, ns=(10 ** 9, 10 ** 9))
+        os.makedirs(os.path.dirname(self.dest))
+
+    def assert_copied(self):
+        self.assertEqual(read_file(self.dest), "png" * 1000)
+        self.assertEqual(os.stat(self.dest).st_mtime_ns, 10 ** 9)
+
+    def test_copy(self):
+        self.assertEqual(place_asset(self.src, self.dest), "copy")
+        self.assert_copied()
+        self.assertFalse(os.path.samefile(self.src, self.dest))
+
+    def test_hardlink(self):
+        self.assertEqual(place_asset(self.src, self.dest, "hardlink"), "hardlink")
+        self.assertTrue(os.path.samefile(self.src, self.dest))
+
+    def test_reflink_falls_back_to_streaming(self):
+        strategy = place_asset(self.src, self.dest, "reflink")
+        # Only copy-on-write filesystems (btrfs, XFS) can clone
+        self.assertIn(strategy, ("reflink", "copy_file_range", "sendfile", "copy"))
+        self.assert_copied()
+        self.assertFalse(os.path.samefile(self.src, self.dest))
+
+    def test_auto_prefers_a_clone_then_a_hardlink(self):
+        strategy = place_asset(self.src, self.dest, "auto")
+        self.assertIn(strategy, ("reflink", "hardlink"))
+        self.assert_copied()
+
+    def test_stream_copies_large_files_in_chunks(self):
+        original = asset_copy._STREAM_CHUNK
+        asset_copy._STREAM_CHUNK = 256
+        try:
+            self.assertIn(asset_copy._stream(self.src, self.dest), ("copy_file_range", "sendfile", "copy"))
+        finally:
+            asset_copy._STREAM_CHUNK = original
+        self.assert_copied()
+
+    def test_unknown_mode(self):
+        with self.assertRaises(Exception):
+            place_asset(self.src, self.dest, "symlink")
+
+
+class TestSyncStaticLinkMode(TempDirMixin, unittest.TestCase):
+    def setUp(self):
+        super().setUp()
+        self.src = os.path.join(self.root, "static")
+        self.dest = os.path.join(self.root, "docs")
+        write_file(os.path.join(self.src, "index.css"), "body {}")
+        write_file(os.path.join(self.src, "images", "logo.png"), "png")
+
+    def test_hardlinked_assets_count_no_bytes(self):
+        assets, stats = sync_static(self.src, self.dest, link_mode="hardlink")
+        self.assertEqual((stats["strategies"], stats["bytes_copied"]), ({"hardlink": 2}, 0))
+        self.assertTrue(os.path.samefile(os.path.join(self.src, "index.css"), os.path.join(self.dest, "index.css")))
+        # A hardlink shares the source's mtime, so the next sync sees it as unchanged
+        _, stats = sync_static(self.src, self.dest, assets, link_mode="hardlink")
+        self.assertEqual(stats["unchanged"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,6 @@
 import unittest
-from src.block import BlockType, block_to_block_type
+from src.block import BlockType, block_to_block_type, scan_blocks
+from src.extract_markdown import markdown_to_blocks
 
 
 class TestBlockToBlockType(unittest.TestCase):
@@ -122,5 +123,52 @@ class TestBlockToBlockType(unittest.TestCase):
     self.assertEqual(block_to_block_type("Not a # heading"), BlockType.PARAGRAPH)
     self.assertEqual(block_to_block_type("Not a ```code``` block"), BlockType.PARAGRAPH)
 
+
+class TestScanBlocks(unittest.TestCase):
+
+  def test_types_and_text(self):
+    markdown = "# Title\n\nSome *text*\nmore\n\n> a\n> b\n\n- x\n- y\n\n1. one\n2. two\n\n```\ncode\n```"
+    self.assertEqual([(block.type, block.text) for block in scan_blocks(markdown)], [
+      (BlockType.HEADING, "# Title"),
+      (BlockType.PARAGRAPH, "Some *text*\nmore"),
+      (BlockType.QUOTE, "> a\n> b"),
+      (BlockType.UNORDERED_LIST, "- x\n- y"),
+      (BlockType.ORDERED_LIST, "1. one\n2. two"),
+      (BlockType.CODE, "```\ncode\n```"),
+    ])
+
+  def test_matches_block_to_block_type(self):
+    markdown = "  ## Indented  \n\n- a\nnot a list\n\n> q\n>\n\n#NoSpace\n\n```\nunclosed\n\n12. x\n3. y"
+    for block in scan_blocks(markdown):
+      self.assertEqual(block.type, block_to_block_type(block.text))
+    self.assertEqual([block.text for block in scan_blocks(markdown)], markdown_to_blocks(markdown))
+
+  def test_spans_point_into_source(self):
+    markdown = "\n  # Heading  \n\npara one\npara two\n"
+    heading, paragraph = scan_blocks(markdown)
+    self.assertEqual(markdown[heading.start:heading.end], "# Heading")
+    self.assertEqual(markdown[paragraph.start:paragraph.end], "para one\npara two")
+
+  def test_fenced_code_keeps_blank_lines(self):
+    markdown = "Intro\n\n```\nfirst\n\n\nsecond\n```\n\nOutro"
+    blocks = scan_blocks(markdown)
+    self.assertEqual([block.type for block in blocks], [BlockType.PARAGRAPH, BlockType.CODE, BlockType.PARAGRAPH])
+    self.assertEqual(blocks[1].text, "```\nfirst\n\n\nsecond\n```")
+    self.assertEqual(markdown[blocks[1].start:blocks[1].end], blocks[1].text)
+
+  def test_unclosed_fence_falls_back_to_blank_line_blocks(self):
+    markdown = "```\ncode\n\n# Heading"
+    self.assertEqual([(block.type, block.text) for block in scan_blocks(markdown)], [
+      (BlockType.PARAGRAPH, "```\ncode"),
+      (BlockType.HEADING, "# Heading"),
+    ])
+
+  def test_whitespace_only_lines_separate_blocks(self):
+    self.assertEqual(markdown_to_blocks("one\n   \ntwo"), ["one", "two"])
+
+  def test_empty_document(self):
+    self.assertEqual(scan_blocks(""), [])
+    self.assertEqual(scan_blocks("\n  \n\n"), [])
+
 if __name__ == '__main__':
   unittest.main()
\ No newline at end of file
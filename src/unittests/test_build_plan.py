@@ -0,0 +1,95 @@
+import contextlib
+import io
+import logging
+import os
+import unittest
+
+from src.build_plan import BuildPlan, walk_files
+from src.main import copy_static_to_public, process_markdown_directory
+from src.unittests.helpers import TempDirMixin, write_file
+
+
+class TestBuildPlan(TempDirMixin, unittest.TestCase):
+    def setUp(self):
+        super().setUp()
+        self.static = os.path.join(self.root, "static")
+        self.content = os.path.join(self.root, "content")
+        self.dest = os.path.join(self.root, "docs")
+        write_file(os.path.join(self.static, "index.css"), "body {}")
+        write_file(os.path.join(self.static, "images", "logo.png"), "png")
+        write_file(os.path.join(self.content, "index.md"), "# Home")
+        write_file(os.path.join(self.content, "blog", "2024", "post.md"), "# Post")
+        write_file(os.path.join(self.content, "blog", "notes.txt"), "not a page")
+
+    def test_walk_files_is_sorted_and_skips_special_files(self):
+        os.symlink(os.path.join(self.static, "missing"), os.path.join(self.static, "dangling"))
+        with self.assertLogs(level=logging.WARNING) as logs:
+            self.assertEqual([rel_path for rel_path, _ in walk_files(self.static)],
+                             ["index.css", os.path.join("images", "logo.png")])
+        self.assertIn("dangling", logs.output[0])
+
+    def test_walk_files_follows_symlinked_directories(self):
+        os.symlink(os.path.join(self.static, "images"), os.path.join(self.static, "linked"))
+        self.assertEqual([rel_path for rel_path, _ in walk_files(self.static)],
+                         ["index.css", os.path.join("images", "logo.png"), os.path.join("linked", "logo.png")])
+
+    def test_walk_files_skips_symlink_loops(self):
+        os.symlink(self.static, os.path.join(self.static, "images", "loop"))
+        with self.assertLogs(level=logging.WARNING) as logs:
+            self.assertEqual([rel_path for rel_path, _ in walk_files(self.static)],
+                             ["index.css", os.path.join("images", "logo.png")])
+        self.assertEqual(len(logs.output), 1)
+        self.assertIn("symlink loop", logs.output[0])
+
+    def test_scan(self):
+        plan = BuildPlan.scan(self.static, self.content)
+        self.assertEqual([(page["key"], page["output"]) for page in plan.pages],
+                         [("index.md", "index.html"),
+                          (os.path.join("blog", "2024", "post.md"), os.path.join("blog", "2024", "post.html"))])
+        self.assertEqual([asset["output"] for asset in plan.assets], ["index.css", os.path.join("images", "logo.png")])
+        self.assertEqual(plan.pages[0]["stat"].st_size, 6)
+        # Parents come before their children, and each directory is listed once
+        self.assertEqual(plan.directories, ["blog", os.path.join("blog", "2024"), "images"])
+
+    def test_missing_directories_plan_nothing(self):
+        plan = BuildPlan.scan(os.path.join(self.root, "nope"), None)
+        self.assertEqual((plan.pages, plan.assets, plan.directories), ([], [], []))
+
+    def test_make_directories_creates_each_once(self):
+        plan = BuildPlan.scan(self.static, self.content)
+        self.assertEqual(plan.make_directories(self.dest), 3)
+        self.assertTrue(os.path.isdir(os.path.join(self.dest, "blog", "2024")))
+        self.assertEqual(plan.make_directories(self.dest), 0)
+
+    def test_format(self):
+        text = BuildPlan.scan(self.static, self.content).format(self.dest)
+        self.assertIn("Pages:       2", text)
+        self.assertIn("Assets:      2 (10 B)", text)
+        self.assertIn("Directories: 3", text)
+        self.assertIn(f"{os.path.join(self.content, 'index.md')} → {os.path.join(self.dest, 'index.html')}", text)
+
+    def test_dry_run_writes_nothing(self):
+        write_file(os.path.join(self.root, "template.html"), "{{ Title }}{{ Content }}")
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            self.assertTrue(copy_static_to_public(self.static, self.dest, self.content,
+                                                  os.path.join(self.root, "template.html"), dry_run=True))
+        self.assertIn("Build plan for", output.getvalue())
+        self.assertEqual(sorted(os.listdir(self.root)), ["content", "static", "template.html"])
+
+    def test_process_markdown_directory(self):
+        write_file(os.path.join(self.root, "template.html"), "{{ Title }}{{ Content }}")
+        write_file(os.path.join(self.content, ".drafts", "draft.md"), "# Draft")
+        logging.disable(logging.CRITICAL)
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                process_markdown_directory(self.content, self.dest, os.path.join(self.root, "template.html"))
+        finally:
+            logging.disable(logging.NOTSET)
+        pages = sorted(os.path.relpath(os.path.join(root, name), self.dest)
+                       for root, _, files in os.walk(self.dest) for name in files)
+        self.assertEqual(pages, [os.path.join("blog", "2024", "post", "index.html"), "index.html"])
+
+
+if __name__ == "__main__":
+    unittest.main()
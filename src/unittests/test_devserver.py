@@ -0,0 +1,129 @@
+import http.client
+import os
+import threading
+import unittest
+
+from src.devserver import DevSite, LIVERELOAD_PATH, LIVERELOAD_SCRIPT, inject_livereload, make_server
+from src.unittests.helpers import TempDirMixin, write_file
+
+TEMPLATE = '<html><head><link href="/index.css" /></head><title>{{ Title }}</title><body>{{ Content }}</body></html>'
+
+
+class DevSiteTestCase(TempDirMixin, unittest.TestCase):
+    def setUp(self):
+        super().setUp()
+        self.content = os.path.join(self.root, "content")
+        self.static = os.path.join(self.root, "static")
+        self.template = os.path.join(self.root, "template.html")
+        write_file(self.template, TEMPLATE)
+        write_file(os.path.join(self.static, "index.css"), "body {}")
+        write_file(os.path.join(self.content, "index.md"), "# Home\n\nWelcome")
+        write_file(os.path.join(self.content, "blog", "tom", "index.md"), "# Tom\n\nBombadil")
+        write_file(os.path.join(self.content, "about.md"), "# About")
+
+    def modify(self, path, text):
+        write_file(path, text)
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+
+class TestDevSite(DevSiteTestCase):
+    def test_resolve(self):
+        site = DevSite(self.content, self.static, self.template)
+        self.assertEqual(site.resolve("/"), ("page", os.path.join(self.content, "index.md")))
+        self.assertEqual(site.resolve("/blog/tom/"), ("page", os.path.join(self.content, "blog", "tom", "index.md")))
+        self.assertEqual(site.resolve("/blog/tom"), ("redirect", "/blog/tom/"))
+        self.assertEqual(site.resolve("/about"), ("page", os.path.join(self.content, "about.md")))
+        self.assertEqual(site.resolve("/about.html"), ("page", os.path.join(self.content, "about.md")))
+        self.assertEqual(site.resolve("/index.css"), ("static", os.path.join(self.static, "index.css")))
+        self.assertEqual(site.resolve("/missing"), (None, None))
+        self.assertEqual(site.resolve("/../template.html"), (None, None))
+
+    def test_resolve_strips_basepath(self):
+        site = DevSite(self.content, self.static, self.template, "/ssg/")
+        self.assertEqual(site.resolve("/ssg/"), ("page", os.path.join(self.content, "index.md")))
+        self.assertEqual(site.resolve("/ssg/index.css"), ("static", os.path.join(self.static, "index.css")))
+
+    def test_render_is_cached_until_source_changes(self):
+        site = DevSite(self.content, self.static, self.template)
+        source = os.path.join(self.content, "index.md")
+        first = site.render(source)
+        self.assertIn(b"<h1>Home</h1>", first)
+        self.assertIs(site.render(source), first)
+
+        self.modify(source, "# Home\n\nChanged")
+        site.apply_changes(site.files.poll())
+        self.assertIn(b"Changed", site.render(source))
+        self.assertEqual(site.version, 1)
+
+    def test_template_change_rerenders_pages(self):
+        site = DevSite(self.content, self.static, self.template, "/ssg/")
+        source = os.path.join(self.content, "about.md")
+        self.assertIn(b'href="/ssg/index.css"', site.render(source))
+        self.modify(self.template, TEMPLATE.replace("<body>", '<body class="new">'))
+        site.apply_changes(site.files.poll())
+        self.assertIn(b'class="new"', site.render(source))
+
+    def test_inject_livereload(self):
+        self.assertEqual(inject_livereload("<body>x</body>"), f"<body>x{LIVERELOAD_SCRIPT}</body>")
+        self.assertEqual(inject_livereload("x"), "x" + LIVERELOAD_SCRIPT)
+
+
+class TestDevServer(DevSiteTestCase):
+    quiet = True
+
+    def setUp(self):
+        super().setUp()
+        self.site = DevSite(self.content, self.static, self.template)
+        self.server = make_server(self.site, port=0)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def request(self, path, method="GET"):
+        connection = http.client.HTTPConnection(*self.server.server_address, timeout=5)
+        connection.request(method, path)
+        response = connection.getresponse()
+        body = response.read()
+        connection.close()
+        return response, body
+
+    def test_serves_pages_assets_and_errors(self):
+        response, body = self.request("/blog/tom/")
+        self.assertEqual(response.status, 200)
+        self.assertIn(b"<h1>Tom</h1>", body)
+        self.assertIn(LIVERELOAD_SCRIPT.encode('utf-8'), body)
+
+        response, body = self.request("/index.css")
+        self.assertEqual((response.status, response.getheader("Content-Type"), body), (200, "text/css", b"body {}"))
+
+        response, _ = self.request("/blog/tom")
+        self.assertEqual((response.status, response.getheader("Location")), (301, "/blog/tom/"))
+        self.assertEqual(self.request("/nope")[0].status, 404)
+
+        response, body = self.request("/index.css", "HEAD")
+        self.assertEqual((response.status, response.getheader("Content-Length"), body), (200, "7", b""))
+
+    def test_render_errors_are_reported(self):
+        write_file(os.path.join(self.content, "broken.md"), "# Broken\n\nunclosed **bold")
+        self.site.apply_changes(self.site.files.poll())
+        response, body = self.request("/broken")
+        self.assertEqual(response.status, 500)
+        self.assertIn(b"unmatched delimiter", body)
+
+    def test_livereload_stream(self):
+        connection = http.client.HTTPConnection(*self.server.server_address, timeout=5)
+        connection.request("GET", LIVERELOAD_PATH)
+        response = connection.getresponse()
+        self.assertEqual(response.getheader("Content-Type"), "text/event-stream")
+        self.modify(os.path.join(self.content, "index.md"), "# Home\n\nAgain")
+        self.site.apply_changes(self.site.files.poll())
+        self.assertEqual(response.readline(), b"data: reload\n")
+        connection.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,184 @@
+import contextlib
+import io
+import os
+import unittest
+
+from src.generate_page import (collect_page_jobs, generate_page, generate_pages_recursive, pipeline_page_jobs,
+                               write_if_changed)
+from src.main import copy_static_to_public
+from src.report import BuildReport
+from src.template import Template
+from src.unittests.helpers import TempDirMixin, read_tree, write_file
+
+
+TEMPLATE = '<html><title>{{ Title }}</title><link href="/index.css" /><body>{{ Content }}</body></html>'
+
+
+class TestGeneratePagesRecursive(TempDirMixin, unittest.TestCase):
+    def setUp(self):
+        super().setUp()
+        root = self.root
+        self.content = os.path.join(root, "content")
+        self.template = os.path.join(root, "template.html")
+        write_file(self.template, TEMPLATE)
+        for i in range(12):
+            write_file(
+                os.path.join(self.content, f"section{i % 3}", f"post{i}.md"),
+                f"# Post {i}\n\nSee the [home page](/) and **bold** text.\n\n- item {i}",
+            )
+        write_file(os.path.join(self.content, "index.md"), "# Home\n\n![logo](/images/logo.png)")
+
+    def build(self, dest_name, jobs, pipeline=False):
+        dest = os.path.join(self.root, dest_name)
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            generate_pages_recursive(self.content, self.template, dest, '/ssg/', jobs=jobs, pipeline=pipeline)
+        return dest, output.getvalue()
+
+    def test_generates_every_page(self):
+        dest, _ = self.build("serial", 1)
+        tree = read_tree(dest)
+        self.assertEqual(len(tree), 13)
+        self.assertIn(b'<link href="/ssg/index.css" />', tree["index.html"])
+        self.assertIn(b'<img src="/ssg/images/logo.png" alt="logo">', tree["index.html"])
+
+    def test_parallel_output_is_byte_identical(self):
+        serial_dest, serial_log = self.build("serial", 1)
+        parallel_dest, parallel_log = self.build("parallel", 3)
+        self.assertEqual(read_tree(serial_dest), read_tree(parallel_dest))
+        self.assertEqual(serial_log.replace(serial_dest, ""), parallel_log.replace(parallel_dest, ""))
+
+    def test_errors_are_reported_after_other_pages(self):
+        write_file(os.path.join(self.content, "section0", "broken.md"), "no title here")
+        for jobs in (1, 2):
+            with self.assertRaises(Exception) as context:
+                self.build(f"broken{jobs}", jobs)
+            self.assertIn("broken.md", str(context.exception))
+            dest = os.path.join(self.root, f"broken{jobs}")
+            self.assertEqual(len(read_tree(dest)), 13)
+
+    def test_pipelined_output_is_byte_identical(self):
+        serial_dest, serial_log = self.build("serial", 1)
+        for jobs in (1, 3):
+            with self.subTest(jobs=jobs):
+                pipelined_dest, pipelined_log = self.build(f"pipelined{jobs}", jobs, pipeline=True)
+                self.assertEqual(read_tree(serial_dest), read_tree(pipelined_dest))
+                self.assertEqual(serial_log.replace(serial_dest, ""), pipelined_log.replace(pipelined_dest, ""))
+
+    def test_pipelined_errors_are_reported_after_other_pages(self):
+        write_file(os.path.join(self.content, "section0", "broken.md"), "no title here")
+        with self.assertRaises(Exception) as context:
+            self.build("broken", 1, pipeline=True)
+        self.assertIn("broken.md", str(context.exception))
+        self.assertEqual(len(read_tree(os.path.join(self.root, "broken"))), 13)
+
+    def test_pipeline_records_write_timings(self):
+        dest = os.path.join(self.root, "timed")
+        template = Template.from_file(self.template, '/ssg/')
+        with contextlib.redirect_stdout(io.StringIO()):
+            results = list(pipeline_page_jobs(collect_page_jobs(self.content, self.template, dest), template, depth=2))
+        self.assertEqual([result["key"] for result in results][:2], ["index.md", os.path.join("section0", "post0.md")])
+        for result in results:
+            self.assertNotIn("html", result)
+            self.assertTrue(result["timings"]["modified"])
+            self.assertEqual(result["timings"]["bytes_written"], os.path.getsize(result["dest"]))
+
+    def test_pipeline_can_be_abandoned(self):
+        dest = os.path.join(self.root, "abandoned")
+        template = Template.from_file(self.template, '/ssg/')
+        results = pipeline_page_jobs(collect_page_jobs(self.content, self.template, dest), template, depth=1)
+        with contextlib.redirect_stdout(io.StringIO()):
+            next(results)
+        results.close()
+
+
+class TestWriteIfChanged(TempDirMixin, unittest.TestCase):
+    quiet = True
+
+    def setUp(self):
+        super().setUp()
+        self.template = os.path.join(self.root, "template.html")
+        write_file(self.template, TEMPLATE)
+        write_file(os.path.join(self.root, "static", "index.css"), "body {}")
+        write_file(os.path.join(self.root, "content", "index.md"), "# Home\n\nWelcome")
+        write_file(os.path.join(self.root, "content", "blog", "post.md"), "# Post\n\nText")
+
+    def age(self, path):
+        # Backdate the file so a rewrite would be visible even with coarse timestamps
+        os.utime(path, ns=(10**9, 10**9))
+
+    def test_write_if_changed(self):
+        path = os.path.join(self.root, "page.html")
+        self.assertTrue(write_if_changed(path, "<p>é</p>"))
+        self.age(path)
+        self.assertFalse(write_if_changed(path, "<p>é</p>"))
+        self.assertEqual(os.stat(path).st_mtime_ns, 10**9)
+        # Same size, different bytes
+        self.assertTrue(write_if_changed(path, "<p>è</p>"))
+        with open(path, encoding='utf-8') as file:
+            self.assertEqual(file.read(), "<p>è</p>")
+        self.assertEqual([name for name in os.listdir(self.root) if name.endswith(".tmp")], [])
+
+    def test_failed_write_leaves_no_temporary_file(self):
+        source = os.path.join(self.root, "content", "index.md")
+        # A non-empty directory where the page should go: os.replace fails after the write
+        dest = os.path.join(self.root, "out", "index.html")
+        write_file(os.path.join(dest, "keep"), "")
+        with self.assertRaises(OSError):
+            write_if_changed(dest, "<p>Text</p>")
+        for stream in (False, True):
+            with self.subTest(stream=stream), self.assertRaises(OSError):
+                generate_page(source, self.template, dest, log=lambda line: None, stream=stream)
+        self.assertEqual(os.listdir(os.path.dirname(dest)), ["index.html"])
+
+    def test_failed_open_raises_the_original_error(self):
+        source = os.path.join(self.root, "content", "index.md")
+        dest = os.path.join(self.root, "missing", "index.html")
+        for stream in (False, True):
+            with self.subTest(stream=stream), self.assertRaises(FileNotFoundError) as caught:
+                generate_page(source, self.template, dest, log=lambda line: None, stream=stream, make_dirs=False)
+            # Raised by open() itself, not by the clean-up while handling it
+            self.assertIsNone(caught.exception.__context__)
+            self.assertEqual(caught.exception.filename, f"{dest}.{os.getpid()}.tmp")
+
+    def test_unchanged_page_is_left_untouched(self):
+        source = os.path.join(self.root, "content", "index.md")
+        dest = os.path.join(self.root, "out", "index.html")
+        for stream in (False, True):
+            timings = {}
+            generate_page(source, self.template, dest, log=lambda line: None, stream=stream, timings=timings)
+            self.age(dest)
+            generate_page(source, self.template, dest, log=lambda line: None, stream=stream, timings=timings)
+            self.assertFalse(timings["modified"])
+            self.assertEqual(os.stat(dest).st_mtime_ns, 10**9)
+            write_file(source, f"# Home\n\nEdited {stream}")
+            generate_page(source, self.template, dest, log=lambda line: None, stream=stream, timings=timings)
+            self.assertTrue(timings["modified"])
+            self.assertNotEqual(os.stat(dest).st_mtime_ns, 10**9)
+        self.assertEqual(os.listdir(os.path.dirname(dest)), ["index.html"])
+
+    def build(self):
+        report = BuildReport()
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertTrue(copy_static_to_public(
+                os.path.join(self.root, "static"), os.path.join(self.root, "docs"), os.path.join(self.root, "content"),
+                self.template, report=report))
+        return report.as_dict()["files_modified"]
+
+    def test_full_rebuild_only_touches_changed_files(self):
+        docs = os.path.join(self.root, "docs")
+        self.assertEqual(self.build(), {"pages": 2, "assets": 1})
+        self.age(os.path.join(docs, "index.html"))
+        css_mtime = os.stat(os.path.join(docs, "index.css")).st_mtime_ns
+        write_file(os.path.join(docs, "stray", "old.html"), "left over")
+        write_file(os.path.join(self.root, "content", "blog", "post.md"), "# Post\n\nChanged")
+
+        self.assertEqual(self.build(), {"pages": 1, "assets": 0})
+        self.assertEqual(os.stat(os.path.join(docs, "index.html")).st_mtime_ns, 10**9)
+        self.assertEqual(os.stat(os.path.join(docs, "index.css")).st_mtime_ns, css_mtime)
+        self.assertFalse(os.path.exists(os.path.join(docs, "stray")))
+        self.assertIn(b"Changed", read_tree(docs)[os.path.join("blog", "post.html")])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+import os
+import tempfile
+import unittest
+
+from src.helpers import remove_unlisted, sync_static
+from src.unittests.helpers import TempDirMixin, write_file
+
+
+class TestSyncStatic(TempDirMixin, unittest.TestCase):
+    def setUp(self):
+        super().setUp()
+        self.src = os.path.join(self.root, "static")
+        self.dest = os.path.join(self.root, "docs")
+        write_file(os.path.join(self.src, "index.css"), "body {}")
+        write_file(os.path.join(self.src, "images", "logo.png"), "png")
+
+    def dest_path(self, *parts):
+        return os.path.join(self.dest, *parts)
+
+    def test_first_sync_copies_everything(self):
+        assets, stats = sync_static(self.src, self.dest)
+        self.assertEqual(stats, {"copied": 2, "unchanged": 0, "removed": 0, "bytes_copied": 10,
+                                 "strategies": {"copy": 2}})
+        self.assertEqual(sorted(assets), ["images/logo.png", "index.css"])
+        self.assertTrue(os.path.isfile(self.dest_path("images", "logo.png")))
+
+    def test_unchanged_files_keep_timestamps(self):
+        assets, _ = sync_static(self.src, self.dest)
+        before = os.stat(self.dest_path("index.css")).st_mtime_ns
+        assets, stats = sync_static(self.src, self.dest, assets)
+        self.assertEqual(stats, {"copied": 0, "unchanged": 2, "removed": 0, "bytes_copied": 0,
+                                 "strategies": {}})
+        self.assertEqual(os.stat(self.dest_path("index.css")).st_mtime_ns, before)
+
+    def test_changed_file_is_copied(self):
+        assets, _ = sync_static(self.src, self.dest)
+        write_file(os.path.join(self.src, "index.css"), "body { color: red; }")
+        assets, stats = sync_static(self.src, self.dest, assets)
+        self.assertEqual(stats["copied"], 1)
+        with open(self.dest_path("index.css"), encoding='utf-8') as file:
+            self.assertEqual(file.read(), "body { color: red; }")
+
+    def test_checksum_skips_touched_but_identical_files(self):
+        assets, _ = sync_static(self.src, self.dest)
+        os.utime(os.path.join(self.src, "index.css"), ns=(10**18, 10**18))
+        _, stats = sync_static(self.src, self.dest, assets, checksum=True)
+        self.assertEqual(stats["copied"], 0)
+        _, stats = sync_static(self.src, self.dest, assets)
+        self.assertEqual(stats["copied"], 1)
+
+    def test_vanished_assets_are_removed(self):
+        assets, _ = sync_static(self.src, self.dest)
+        write_file(self.dest_path("page.html"), "<html></html>")
+        os.remove(os.path.join(self.src, "images", "logo.png"))
+        assets, stats = sync_static(self.src, self.dest, assets)
+        self.assertEqual(stats["removed"], 1)
+        self.assertFalse(os.path.exists(self.dest_path("images")))
+        # Generated pages are not assets and must survive the sync
+        self.assertTrue(os.path.exists(self.dest_path("page.html")))
+
+    def test_copy_threads_match_a_single_thread(self):
+        for number in range(20):
+            write_file(os.path.join(self.src, "images", f"{number:02}.png"), "png" * number)
+        assets, stats = sync_static(self.src, self.dest, copy_jobs=8)
+        self.assertEqual((stats["copied"], stats["bytes_copied"]), (22, 10 + 3 * sum(range(20))))
+        self.assertEqual(list(assets), sorted(assets, key=lambda rel_path: (os.sep in rel_path, rel_path)))
+        write_file(os.path.join(self.src, "images", "07.png"), "changed")
+        _, stats = sync_static(self.src, self.dest, assets, copy_jobs=8)
+        self.assertEqual((stats["copied"], stats["unchanged"]), (1, 21))
+
+
+class TestRemoveUnlisted(unittest.TestCase):
+    def test_only_listed_files_are_kept(self):
+        with tempfile.TemporaryDirectory() as dest:
+            for rel_path in ("index.html", os.path.join("blog", "post.html"), os.path.join("old", "gone.html"),
+                             os.path.join("blog", "stray.txt")):
+                write_file(os.path.join(dest, rel_path), "x")
+            removed = remove_unlisted(dest, {"index.html", os.path.join("blog", "post.html")})
+            self.assertEqual(removed, 2)
+            self.assertEqual(sorted(os.listdir(dest)), ["blog", "index.html"])
+            self.assertEqual(os.listdir(os.path.join(dest, "blog")), ["post.html"])
+
+
+if __name__ == "__main__":
+    unittest.main()
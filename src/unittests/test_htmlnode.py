@@ -1,5 +1,8 @@
+import json
+import io
+import sys
 import unittest
-from src.htmlnode import HTMLNode, LeafNode, ParentNode
+from src.htmlnode import HTMLNode, LeafNode, ParentNode, apply_basepath, node_from_data, node_to_data
 
 class TestHTMLNode(unittest.TestCase):
     # Constructor tests
@@ -155,4 +158,105 @@ class TestParentNode(unittest.TestCase):
         self.assertEqual(
             grandparent.to_html(),
             "<section><div><span>text1</span></div><div><span>text2</span></div></section>"
-        )
\ No newline at end of file
+        )
+
+
+class TestStreamingHTML(unittest.TestCase):
+    def test_iter_html_matches_to_html(self):
+        node = ParentNode("div", children=[
+            ParentNode("p", children=[LeafNode(None, "a "), LeafNode("b", "bold")]),
+            LeafNode("a", "link", {"href": "/x"}),
+        ], props={"class": "c"})
+        self.assertEqual("".join(node.iter_html()), node.to_html())
+        self.assertEqual(
+            list(node.iter_html()),
+            ['<div class="c">', "<p>", "a ", "<b>bold</b>", "</p>", '<a href="/x">link</a>', "</div>"],
+        )
+
+    def test_write_html(self):
+        node = ParentNode("ul", children=[LeafNode("li", "one"), LeafNode("li", "two")])
+        out = io.StringIO()
+        node.write_html(out)
+        self.assertEqual(out.getvalue(), "<ul><li>one</li><li>two</li></ul>")
+
+    def test_nesting_deeper_than_recursion_limit(self):
+        depth = sys.getrecursionlimit() * 5
+        node = LeafNode(None, "x")
+        for _ in range(depth):
+            node = ParentNode("span", children=[node])
+        html = node.to_html()
+        self.assertEqual(html.count("<span>"), depth)
+        self.assertTrue(html.endswith("x" + "</span>" * depth))
+
+    def test_nested_parent_without_tag_raises(self):
+        node = ParentNode("div", children=[ParentNode(None, children=[LeafNode(None, "x")])])
+        with self.assertRaises(ValueError):
+            list(node.iter_html())
+
+
+class TestCompactNodes(unittest.TestCase):
+    def test_nodes_have_no_instance_dict(self):
+        for node in (HTMLNode(), LeafNode("b", "x"), ParentNode("p", children=[LeafNode(None, "x")])):
+            self.assertFalse(hasattr(node, "__dict__"))
+
+    def test_default_children_and_props_are_shared(self):
+        first = LeafNode("b", "one")
+        second = LeafNode("i", "two")
+        self.assertIs(first.children, second.children)
+        self.assertIs(first.props, second.props)
+        self.assertEqual(repr(first.children), "[]")
+        self.assertEqual(repr(first.props), "{}")
+
+    def test_default_children_and_props_are_read_only(self):
+        node = LeafNode("b", "x")
+        with self.assertRaises(TypeError):
+            node.children.append(LeafNode(None, "y"))
+        with self.assertRaises(TypeError):
+            node.props["class"] = "bold"
+        self.assertEqual(LeafNode("b", "z").props, {})
+
+    def test_given_children_and_props_are_kept(self):
+        props = {"href": "/"}
+        node = LeafNode("a", "x", props)
+        self.assertIs(node.props, props)
+
+    def test_tag_names_are_interned(self):
+        tag = "".join(["sec", "tion"])
+        node = ParentNode(tag, children=[LeafNode(None, "x")])
+        self.assertIs(node.tag, "section")
+
+    def test_apply_basepath_rewrites_link_and_image_urls(self):
+        link_props = {"href": "/blog"}
+        node = ParentNode("div", children=[
+            ParentNode("p", children=[LeafNode("a", "blog", link_props), LeafNode("a", "ext", {"href": "https://x.com/"})]),
+            LeafNode("img", "", {"src": "/a.png", "alt": "a"}),
+            LeafNode("img", "", {"src": "//cdn.example.com/b.png", "alt": "b"}),
+            LeafNode("code", '<a href="/blog">'),
+        ])
+        self.assertIs(apply_basepath(node, "/ssg/"), node)
+        self.assertEqual(
+            node.to_html(),
+            '<div><p><a href="/ssg/blog">blog</a><a href="https://x.com/">ext</a></p><img src="/ssg/a.png" alt="a"></img>'
+            '<img src="//cdn.example.com/b.png" alt="b"></img><code><a href="/blog"></code></div>',
+        )
+        # The props dict the node was created with is left as it was
+        self.assertEqual(link_props, {"href": "/blog"})
+
+    def test_apply_basepath_root_is_a_no_op(self):
+        node = LeafNode("a", "x", {"href": "/blog"})
+        apply_basepath(node, "/")
+        self.assertEqual(node.to_html(), '<a href="/blog">x</a>')
+
+    def test_node_data_round_trip(self):
+        node = ParentNode("div", children=[
+            ParentNode("p", children=[LeafNode(None, "see "), LeafNode("a", "blog", {"href": "/blog"})]),
+            LeafNode("img", "", {"src": "/a.png", "alt": "a"}),
+        ])
+        data = node_to_data(node)
+        self.assertEqual(json.loads(json.dumps(data)), data)
+        copy = node_from_data(data)
+        self.assertEqual(copy.to_html(), node.to_html())
+        # The copy is independent: rewriting its URLs leaves the original alone
+        apply_basepath(copy, "/ssg/")
+        self.assertIn('href="/blog"', node.to_html())
+        self.assertIn('href="/ssg/blog"', copy.to_html())
@@ -0,0 +1,165 @@
+import contextlib
+import io
+import os
+import unittest
+
+from src.generate_page import generate_pages_recursive
+from src.manifest import BuildManifest, hash_bytes, hash_file
+from src.unittests.helpers import TempDirMixin, write_file
+
+
+TEMPLATE = "<html><title>{{ Title }}</title><body>{{ Content }}</body></html>"
+
+
+class TestBuildManifest(TempDirMixin, unittest.TestCase):
+    def setUp(self):
+        super().setUp()
+        self.path = os.path.join(self.root, "manifest.json")
+
+    def test_hash_file_matches_hash_bytes(self):
+        file_path = os.path.join(self.root, "page.md")
+        write_file(file_path, "# Title")
+        self.assertEqual(hash_file(file_path), hash_bytes(b"# Title"))
+
+    def test_missing_manifest_is_empty(self):
+        manifest = BuildManifest.load(self.path)
+        self.assertEqual(manifest.pages, {})
+        self.assertIsNone(manifest.template_hash)
+
+    def test_corrupt_manifest_is_empty(self):
+        write_file(self.path, "{not json")
+        manifest = BuildManifest.load(self.path)
+        self.assertEqual(manifest.pages, {})
+
+    def test_round_trip_and_freshness(self):
+        manifest = BuildManifest.load(self.path)
+        self.assertTrue(manifest.begin_build("t1", "/"))
+        manifest.record_page("index.md", "h1", "index.html")
+        self.assertEqual(manifest.finish_build(), [])
+        manifest.save()
+
+        manifest = BuildManifest.load(self.path)
+        self.assertFalse(manifest.begin_build("t1", "/"))
+        self.assertTrue(manifest.is_fresh("index.md", "h1", "index.html"))
+        self.assertFalse(manifest.is_fresh("index.md", "h2", "index.html"))
+        self.assertFalse(manifest.is_fresh("other.md", "h1", "other.html"))
+
+    def test_template_or_basepath_change_invalidates_all(self):
+        manifest = BuildManifest(self.path, "t1", "/", {"index.md": {"hash": "h1", "output": "index.html"}})
+        self.assertTrue(manifest.begin_build("t2", "/"))
+        self.assertFalse(manifest.is_fresh("index.md", "h1", "index.html"))
+
+        manifest = BuildManifest(self.path, "t1", "/", {"index.md": {"hash": "h1", "output": "index.html"}})
+        self.assertTrue(manifest.begin_build("t1", "/ssg/"))
+        self.assertFalse(manifest.is_fresh("index.md", "h1", "index.html"))
+
+    def test_finish_build_reports_removed_outputs(self):
+        manifest = BuildManifest(self.path, "t1", "/", {
+            "index.md": {"hash": "h1", "output": "index.html"},
+            "old.md": {"hash": "h2", "output": "old.html"},
+        })
+        manifest.begin_build("t1", "/")
+        manifest.record_page("index.md", "h1", "index.html")
+        self.assertEqual(manifest.finish_build(), ["old.html"])
+        self.assertEqual(list(manifest.pages), ["index.md"])
+
+
+class TestIncrementalGeneration(TempDirMixin, unittest.TestCase):
+    def setUp(self):
+        super().setUp()
+        root = self.root
+        self.content = os.path.join(root, "content")
+        self.dest = os.path.join(root, "docs")
+        self.template = os.path.join(root, "template.html")
+        write_file(self.template, TEMPLATE)
+        write_file(os.path.join(self.content, "index.md"), "# Home\n\nWelcome")
+        write_file(os.path.join(self.content, "blog", "post.md"), "# Post\n\nBody")
+        self.manifest_path = os.path.join(self.dest, "manifest.json")
+
+    def build(self, basepath='/', **kwargs):
+        manifest = BuildManifest.load(self.manifest_path)
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            generate_pages_recursive(self.content, self.template, self.dest, basepath, manifest, **kwargs)
+        manifest.save()
+        return output.getvalue()
+
+    def mtime(self, *parts):
+        return os.stat(os.path.join(self.dest, *parts)).st_mtime_ns
+
+    def test_unchanged_pages_are_skipped(self):
+        self.build()
+        os.utime(os.path.join(self.dest, "index.html"), ns=(1, 1))
+        self.build()
+        self.assertEqual(self.mtime("index.html"), 1)
+
+    def test_changed_page_is_rerendered(self):
+        self.build()
+        os.utime(os.path.join(self.dest, "index.html"), ns=(1, 1))
+        os.utime(os.path.join(self.dest, "blog", "post.html"), ns=(1, 1))
+        write_file(os.path.join(self.content, "blog", "post.md"), "# Post\n\nEdited")
+        self.build()
+        self.assertEqual(self.mtime("index.html"), 1)
+        self.assertNotEqual(self.mtime("blog", "post.html"), 1)
+
+    def test_template_change_rerenders_everything(self):
+        self.build()
+        os.utime(os.path.join(self.dest, "index.html"), ns=(1, 1))
+        write_file(self.template, "<main>" + TEMPLATE + "</main>")
+        self.build()
+        self.assertNotEqual(self.mtime("index.html"), 1)
+        with open(os.path.join(self.dest, "index.html"), encoding='utf-8') as file:
+            self.assertTrue(file.read().startswith("<main>"))
+
+    def test_regeneration_message_names_what_changed(self):
+        # A first build has nothing to compare with, so it does not claim anything changed
+        self.assertNotIn("changed, regenerating", self.build())
+        self.assertNotIn("changed, regenerating", self.build())
+        self.assertIn("Basepath changed, regenerating all pages", self.build('/ssg/'))
+        write_file(self.template, "<main>" + TEMPLATE + "</main>")
+        self.assertIn("Template changed, regenerating all pages", self.build('/ssg/'))
+        write_file(self.template, TEMPLATE)
+        self.assertIn("Template and basepath changed, regenerating all pages", self.build())
+
+    def test_skipped_pages_are_reported_in_order(self):
+        for name in ("a", "b", "c", "d"):
+            write_file(os.path.join(self.content, "blog", f"{name}.md"), f"# {name}\n\nBody")
+        modes = {"serial": {}, "parallel": {"jobs": 2}, "pipelined": {"pipeline": True}}
+        docs = os.path.join(self.root, "docs")
+        for mode in modes:
+            self.dest = os.path.join(docs, mode)
+            self.manifest_path = os.path.join(self.dest, "manifest.json")
+            self.build()
+        for name in ("b", "d"):
+            write_file(os.path.join(self.content, "blog", f"{name}.md"), f"# {name}\n\nEdited")
+        outputs = {}
+        for mode, kwargs in modes.items():
+            self.dest = os.path.join(docs, mode)
+            self.manifest_path = os.path.join(self.dest, "manifest.json")
+            outputs[mode] = self.build(**kwargs).replace(self.dest, "DEST")
+            # Skipped pages are recorded in order with the rendered ones
+            self.assertEqual(list(BuildManifest.load(self.manifest_path).pages),
+                             list(BuildManifest.load(os.path.join(docs, "serial", "manifest.json")).pages))
+        self.assertEqual(outputs["pipelined"], outputs["serial"])
+        self.assertEqual(outputs["parallel"], outputs["serial"])
+        skipped = f"Skipping unchanged page: {os.path.join(self.content, 'blog', 'a.md')}"
+        rendered = f"Processing markdown file: {os.path.join(self.content, 'blog', 'b.md')}"
+        self.assertLess(outputs["serial"].index(skipped), outputs["serial"].index(rendered))
+
+    def test_removed_source_deletes_output(self):
+        self.build()
+        os.remove(os.path.join(self.content, "blog", "post.md"))
+        self.build()
+        self.assertFalse(os.path.exists(os.path.join(self.dest, "blog", "post.html")))
+        self.assertFalse(os.path.exists(os.path.join(self.dest, "blog")))
+        self.assertTrue(os.path.exists(os.path.join(self.dest, "index.html")))
+
+    def test_missing_output_is_regenerated(self):
+        self.build()
+        os.remove(os.path.join(self.dest, "index.html"))
+        self.build()
+        self.assertTrue(os.path.exists(os.path.join(self.dest, "index.html")))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -7,7 +7,8 @@ from src.markdown_to_html import (
     unordered_list_to_html_node,
     ordered_list_to_html_node,
     paragraph_to_html_node,
-    markdown_to_html_node
+    markdown_to_html_node,
+    BlockCache
 )
 from src.htmlnode import HTMLNode, ParentNode, LeafNode
 from src.textnode import TextNode, TextType
@@ -286,6 +287,11 @@ with multiple lines
         self.assertIn("**asterisks**", node.to_html())
         self.assertIn("_underscores_", node.to_html())
     
+    def test_markdown_to_html_code_with_blank_lines(self):
+        markdown = "```\nfirst line\n\nafter a blank line\n```"
+        node = markdown_to_html_node(markdown)
+        self.assertEqual(node.to_html(), "<div><pre><code>first line\n\nafter a blank line</code></pre></div>")
+    
     def test_markdown_to_html_complex_inline(self):
         markdown = "This paragraph has **bold with _nested italic_ inside** and a [link](https://example.com) plus an ![image](https://example.com/img.jpg)."
         node = markdown_to_html_node(markdown)
@@ -323,5 +329,69 @@ with multiple lines
         self.assertEqual(html.count("<li>"), 5)  # 3 unordered + 2 ordered
 
 
+class TestBasepath(unittest.TestCase):
+    def test_links_and_images_point_at_basepath(self):
+        html = markdown_to_html_node("[Home](/) and ![logo](/logo.png) and [ext](https://x.com/)", basepath="/ssg/").to_html()
+        self.assertIn('<a href="/ssg/">Home</a>', html)
+        self.assertIn('<img src="/ssg/logo.png" alt="logo">', html)
+        self.assertIn('<a href="https://x.com/">ext</a>', html)
+
+    def test_code_showing_html_is_left_alone(self):
+        html = markdown_to_html_node('```\n<a href="/blog">x</a>\n```', basepath="/ssg/").to_html()
+        self.assertEqual(html, '<div><pre><code><a href="/blog">x</a></code></pre></div>')
+
+
+class TestBlockCache(unittest.TestCase):
+    DOCUMENT = """# Title
+
+Shared **disclaimer**.
+
+```
+code
+
+more code
+```
+
+- one
+- two"""
+
+    def test_cached_render_matches_uncached(self):
+        cache = BlockCache()
+        expected = markdown_to_html_node(self.DOCUMENT).to_html()
+        self.assertEqual(markdown_to_html_node(self.DOCUMENT, cache).to_html(), expected)
+        self.assertEqual(markdown_to_html_node(self.DOCUMENT, cache).to_html(), expected)
+        self.assertEqual((cache.hits, cache.misses), (4, 4))
+
+    def test_edit_only_parses_changed_block(self):
+        cache = BlockCache()
+        markdown_to_html_node(self.DOCUMENT, cache)
+        edited = self.DOCUMENT.replace("- two", "- two\n- three")
+        html = markdown_to_html_node(edited, cache).to_html()
+        self.assertEqual(html, markdown_to_html_node(edited).to_html())
+        self.assertEqual((cache.hits, cache.misses), (3, 5))
+
+    def test_key_includes_block_type(self):
+        cache = BlockCache()
+        # The same text is a paragraph on its own but part of a list elsewhere
+        markdown_to_html_node("text", cache)
+        self.assertEqual(markdown_to_html_node("- text", cache).to_html(), "<div><ul><li>text</li></ul></div>")
+        self.assertEqual(cache.misses, 2)
+
+    def test_key_includes_basepath(self):
+        cache = BlockCache()
+        self.assertEqual(markdown_to_html_node("[a](/x)", cache).to_html(), '<div><p><a href="/x">a</a></p></div>')
+        self.assertEqual(markdown_to_html_node("[a](/x)", cache, "/ssg/").to_html(),
+                         '<div><p><a href="/ssg/x">a</a></p></div>')
+        self.assertEqual(cache.misses, 2)
+
+    def test_least_recently_used_block_is_evicted(self):
+        cache = BlockCache(max_blocks=2)
+        markdown_to_html_node("one\n\ntwo", cache)
+        markdown_to_html_node("one\n\nthree", cache)
+        self.assertEqual(len(cache), 2)
+        markdown_to_html_node("two", cache)
+        self.assertEqual((cache.hits, cache.misses), (1, 4))
+
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
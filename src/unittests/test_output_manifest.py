@@ -0,0 +1,129 @@
+import contextlib
+import io
+import json
+import logging
+import os
+import unittest
+
+from src.main import copy_static_to_public
+from src.manifest import hash_bytes
+from src.output_manifest import CHANGES_FILENAME, OUTPUT_MANIFEST_FILENAME, OutputManifest, output_url
+from src.report import BuildReport
+from src.unittests.helpers import TempDirMixin, write_file
+
+
+def read_json(path):
+    with open(path, encoding='utf-8') as file:
+        return json.load(file)
+
+
+class TestOutputManifest(TempDirMixin, unittest.TestCase):
+    def setUp(self):
+        super().setUp()
+        self.dest = os.path.join(self.root, "docs")
+        write_file(os.path.join(self.dest, "index.html"), "<p>home</p>")
+        write_file(os.path.join(self.dest, "blog", "post.html"), "<p>post</p>")
+        write_file(os.path.join(self.dest, "index.css"), "body {}")
+
+    def test_output_url(self):
+        self.assertEqual(output_url("index.html"), "/")
+        self.assertEqual(output_url(os.path.join("blog", "index.html"), "/ssg/"), "/ssg/blog/")
+        self.assertEqual(output_url(os.path.join("blog", "post.html"), "/ssg/"), "/ssg/blog/post.html")
+
+    def test_scan_records_size_hash_and_url(self):
+        write_file(os.path.join(self.dest, OUTPUT_MANIFEST_FILENAME), "{}")
+        manifest = OutputManifest.scan(self.dest, "/ssg/")
+        self.assertEqual(sorted(manifest.files), [os.path.join("blog", "post.html"), "index.css", "index.html"])
+        entry = manifest.files["index.html"]
+        self.assertEqual((entry["size"], entry["hash"], entry["url"]), (11, hash_bytes(b"<p>home</p>"), "/ssg/"))
+
+    def test_scan_follows_symlinked_directories(self):
+        media = os.path.join(self.root, "media")
+        write_file(os.path.join(media, "logo.png"), "png")
+        os.symlink(media, os.path.join(self.dest, "images"))
+        os.symlink(self.dest, os.path.join(self.dest, "blog", "loop"))
+        os.symlink(os.path.join(self.root, "missing"), os.path.join(self.dest, "dangling.html"))
+        with self.assertLogs(level=logging.WARNING):
+            manifest = OutputManifest.scan(self.dest)
+        self.assertEqual(manifest.files[os.path.join("images", "logo.png")]["hash"], hash_bytes(b"png"))
+        self.assertEqual(sorted(manifest.files), [os.path.join("blog", "post.html"), os.path.join("images", "logo.png"),
+                                                  "index.css", "index.html"])
+
+    def test_diff(self):
+        previous = OutputManifest.scan(self.dest)
+        write_file(os.path.join(self.dest, "index.html"), "<p>home, edited</p>")
+        os.remove(os.path.join(self.dest, "index.css"))
+        write_file(os.path.join(self.dest, "about.html"), "<p>about</p>")
+        changes = OutputManifest.scan(self.dest, previous=previous).diff(previous)
+        self.assertEqual([item["url"] for item in changes["added"]], ["/about.html"])
+        self.assertEqual([item["url"] for item in changes["changed"]], ["/"])
+        self.assertEqual(changes["deleted"], [{"path": "index.css", "url": "/index.css"}])
+
+    def test_basepath_change_moves_every_url(self):
+        previous = OutputManifest.scan(self.dest)
+        changes = OutputManifest.scan(self.dest, "/ssg/", previous).diff(previous)
+        self.assertEqual(len(changes["changed"]), 3)
+        self.assertIn({"path": "index.html", "url": "/ssg/", "previous_url": "/", "size": 11,
+                       "hash": hash_bytes(b"<p>home</p>")}, changes["changed"])
+
+    def test_unmodified_files_reuse_previous_hash(self):
+        previous = OutputManifest.scan(self.dest)
+        path = os.path.join(self.dest, "index.html")
+        stat = os.stat(path)
+        # Same size and mtime: the file is trusted to be unchanged and is not hashed again
+        write_file(path, "<p>HOME</p>")
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        current = OutputManifest.scan(self.dest, previous=previous)
+        self.assertEqual(current.files["index.html"]["hash"], hash_bytes(b"<p>home</p>"))
+
+    def test_save_and_load(self):
+        manifest = OutputManifest.scan(self.dest, "/ssg/")
+        manifest.save()
+        loaded = OutputManifest.load(manifest.path)
+        self.assertEqual((loaded.basepath, loaded.files), ("/ssg/", manifest.files))
+        write_file(manifest.path, "{not json")
+        self.assertEqual(OutputManifest.load(manifest.path).files, {})
+
+
+class TestBuildChanges(TempDirMixin, unittest.TestCase):
+    quiet = True
+
+    def setUp(self):
+        super().setUp()
+        self.docs = os.path.join(self.root, "docs")
+        write_file(os.path.join(self.root, "template.html"), "<title>{{ Title }}</title>{{ Content }}")
+        write_file(os.path.join(self.root, "static", "index.css"), "body {}")
+        write_file(os.path.join(self.root, "content", "index.md"), "# Home\n\nText")
+        write_file(os.path.join(self.root, "content", "blog", "index.md"), "# Blog\n\nPosts")
+
+    def build(self, **kwargs):
+        report = BuildReport()
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertTrue(copy_static_to_public(
+                os.path.join(self.root, "static"), self.docs, os.path.join(self.root, "content"),
+                os.path.join(self.root, "template.html"), "/ssg/", report=report, **kwargs))
+        self.assertEqual(report.output_changes, {kind: len(items) for kind, items in self.changes().items()})
+        return self.changes()
+
+    def changes(self):
+        data = read_json(os.path.join(self.docs, CHANGES_FILENAME))
+        return {kind: sorted(item["url"] for item in data[kind]) for kind in ("added", "changed", "deleted")}
+
+    def test_builds_write_changes(self):
+        for incremental in (False, True):
+            with self.subTest(incremental=incremental):
+                if os.path.exists(self.docs):
+                    os.remove(os.path.join(self.docs, OUTPUT_MANIFEST_FILENAME))
+                self.assertEqual(self.build(incremental=incremental)["added"], ["/ssg/", "/ssg/blog/", "/ssg/index.css"])
+                self.assertEqual(self.build(incremental=incremental), {"added": [], "changed": [], "deleted": []})
+
+                write_file(os.path.join(self.root, "content", "blog", "index.md"), f"# Blog\n\nNew post {incremental}")
+                os.remove(os.path.join(self.root, "static", "index.css"))
+                self.assertEqual(self.build(incremental=incremental),
+                                 {"added": [], "changed": ["/ssg/blog/"], "deleted": ["/ssg/index.css"]})
+                write_file(os.path.join(self.root, "static", "index.css"), "body {}")
+                self.assertEqual(read_json(os.path.join(self.docs, OUTPUT_MANIFEST_FILENAME))["basepath"], "/ssg/")
+
+
+if __name__ == "__main__":
+    unittest.main()
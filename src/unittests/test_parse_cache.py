@@ -0,0 +1,124 @@
+import contextlib
+import io
+import os
+import unittest
+
+from src import parse_cache as parse_cache_module
+from src.generate_page import generate_page
+from src.main import copy_static_to_public
+from src.parse_cache import ParseCache
+from src.report import BuildReport
+from src.unittests.helpers import TempDirMixin, read_file, write_file
+
+
+class TestParseCache(TempDirMixin, unittest.TestCase):
+    def setUp(self):
+        super().setUp()
+        self.cache = ParseCache(os.path.join(self.root, "cache"))
+
+    def test_get_and_put(self):
+        key = ParseCache.key("# Title\n\nText")
+        self.assertIsNone(self.cache.get(key))
+        tree = ["div", [["p", "Text", {}]], {}]
+        self.cache.put(key, "Title", tree)
+        self.assertEqual(self.cache.get(key), ("Title", tree))
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+
+    def test_key_depends_on_markdown_and_parser_version(self):
+        key = ParseCache.key("# Title")
+        self.assertNotEqual(key, ParseCache.key("# Title "))
+        original = parse_cache_module.PARSER_VERSION
+        parse_cache_module.PARSER_VERSION = original + 1
+        try:
+            self.assertNotEqual(key, ParseCache.key("# Title"))
+        finally:
+            parse_cache_module.PARSER_VERSION = original
+
+    def test_corrupt_entry_is_a_miss(self):
+        key = ParseCache.key("# Title")
+        self.cache.put(key, "Title", "<div></div>")
+        write_file(self.cache._path(key), "{not json")
+        self.assertIsNone(self.cache.get(key))
+
+    def test_prune_evicts_least_recently_used(self):
+        keys = [ParseCache.key(str(number)) for number in range(3)]
+        for number, key in enumerate(keys):
+            self.cache.put(key, "Title", "x" * 1000)
+            # Spread the mtimes out so the order is unambiguous, oldest first
+            os.utime(self.cache._path(key), ns=(number * 10 ** 9, number * 10 ** 9))
+        # Reading the oldest entry makes it the most recently used
+        self.assertIsNotNone(self.cache.get(keys[0]))
+        self.cache.max_bytes = 2 * os.path.getsize(self.cache._path(keys[0]))
+        self.assertEqual(self.cache.prune(), 1)
+        self.assertIsNone(self.cache.get(keys[1]))
+        self.assertIsNotNone(self.cache.get(keys[0]))
+        self.assertIsNotNone(self.cache.get(keys[2]))
+
+    def test_prune_missing_directory(self):
+        self.assertEqual(self.cache.prune(), 0)
+
+
+class TestParseCacheBuild(TempDirMixin, unittest.TestCase):
+    quiet = True
+
+    def setUp(self):
+        super().setUp()
+        self.template = os.path.join(self.root, "template.html")
+        write_file(self.template, '<link href="/index.css"><title>{{ Title }}</title>{{ Content }}')
+        write_file(os.path.join(self.root, "static", "index.css"), "body {}")
+        write_file(os.path.join(self.root, "content", "index.md"), "# Home\n\n[About](/about)")
+        write_file(os.path.join(self.root, "content", "blog", "post.md"), "# Post\n\n```\ncode\n```")
+
+    def build(self, dest, parse_cache=None, basepath="/ssg/", **kwargs):
+        report = BuildReport()
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertTrue(copy_static_to_public(
+                os.path.join(self.root, "static"), os.path.join(self.root, dest), os.path.join(self.root, "content"),
+                self.template, basepath, report=report, parse_cache=parse_cache, **kwargs))
+        return report.as_dict()["parse_cache"]
+
+    def test_cached_pages_match_uncached_output(self):
+        cache = ParseCache(os.path.join(self.root, "cache"))
+        self.build("plain")
+        self.assertEqual(self.build("cold", cache), {"hits": 0, "misses": 2})
+        self.assertEqual(self.build("warm", cache), {"hits": 2, "misses": 0})
+        for page in ("index.html", os.path.join("blog", "post.html")):
+            expected = read_file(os.path.join(self.root, "plain", page))
+            self.assertEqual(read_file(os.path.join(self.root, "cold", page)), expected)
+            self.assertEqual(read_file(os.path.join(self.root, "warm", page)), expected)
+
+    def test_template_change_rewraps_cached_bodies(self):
+        cache = ParseCache(os.path.join(self.root, "cache"))
+        self.build("docs", cache, incremental=True)
+        write_file(self.template, "<h1>{{ Title }}</h1>{{ Content }}")
+        self.assertEqual(self.build("docs", cache, incremental=True), {"hits": 2, "misses": 0})
+        self.assertEqual(read_file(os.path.join(self.root, "docs", "index.html")),
+                         '<h1>Home</h1><div><h1>Home</h1><p><a href="/ssg/about">About</a></p></div>')
+
+    def test_basepath_change_reuses_cached_trees(self):
+        cache = ParseCache(os.path.join(self.root, "cache"))
+        self.assertEqual(self.build("root", cache, basepath="/"), {"hits": 0, "misses": 2})
+        self.assertEqual(self.build("ssg", cache), {"hits": 2, "misses": 0})
+        self.build("plain")
+        for page in ("index.html", os.path.join("blog", "post.html")):
+            self.assertEqual(read_file(os.path.join(self.root, "ssg", page)),
+                             read_file(os.path.join(self.root, "plain", page)))
+        self.assertIn('<a href="/about">', read_file(os.path.join(self.root, "root", "index.html")))
+
+    def test_edited_page_is_parsed_again(self):
+        cache = ParseCache(os.path.join(self.root, "cache"))
+        source = os.path.join(self.root, "content", "index.md")
+        dest = os.path.join(self.root, "out.html")
+        timings = {}
+        generate_page(source, self.template, dest, log=lambda line: None, timings=timings, parse_cache=cache)
+        self.assertFalse(timings["cached"])
+        write_file(source, "# Home\n\nEdited")
+        generate_page(source, self.template, dest, log=lambda line: None, timings=timings, parse_cache=cache)
+        self.assertFalse(timings["cached"])
+        self.assertIn("<p>Edited</p>", read_file(dest))
+        generate_page(source, self.template, dest, log=lambda line: None, timings=timings, parse_cache=cache)
+        self.assertTrue(timings["cached"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+import contextlib
+import io
+import os
+import unittest
+
+from src.helpers import copy_asset
+from src.main import copy_static_to_public
+from src.publish import publish_staged, stage, staging_dir_for, wait_for_cleanup
+from src.unittests.helpers import TempDirMixin, read_file, write_file
+
+
+class TestPublish(TempDirMixin, unittest.TestCase):
+    def setUp(self):
+        super().setUp()
+        self.live = os.path.join(self.root, "docs")
+        write_file(os.path.join(self.live, "index.html"), "old")
+
+    def test_stage_seeds_hardlinks(self):
+        staging = stage(self.live)
+        self.assertEqual(staging, staging_dir_for(self.live))
+        self.assertTrue(os.path.samefile(os.path.join(staging, "index.html"), os.path.join(self.live, "index.html")))
+
+    def test_copy_asset_does_not_touch_live_file(self):
+        staging = stage(self.live)
+        write_file(os.path.join(self.root, "new.html"), "new")
+        copy_asset(os.path.join(self.root, "new.html"), os.path.join(staging, "index.html"))
+        self.assertEqual(read_file(os.path.join(self.live, "index.html")), "old")
+        self.assertEqual(read_file(os.path.join(staging, "index.html")), "new")
+
+    def test_rename_swaps_directories(self):
+        staging = stage(self.live)
+        write_file(os.path.join(staging, "index.html.tmp"), "new")
+        os.replace(os.path.join(staging, "index.html.tmp"), os.path.join(staging, "index.html"))
+        old_dir = publish_staged(staging, self.live)
+        self.assertEqual(read_file(os.path.join(self.live, "index.html")), "new")
+        self.assertEqual(read_file(os.path.join(old_dir, "index.html")), "old")
+        self.assertFalse(os.path.exists(staging))
+
+    def test_symlink_mode_and_back(self):
+        old_dir = publish_staged(stage(self.live), self.live, "symlink")
+        self.assertTrue(os.path.islink(self.live))
+        self.assertEqual(read_file(os.path.join(old_dir, "index.html")), "old")
+        target = os.path.realpath(self.live)
+
+        old_dir = publish_staged(stage(self.live), self.live, "symlink")
+        self.assertEqual(os.path.realpath(old_dir), target)
+        self.assertNotEqual(os.path.realpath(self.live), target)
+
+        target = os.path.realpath(self.live)
+        old_dir = publish_staged(stage(self.live), self.live)
+        self.assertFalse(os.path.islink(self.live))
+        self.assertEqual(os.path.realpath(old_dir), target)
+        self.assertEqual(read_file(os.path.join(self.live, "index.html")), "old")
+
+
+class TestStagedBuild(TempDirMixin, unittest.TestCase):
+    quiet = True
+
+    def setUp(self):
+        super().setUp()
+        self.docs = os.path.join(self.root, "docs")
+        write_file(os.path.join(self.root, "template.html"), "<title>{{ Title }}</title>{{ Content }}")
+        write_file(os.path.join(self.root, "static", "index.css"), "body {}")
+        write_file(os.path.join(self.root, "content", "index.md"), "# Home\n\nText")
+
+    def build(self, **kwargs):
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = copy_static_to_public(
+                os.path.join(self.root, "static"), self.docs, os.path.join(self.root, "content"),
+                os.path.join(self.root, "template.html"), "/ssg/", **kwargs)
+        wait_for_cleanup()
+        return result
+
+    def test_only_live_directory_remains(self):
+        for mode in ("rename", "rename", "symlink", "symlink", "rename"):
+            with self.subTest(mode=mode):
+                self.assertTrue(self.build(publish_mode=mode))
+                names = sorted(os.listdir(self.root))
+                self.assertEqual(names, [os.path.basename(os.path.realpath(self.docs))] * (mode == "symlink")
+                                 + ["content", "docs", "static", "template.html"])
+
+    def test_unchanged_page_keeps_its_file(self):
+        self.assertTrue(self.build())
+        inode = os.stat(os.path.join(self.docs, "index.html")).st_ino
+        self.assertTrue(self.build())
+        self.assertEqual(os.stat(os.path.join(self.docs, "index.html")).st_ino, inode)
+
+    def test_failed_build_leaves_live_site_untouched(self):
+        self.assertTrue(self.build())
+        before = read_file(os.path.join(self.docs, "index.html"))
+        write_file(os.path.join(self.root, "content", "index.md"), "# Home\n\nEdited")
+        write_file(os.path.join(self.root, "content", "broken.md"), "No title")
+        self.assertFalse(self.build())
+        self.assertEqual(read_file(os.path.join(self.docs, "index.html")), before)
+        self.assertFalse(os.path.exists(staging_dir_for(self.docs)))
+
+    def test_in_place_builds_directly(self):
+        self.assertTrue(self.build(publish_mode="in-place"))
+        self.assertEqual(sorted(os.listdir(self.root)), ["content", "docs", "static", "template.html"])
+
+
+if __name__ == "__main__":
+    unittest.main()
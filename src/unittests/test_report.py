@@ -0,0 +1,118 @@
+import contextlib
+import io
+import json
+import os
+import unittest
+
+from src.generate_page import generate_page
+from src.main import copy_static_to_public
+from src.report import BuildReport, format_bytes
+from src.unittests.helpers import TempDirMixin, write_file
+
+
+def page_result(name, seconds, size, error=None):
+    return {
+        "source": f"content/{name}.md",
+        "dest": f"docs/{name}.html",
+        "error": error,
+        "timings": {"read": 0.0, "parse": seconds / 2, "render": seconds / 4, "write": seconds / 4,
+                    "bytes_read": size // 2, "bytes_written": size},
+    }
+
+
+class TestBuildReport(unittest.TestCase):
+    def test_rankings_and_totals(self):
+        report = BuildReport(top=2)
+        report.add_page(page_result("fast", 0.001, 5000))
+        report.add_page(page_result("slow", 0.100, 100))
+        report.add_page(page_result("medium", 0.010, 900))
+        report.add_page(page_result("broken", 0, 0, error="Exception: bad"))
+        report.add_assets({"copied": 2, "unchanged": 1, "removed": 0, "bytes_copied": 300})
+        report.finish()
+
+        data = report.as_dict()
+        self.assertEqual(data["pages"], {"rendered": 3, "skipped": 0, "failed": 1, "total": 4})
+        self.assertEqual(data["assets"]["total"], 3)
+        self.assertEqual(data["bytes_written"], 5000 + 100 + 900 + 300)
+        self.assertEqual(data["bytes_read"], 2500 + 50 + 450 + 300)
+        self.assertEqual([page["source"] for page in data["slowest_pages"]], ["content/slow.md", "content/medium.md"])
+        self.assertEqual([page["dest"] for page in data["largest_pages"]], ["docs/fast.html", "docs/medium.html"])
+        slow = data["slowest_pages"][0]
+        self.assertAlmostEqual(slow["parse"] + slow["render"] + slow["write"], slow["seconds"])
+        json.dumps(data)
+
+    def test_format(self):
+        report = BuildReport()
+        report.add_page(page_result("post", 0.002, 2048))
+        report.finish()
+        text = report.format()
+        self.assertIn("1 rendered", text)
+        self.assertIn("content/post.md", text)
+        self.assertIn("2.0 KiB", text)
+
+    def test_format_copy_strategies(self):
+        report = BuildReport()
+        report.add_assets({"copied": 3, "strategies": {"hardlink": 2, "copy_file_range": 1}})
+        report.add_assets({"copied": 1, "strategies": {"hardlink": 1}})
+        self.assertEqual(report.as_dict()["assets"]["strategies"], {"copy_file_range": 1, "hardlink": 3})
+        self.assertIn("Copied:  1 via copy_file_range, 3 via hardlink", report.format())
+        self.assertNotIn("Copied:", BuildReport().format())
+
+    def test_format_bytes(self):
+        self.assertEqual(format_bytes(512), "512 B")
+        self.assertEqual(format_bytes(1536), "1.5 KiB")
+        self.assertEqual(format_bytes(3 * 1024 ** 3), "3.0 GiB")
+
+    def test_asset_copy_throughput(self):
+        report = BuildReport()
+        report.add_assets({"copied": 1, "bytes_copied": 4 * 1024 * 1024, "strategies": {"copy": 1}}, seconds=2.0)
+        self.assertEqual(report.as_dict()["assets"]["mib_per_sec"], 2.0)
+        self.assertIn("4.0 MiB in 2.00 s, 2.0 MiB/s", report.format())
+
+
+class TestBuildReportIntegration(TempDirMixin, unittest.TestCase):
+    quiet = True
+
+    def setUp(self):
+        super().setUp()
+        write_file(os.path.join(self.root, "template.html"), "<title>{{ Title }}</title>{{ Content }}")
+        write_file(os.path.join(self.root, "static", "index.css"), "body {}")
+        write_file(os.path.join(self.root, "content", "index.md"), "# Home\n\nText")
+        write_file(os.path.join(self.root, "content", "big.md"), "# Big\n\n" + "A **long** page.\n\n" * 500)
+
+    def build(self, **kwargs):
+        report = BuildReport()
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertTrue(copy_static_to_public(
+                os.path.join(self.root, "static"), os.path.join(self.root, "docs"), os.path.join(self.root, "content"),
+                os.path.join(self.root, "template.html"), report=report, **kwargs))
+        return report.as_dict()
+
+    def test_build_fills_report(self):
+        data = self.build()
+        self.assertEqual(data["pages"]["rendered"], 2)
+        self.assertEqual(data["assets"]["copied"], 1)
+        self.assertEqual(data["largest_pages"][0]["dest"], os.path.join(self.root, "docs", "big.html"))
+        self.assertEqual(data["largest_pages"][0]["bytes_written"],
+                         os.path.getsize(os.path.join(self.root, "docs", "big.html")))
+
+    def test_incremental_build_counts_skipped_pages(self):
+        self.build()
+        data = self.build(incremental=True)
+        self.assertEqual(data["pages"], {"rendered": 0, "skipped": 2, "failed": 0, "total": 2})
+        self.assertEqual(data["assets"]["unchanged"], 1)
+
+    def test_generate_page_timings(self):
+        source = os.path.join(self.root, "content", "index.md")
+        for stream in (False, True):
+            timings = {}
+            generate_page(source, os.path.join(self.root, "template.html"), os.path.join(self.root, "out.html"),
+                          log=lambda line: None, stream=stream, timings=timings)
+            self.assertEqual(timings["bytes_read"], os.path.getsize(source))
+            self.assertEqual(timings["bytes_written"], os.path.getsize(os.path.join(self.root, "out.html")))
+            for stage in ("read", "parse", "render", "write"):
+                self.assertGreaterEqual(timings[stage], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -219,6 +219,13 @@ class TestSplitNodesImage(unittest.TestCase):
         self.assertEqual(nodes[1].text, " no alt text")
         self.assertEqual(nodes[1].text_type, TextType.TEXT)
 
+    def test_many_images_in_one_paragraph(self):
+        text = " ".join(f"![image {i}](/images/{i}.png)" for i in range(10000))
+        nodes = split_nodes_image([TextNode(text, TextType.TEXT)])
+        self.assertEqual(len(nodes), 19999)
+        self.assertEqual(nodes[-1].url, "/images/9999.png")
+
+
 class TestSplitNodesLink(unittest.TestCase):
     def test_basic_link_split(self):
         node = TextNode(
@@ -353,6 +360,23 @@ class TestSplitNodesLink(unittest.TestCase):
         self.assertEqual(nodes[0].text_type, TextType.LINK)
         self.assertEqual(nodes[0].url, "#section")
 
+    def test_many_links_in_one_paragraph(self):
+        # Used to recurse once per link and hit the recursion limit
+        text = " ".join(f"[link {i}](https://example.com/{i})" for i in range(10000))
+        nodes = split_nodes_link([TextNode(text, TextType.TEXT)])
+        self.assertEqual(len(nodes), 19999)
+        self.assertEqual(nodes[-1].text, "link 9999")
+        self.assertEqual(nodes[-1].url, "https://example.com/9999")
+
+    def test_link_after_image_syntax(self):
+        # The literal "[a](b)" inside an image must not be split as a link
+        node = TextNode("![a](b) and [a](b)", TextType.TEXT)
+        nodes = split_nodes_link([node])
+        self.assertEqual(nodes, [
+            TextNode("![a](b) and ", TextType.TEXT),
+            TextNode("a", TextType.LINK, "b"),
+        ])
+
 
 if __name__ == "__main__":
     unittest.main()
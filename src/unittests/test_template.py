@@ -0,0 +1,83 @@
+import io
+import os
+import pickle
+import tempfile
+import unittest
+
+from src.htmlnode import LeafNode, ParentNode
+from src.template import Template, rewrite_root_urls
+
+
+SOURCE = '<html><head><title>{{ Title }}</title><link href="/index.css" /></head><body>{{ Content }}</body></html>'
+
+
+class TestTemplate(unittest.TestCase):
+    def test_render_fills_slots(self):
+        template = Template(SOURCE)
+        html = template.render("Hello", "<p>Body</p>")
+        self.assertEqual(
+            html,
+            '<html><head><title>Hello</title><link href="/index.css" /></head><body><p>Body</p></body></html>',
+        )
+
+    def test_render_matches_string_replace(self):
+        template = Template(SOURCE)
+        expected = SOURCE.replace("{{ Title }}", "T").replace("{{ Content }}", "<p>C</p>")
+        self.assertEqual(template.render("T", "<p>C</p>"), expected)
+
+    def test_repeated_slots(self):
+        template = Template("{{ Title }}|{{ Title }}|{{ Content }}")
+        self.assertEqual(template.render("a", "b"), "a|a|b")
+
+    def test_unknown_placeholders_are_left_alone(self):
+        template = Template("{{ Other }} {{ Title }}")
+        self.assertEqual(template.render("a", ""), "{{ Other }} a")
+
+    def test_basepath_applied_to_template_links(self):
+        template = Template(SOURCE, "/ssg/")
+        html = template.render("T", "")
+        self.assertIn('<link href="/ssg/index.css" />', html)
+
+    def test_content_is_not_rewritten(self):
+        # The body's links are pointed at the basepath on its nodes, before it reaches the template
+        template = Template("{{ Content }}", "/ssg/")
+        html = template.render("T", '<pre><code>&lt;a href="/blog"&gt;</code></pre><a href="/ssg/blog">x</a>')
+        self.assertEqual(html, '<pre><code>&lt;a href="/blog"&gt;</code></pre><a href="/ssg/blog">x</a>')
+
+    def test_root_basepath_leaves_urls_alone(self):
+        self.assertEqual(rewrite_root_urls('<a href="/x">', '/'), '<a href="/x">')
+
+    def test_absolute_urls_untouched(self):
+        self.assertEqual(
+            rewrite_root_urls('<a href="https://example.com/">', '/ssg/'),
+            '<a href="https://example.com/">',
+        )
+
+    def test_from_file_and_digest(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "template.html")
+            with open(path, 'w', encoding='utf-8') as file:
+                file.write(SOURCE)
+            template = Template.from_file(path)
+            self.assertEqual(template.digest, Template(SOURCE).digest)
+            self.assertEqual(template.render("T", "C"), Template(SOURCE).render("T", "C"))
+
+    def test_write_streams_same_page_as_render(self):
+        body = ParentNode("div", children=[
+            LeafNode("a", "home", {"href": "/ssg/"}),
+            LeafNode("img", "", {"src": "/ssg/a.png", "alt": "a"}),
+        ])
+        for basepath in ("/", "/ssg/"):
+            template = Template(SOURCE, basepath)
+            out = io.StringIO()
+            template.write(out, "T", body)
+            self.assertEqual(out.getvalue(), template.render("T", body.to_html()))
+
+    def test_pickles_for_worker_processes(self):
+        template = Template(SOURCE, "/ssg/")
+        clone = pickle.loads(pickle.dumps(template))
+        self.assertEqual(clone.render("T", "C"), template.render("T", "C"))
+
+
+if __name__ == "__main__":
+    unittest.main()
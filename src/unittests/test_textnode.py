@@ -66,6 +66,10 @@ class TestTextNode(unittest.TestCase):
         node = TextNode("Alt text", TextType.IMAGE)
         self.assertIsNone(node.url)
 
+    def test_no_instance_dict(self):
+        node = TextNode("Text", TextType.TEXT)
+        self.assertFalse(hasattr(node, "__dict__"))
+
     # String representation
     def test_repr(self):
         node = TextNode("Test text", TextType.BOLD, "https://example.com")
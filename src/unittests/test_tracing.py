@@ -0,0 +1,96 @@
+import contextlib
+import io
+import json
+import os
+import tempfile
+import unittest
+
+from src import tracing
+from src.main import copy_static_to_public
+from src.unittests.helpers import TempDirMixin, write_file
+
+
+class TestTracing(unittest.TestCase):
+    def tearDown(self):
+        tracing.disable()
+
+    def test_disabled_spans_are_shared_no_ops(self):
+        self.assertFalse(tracing.is_enabled())
+        self.assertIs(tracing.span("a"), tracing.span("b", source="x"))
+        with tracing.span("parse"):
+            pass
+        self.assertEqual(tracing.drain(), [])
+
+    def test_enabled_spans_record_complete_events(self):
+        tracing.enable()
+        with tracing.span("parse", source="a.md"):
+            with tracing.span("inner", "detail"):
+                pass
+        events = [event for event in tracing.drain() if event["ph"] == "X"]
+        self.assertEqual([event["name"] for event in events], ["inner", "parse"])
+        self.assertEqual(events[0]["cat"], "detail")
+        self.assertEqual(events[1]["args"], {"source": "a.md"})
+        self.assertLessEqual(events[1]["ts"], events[0]["ts"])
+        self.assertGreaterEqual(events[1]["dur"], events[0]["dur"])
+
+    def test_failed_span_is_marked(self):
+        tracing.enable()
+        with self.assertRaises(ValueError):
+            with tracing.span("parse"):
+                raise ValueError("bad")
+        self.assertEqual(tracing.drain()[-1]["args"], {"error": "ValueError"})
+
+    def test_add_events_and_write(self):
+        tracing.enable()
+        tracing.add_events([{"name": "page", "ph": "X", "ts": 1, "dur": 2, "pid": 99, "tid": 1}])
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "trace.json")
+            tracing.write(path)
+            with open(path, encoding='utf-8') as file:
+                data = json.load(file)
+        self.assertIn({"name": "page", "ph": "X", "ts": 1, "dur": 2, "pid": 99, "tid": 1}, data["traceEvents"])
+
+
+class TestBuildTrace(TempDirMixin, unittest.TestCase):
+    quiet = True
+
+    def setUp(self):
+        super().setUp()
+        write_file(os.path.join(self.root, "template.html"), "<title>{{ Title }}</title>{{ Content }}")
+        write_file(os.path.join(self.root, "static", "index.css"), "body {}")
+        for number in range(4):
+            write_file(os.path.join(self.root, "content", f"page{number}.md"), f"# Page {number}\n\nText")
+
+    def tearDown(self):
+        tracing.disable()
+
+    def build(self, jobs):
+        trace_file = os.path.join(self.root, "trace.json")
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertTrue(copy_static_to_public(
+                os.path.join(self.root, "static"), os.path.join(self.root, "docs"), os.path.join(self.root, "content"),
+                os.path.join(self.root, "template.html"), jobs=jobs, trace_file=trace_file))
+        self.assertFalse(tracing.is_enabled())
+        with open(trace_file, encoding='utf-8') as file:
+            return json.load(file)["traceEvents"]
+
+    def test_serial_build_trace(self):
+        events = self.build(jobs=1)
+        names = [event["name"] for event in events]
+        for stage in ("copy_static", "copy", "compile_template", "generate_pages", "read", "parse", "write"):
+            self.assertIn(stage, names)
+        self.assertEqual(names.count("page"), 4)
+
+    def test_parallel_build_has_worker_lanes(self):
+        events = self.build(jobs=2)
+        pages = [event for event in events if event["name"] == "page"]
+        self.assertEqual(len(pages), 4)
+        self.assertNotIn(os.getpid(), {event["pid"] for event in pages})
+        self.assertEqual([event["name"] for event in events].count("copy_static"), 1)
+        lanes = {event["args"]["name"] for event in events if event["name"] == "process_name"}
+        self.assertIn("main", lanes)
+        self.assertTrue(any(lane.startswith("worker ") for lane in lanes))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,179 @@
+import contextlib
+import io
+import json
+import os
+import unittest
+
+from src.main import copy_static_to_public, parse_args
+from src.manifest import MANIFEST_FILENAME
+from src.markdown_to_html import BlockCache
+from src.output_manifest import CHANGES_FILENAME
+from src.unittests.helpers import TempDirMixin, read_file, write_file
+from src.watch import SiteWatcher, StatCache, build_after_snapshot, wait_for_changes
+
+TEMPLATE = "<html><title>{{ Title }}</title><body>{{ Content }}</body></html>"
+
+
+class TestWatch(TempDirMixin, unittest.TestCase):
+    quiet = True
+
+    def setUp(self):
+        super().setUp()
+        self.static = self.path("static")
+        self.content = self.path("content")
+        self.docs = self.path("docs")
+        self.template = self.path("template.html")
+        write_file(self.template, TEMPLATE)
+        write_file(os.path.join(self.static, "index.css"), "body {}")
+        write_file(os.path.join(self.content, "index.md"), "# Home\n\nWelcome")
+        write_file(os.path.join(self.content, "blog", "post.md"), "# Post\n\nFirst draft")
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertTrue(copy_static_to_public(self.static, self.docs, self.content, self.template))
+        self.watcher = SiteWatcher(self.static, self.docs, self.content, self.template)
+        self.cache = StatCache(self.watcher.watched_roots())
+
+    def path(self, *parts):
+        return os.path.join(self.root, *parts)
+
+    def modify(self, path, text):
+        write_file(path, text)
+        # Make sure the change is visible even on filesystems with coarse timestamps
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    def rebuild(self):
+        return self.watcher.rebuild(self.cache.poll())
+
+    def test_changed_post_rebuilds_only_that_page(self):
+        home = os.path.join(self.docs, "index.html")
+        before = os.stat(home).st_mtime_ns
+        self.modify(os.path.join(self.content, "blog", "post.md"), "# Post\n\nSecond draft")
+        stats = self.rebuild()
+        self.assertEqual(stats, {"pages": 1, "assets": 0, "removed": 0})
+        self.assertIn("Second draft", read_file(os.path.join(self.docs, "blog", "post.html")))
+        self.assertEqual(os.stat(home).st_mtime_ns, before)
+
+    def test_block_cache_reparses_only_changed_blocks(self):
+        self.watcher.block_cache = BlockCache()
+        post = os.path.join(self.content, "blog", "post.md")
+        self.modify(post, "# Post\n\nSecond draft")
+        self.rebuild()
+        self.modify(post, "# Post\n\nThird draft")
+        self.rebuild()
+        self.assertEqual((self.watcher.block_cache.hits, self.watcher.block_cache.misses), (1, 3))
+        self.assertIn("Third draft", read_file(os.path.join(self.docs, "blog", "post.html")))
+
+    def test_rebuild_records_output_changes(self):
+        self.modify(os.path.join(self.content, "blog", "post.md"), "# Post\n\nSecond draft")
+        self.rebuild()
+        changes = json.loads(read_file(os.path.join(self.docs, CHANGES_FILENAME)))
+        self.assertEqual([item["url"] for item in changes["changed"]], ["/blog/post.html"])
+        self.assertEqual((changes["added"], changes["deleted"]), ([], []))
+
+    def test_touched_but_identical_post_is_skipped(self):
+        post = os.path.join(self.content, "blog", "post.md")
+        self.modify(post, read_file(post))
+        self.assertEqual(self.rebuild()["pages"], 0)
+
+    def test_new_and_removed_pages(self):
+        write_file(os.path.join(self.content, "about.md"), "# About")
+        os.remove(os.path.join(self.content, "blog", "post.md"))
+        stats = self.rebuild()
+        self.assertEqual(stats["pages"], 1)
+        self.assertEqual(stats["removed"], 1)
+        self.assertTrue(os.path.isfile(os.path.join(self.docs, "about.html")))
+        self.assertFalse(os.path.exists(os.path.join(self.docs, "blog")))
+
+    def test_template_change_rebuilds_every_page(self):
+        self.modify(self.template, TEMPLATE.replace("<body>", "<body class=\"new\">"))
+        self.assertEqual(self.rebuild()["pages"], 2)
+        self.assertIn('class="new"', read_file(os.path.join(self.docs, "index.html")))
+
+    def test_template_change_with_a_failing_page(self):
+        new_template = TEMPLATE.replace("<body>", "<body class=\"new\">")
+        manifest_path = os.path.join(self.docs, MANIFEST_FILENAME)
+        old_manifest = read_file(manifest_path)
+        post = os.path.join(self.content, "blog", "post.md")
+        self.modify(self.template, new_template)
+        self.modify(post, "No title")
+        with self.assertRaises(Exception) as context:
+            self.rebuild()
+        self.assertIn("post.md", str(context.exception))
+        # The page after the failing one was still rendered, but the template change is not committed
+        self.assertIn('class="new"', read_file(os.path.join(self.docs, "index.html")))
+        self.assertNotIn('class="new"', read_file(os.path.join(self.docs, "blog", "post.html")))
+        self.assertEqual(read_file(manifest_path), old_manifest)
+        self.assertEqual(self.watcher.pending, {os.path.join("blog", "post.md")})
+
+        # An unrelated change retries the pending page; it is still broken
+        write_file(os.path.join(self.static, "app.js"), "")
+        with self.assertRaises(Exception):
+            self.rebuild()
+
+        self.modify(post, "# Post\n\nFixed")
+        self.assertEqual(self.rebuild()["pages"], 1)
+        self.assertEqual(self.watcher.pending, set())
+        post_html = read_file(os.path.join(self.docs, "blog", "post.html"))
+        self.assertIn('class="new"', post_html)
+        self.assertIn("Fixed", post_html)
+        self.assertEqual(json.loads(read_file(manifest_path))["template"], self.watcher.template.digest)
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            copy_static_to_public(self.static, self.docs, self.content, self.template, incremental=True)
+        self.assertNotIn("Processing markdown file", output.getvalue())
+
+    def test_asset_changes(self):
+        self.modify(os.path.join(self.static, "index.css"), "body { color: red; }")
+        write_file(os.path.join(self.static, "app.js"), "")
+        self.assertEqual(self.rebuild()["assets"], 2)
+        os.remove(os.path.join(self.static, "app.js"))
+        self.assertEqual(self.rebuild()["removed"], 1)
+        self.assertFalse(os.path.exists(os.path.join(self.docs, "app.js")))
+
+    def test_incremental_build_agrees_with_watcher(self):
+        self.modify(os.path.join(self.content, "index.md"), "# Home\n\nUpdated")
+        self.rebuild()
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            copy_static_to_public(self.static, self.docs, self.content, self.template, incremental=True)
+        self.assertNotIn("Processing markdown file", output.getvalue())
+
+    def test_wait_for_changes_coalesces_bursts(self):
+        post = os.path.join(self.content, "blog", "post.md")
+        home = os.path.join(self.content, "index.md")
+        # One edit per poll: nothing, then two saves in a row, then quiet
+        edits = [lambda: None, lambda: self.modify(post, "# Post\n\nA"),
+                 lambda: self.modify(home, "# Home\n\nB"), lambda: None]
+
+        def sleep(seconds):
+            edits.pop(0)()
+
+        changes, _ = wait_for_changes(self.cache, interval=0.01, debounce=0, sleep=sleep)
+        self.assertEqual(changes, {post, home})
+        self.assertEqual(edits, [])
+
+    def test_edit_saved_during_the_initial_build_is_seen(self):
+        post = os.path.join(self.content, "blog", "post.md")
+
+        def build():
+            self.modify(post, "# Post\n\nSaved mid-build")
+            with contextlib.redirect_stdout(io.StringIO()):
+                return copy_static_to_public(self.static, self.docs, self.content, self.template, incremental=True)
+
+        cache = build_after_snapshot(SiteWatcher.roots(self.static, self.content, self.template), build)
+        self.assertEqual(cache.poll(), {post})
+        self.assertIsNone(build_after_snapshot([self.content], lambda: False))
+
+
+class TestCommandLine(unittest.TestCase):
+    def test_watch_command(self):
+        args = parse_args(["watch", "/ssg/", "--interval", "0.5"])
+        self.assertEqual((args.command, args.basepath, args.interval), ("watch", "/ssg/", 0.5))
+
+    def test_build_is_the_default_command(self):
+        args = parse_args(["/ssg/"])
+        self.assertEqual((args.command, args.basepath), ("build", "/ssg/"))
+
+
+if __name__ == "__main__":
+    unittest.main()
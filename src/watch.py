@@ -0,0 +1,322 @@
+import logging
+import os
+import time
+
+from src.generate_page import build_page, decode_markdown, page_job, remove_empty_parents
+from src.helpers import asset_record, copy_asset
+from src.manifest import BuildManifest, MANIFEST_FILENAME, hash_bytes
+from src.markdown_to_html import BlockCache, DEFAULT_MAX_BLOCKS
+from src.output_manifest import update_output_manifest
+from src.template import Template
+
+
+def scan_tree(root):
+    """
+    Stat every file below 'root' with os.scandir, which reuses the directory entries'
+    cached stat data instead of a separate os.stat call per file where the platform allows.
+
+    Returns:
+        dict: Mapping of file path -> (size, mtime_ns)
+    """
+    stats = {}
+    stack = [root]
+    while stack:
+        directory = stack.pop()
+        try:
+            entries = list(os.scandir(directory))
+        except (FileNotFoundError, NotADirectoryError):
+            continue
+        for entry in entries:
+            try:
+                if entry.is_dir():
+                    stack.append(entry.path)
+                elif entry.is_file():
+                    entry_stat = entry.stat()
+                    stats[entry.path] = (entry_stat.st_size, entry_stat.st_mtime_ns)
+            except FileNotFoundError:
+                # Deleted between listing and stat; the next poll reports it as removed
+                continue
+    return stats
+
+
+class StatCache:
+    """
+    Remembers the size and mtime of every watched file and reports what changed since the last poll.
+
+    Args:
+        roots (list): Directories and files to watch
+    """
+
+    def __init__(self, roots):
+        self.roots = list(roots)
+        self.stats = self._scan()
+
+    def _scan(self):
+        stats = {}
+        for root in self.roots:
+            if os.path.isdir(root):
+                stats.update(scan_tree(root))
+            else:
+                try:
+                    root_stat = os.stat(root)
+                except FileNotFoundError:
+                    continue
+                stats[root] = (root_stat.st_size, root_stat.st_mtime_ns)
+        return stats
+
+    def poll(self):
+        """
+        Rescan the watched roots.
+
+        Returns:
+            set: Paths that were added, modified or removed since the previous poll
+        """
+        stats = self._scan()
+        previous = self.stats
+        changed = {path for path, stat in stats.items() if previous.get(path) != stat}
+        changed.update(path for path in previous if path not in stats)
+        self.stats = stats
+        return changed
+
+
+def build_after_snapshot(roots, build):
+    """
+    Snapshot the sizes and mtimes below 'roots', then run 'build'.
+
+    Taking the snapshot first means a source saved while the build runs differs from it,
+    so the first poll reports the file and it is rebuilt instead of being missed.
+
+    Returns:
+        StatCache: The snapshot, or None if build() returned False
+    """
+    cache = StatCache(roots)
+    if not build():
+        return None
+    return cache
+
+
+def wait_for_changes(cache, interval=0.1, debounce=0.05, sleep=time.sleep):
+    """
+    Block until files change, then keep polling until they have been quiet for 'debounce' seconds,
+    so a burst of saves (an editor's write-and-rename, a git checkout) becomes one rebuild.
+
+    Returns:
+        tuple: (changed paths, time.monotonic() when the first change was seen)
+    """
+    changes = set()
+    while not changes:
+        sleep(interval)
+        changes = cache.poll()
+    detected = last_change = time.monotonic()
+
+    while True:
+        sleep(min(interval, debounce))
+        more = cache.poll()
+        if more:
+            changes |= more
+            last_change = time.monotonic()
+        elif time.monotonic() - last_change >= debounce:
+            return changes, detected
+
+
+class SiteWatcher:
+    """
+    Applies a set of changed source files to an already built site.
+
+    Only the affected outputs are touched: a changed markdown file re-renders its own page, a changed
+    asset is copied again, removed sources delete their outputs, and only a template whose content
+    actually changed re-renders every page. The build manifest is kept in step, so a later
+    `--incremental` build agrees with what the watcher published.
+
+    A page that fails to render does not stop the others. It stays pending and is retried on
+    every later rebuild, and the manifest is only saved, with the new template's hash, once
+    every pending page has been rendered.
+
+    Args:
+        src_dir (str): Static asset directory
+        dest_dir (str): Output directory
+        content_dir (str): Content directory containing markdown files
+        template_file (str): Path to HTML template file
+        basepath (str): Base URL path the site is served from (default: "/")
+        block_cache (BlockCache, optional): Rendered blocks kept between rebuilds, so an edited
+            page only has its changed blocks parsed again
+        link_mode (str): One of ASSET_LINK_MODES, how changed assets are copied (default: "copy")
+    """
+
+    def __init__(self, src_dir="static", dest_dir="docs", content_dir="content", template_file="template.html",
+                 basepath="/", block_cache=None, link_mode="copy"):
+        self.src_dir = src_dir
+        self.dest_dir = dest_dir
+        self.content_dir = content_dir
+        self.template_file = template_file
+        self.basepath = basepath
+        self.block_cache = block_cache
+        self.link_mode = link_mode
+        self.template = Template.from_file(template_file, basepath)
+        self.manifest = BuildManifest.load(os.path.join(dest_dir, MANIFEST_FILENAME))
+        # Keys of pages still to be re-rendered, because they failed or the template changed
+        self.pending = set()
+
+    @staticmethod
+    def roots(src_dir, content_dir, template_file):
+        """Return the directories and files a watcher for these sources polls."""
+        return [content_dir, src_dir, template_file]
+
+    def watched_roots(self):
+        return self.roots(self.src_dir, self.content_dir, self.template_file)
+
+    def _under(self, path, directory):
+        return os.path.abspath(path).startswith(os.path.abspath(directory) + os.sep)
+
+    def rebuild(self, changes):
+        """
+        Rebuild the outputs affected by 'changes', and the pages still pending from earlier rebuilds.
+
+        Every page is attempted even when some fail. The manifest is saved once no page is pending.
+
+        Args:
+            changes (set): Paths reported by StatCache.poll
+
+        Returns:
+            dict: Counts of "pages" rendered, "assets" copied and outputs "removed"
+
+        Raises:
+            Exception: If one or more pages failed to generate (after all other pages were attempted)
+        """
+        stats = {"pages": 0, "assets": 0, "removed": 0}
+        pages = set()
+
+        if self.template_file in changes:
+            template = Template.from_file(self.template_file, self.basepath)
+            if template.digest != self.template.digest:
+                logging.info("Template changed, regenerating all pages")
+                self.template = template
+                self.pending.update(self.manifest.pages)
+
+        for path in sorted(changes):
+            if self._under(path, self.content_dir) and path.endswith('.md'):
+                pages.add(os.path.relpath(path, self.content_dir))
+            elif self._under(path, self.src_dir):
+                self._update_asset(path, stats)
+
+        failures = []
+        for key in sorted(pages | self.pending):
+            try:
+                self._update_page(key, stats, force=key in self.pending)
+            except Exception as e:
+                logging.error(f"❌ Failed to generate page from {os.path.join(self.content_dir, key)}: "
+                              f"{type(e).__name__}: {e}")
+                failures.append(os.path.join(self.content_dir, key))
+                self.pending.add(key)
+            else:
+                self.pending.discard(key)
+
+        if not self.pending:
+            # Every page now carries the current template
+            self.manifest.template_hash = self.template.digest
+            self.manifest.save()
+        update_output_manifest(self.dest_dir, self.basepath)
+        if failures:
+            raise Exception(f"Failed to generate {len(failures)} page(s): {', '.join(failures)}")
+        return stats
+
+    def _update_page(self, key, stats, force=False):
+        source = os.path.join(self.content_dir, key)
+        if not os.path.isfile(source):
+            entry = self.manifest.pages.pop(key, None)
+            if entry is not None:
+                self._remove_output(entry["output"], stats)
+            return
+
+        with open(source, 'rb') as md_file:
+            source_bytes = md_file.read()
+        job = page_job(source, self.content_dir, self.template_file, self.dest_dir)
+        job["hash"] = hash_bytes(source_bytes)
+        entry = self.manifest.pages.get(key)
+        if not force and entry == {"hash": job["hash"], "output": job["output"]} and os.path.exists(job["dest"]):
+            # Touched but not modified
+            return
+        job["markdown"] = decode_markdown(source_bytes)
+        build_page(job, self.template, logging.debug, block_cache=self.block_cache)
+        logging.info(f"✓ Page generated at '{job['dest']}'")
+        self.manifest.pages[key] = {"hash": job["hash"], "output": job["output"]}
+        stats["pages"] += 1
+
+    def _update_asset(self, path, stats):
+        rel_path = os.path.relpath(path, self.src_dir)
+        dest_item_path = os.path.join(self.dest_dir, rel_path)
+        try:
+            src_stat = os.stat(path)
+        except FileNotFoundError:
+            if self.manifest.assets.pop(rel_path, None) is not None:
+                self._remove_output(rel_path, stats)
+            return
+        copy_asset(path, dest_item_path, self.link_mode)
+        self.manifest.assets[rel_path] = asset_record(src_stat)
+        stats["assets"] += 1
+
+    def _remove_output(self, output, stats):
+        output_path = os.path.join(self.dest_dir, output)
+        if os.path.isfile(output_path):
+            os.remove(output_path)
+            logging.info(f"🗑️  Removed file: {output_path}")
+            stats["removed"] += 1
+        remove_empty_parents(output_path, self.dest_dir)
+
+
+def watch(src_dir="static", dest_dir="docs", content_dir="content", template_file="template.html", basepath="/",
+          interval=0.1, debounce=0.05, jobs=1, block_cache_size=DEFAULT_MAX_BLOCKS, link_mode="copy"):
+    """
+    Build the site once, then rebuild only what changes until interrupted.
+
+    content/, static/ and the template are polled with os.scandir against a cache of file sizes
+    and mtimes, so watching needs no third-party dependency. Each rebuild logs its latency: the
+    time spent rebuilding, and the time from noticing the change to the site being published.
+
+    Args:
+        src_dir (str): Static asset directory (default: "static")
+        dest_dir (str): Output directory (default: "docs")
+        content_dir (str): Content directory containing markdown files (default: "content")
+        template_file (str): Path to HTML template file (default: "template.html")
+        basepath (str): Base URL path the site is served from (default: "/")
+        interval (float): Seconds between polls (default: 0.1)
+        debounce (float): Quiet period in seconds that ends a burst of changes (default: 0.05)
+        jobs (int): Worker processes for the initial build (default: 1)
+        block_cache_size (int): Rendered blocks remembered between rebuilds (0 = off, default: DEFAULT_MAX_BLOCKS)
+        link_mode (str): One of ASSET_LINK_MODES, how static assets are copied (default: "copy")
+
+    Returns:
+        bool: False if the initial build failed, True once watching is stopped with Ctrl-C
+    """
+    # Imported here because main imports this module for the watch command
+    from src.main import copy_static_to_public
+
+    block_cache = BlockCache(block_cache_size) if block_cache_size else None
+    cache = build_after_snapshot(
+        SiteWatcher.roots(src_dir, content_dir, template_file),
+        lambda: copy_static_to_public(src_dir, dest_dir, content_dir, template_file, basepath, incremental=True,
+                                      jobs=jobs, block_cache=block_cache, link_mode=link_mode))
+    if cache is None:
+        return False
+
+    watcher = SiteWatcher(src_dir, dest_dir, content_dir, template_file, basepath, block_cache, link_mode)
+    logging.info(f"👀 Watching {', '.join(watcher.watched_roots())} for changes (Ctrl-C to stop)")
+
+    try:
+        while True:
+            changes, detected = wait_for_changes(cache, interval, debounce)
+            started = time.monotonic()
+            try:
+                stats = watcher.rebuild(changes)
+            except Exception as e:
+                logging.error(f"❌ Rebuild failed: {e}")
+                continue
+            finished = time.monotonic()
+            logging.info(
+                f"🔁 Rebuilt {stats['pages']} page(s), copied {stats['assets']} asset(s), "
+                f"removed {stats['removed']} file(s) in {(finished - started) * 1000:.1f} ms "
+                f"({(finished - detected) * 1000:.1f} ms after the change was detected)"
+            )
+    except KeyboardInterrupt:
+        logging.info("Stopped watching")
+    return True